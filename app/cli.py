@@ -0,0 +1,374 @@
+"""CLI de administración sin interfaz gráfica.
+
+Reutiliza ApiClient, UserSession y las validaciones de las ventanas para ejecutar
+operaciones masivas desde scripts, por ejemplo:
+
+    python -m app.cli -u admin list users
+    python -m app.cli -u admin create users --file nuevos.jsonl --concurrency 8
+    python -m app.cli -u admin update students --file cambios.json --merge
+    python -m app.cli -u admin delete groups 14 15 16
+    python -m app.cli -u admin export students --format csv -o alumnos.csv
+    python -m app.cli -u admin --adaptive --max-concurrency 32 create users --file muchos.jsonl
+
+Con --adaptive la concurrencia arranca en --concurrency y se ajusta sola según la
+latencia y los 429/503 del servidor (ver app.services.adaptive); el estado se muestra
+en stderr mientras corre. La contraseña se toma de --password o de la variable de entorno SIGUE_PASSWORD.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import requests
+
+from app.config import CONFIG
+from app.services.adaptive import AdaptiveLimiter
+from app.services.api_client import ApiClient, ApiError
+from app.services.json_codec import default_codec
+from app.services.retry import RequestRetrier, RetryPolicy
+from app.services.session import UserSession
+from app.services.timeouts import TimeoutPolicy, parse_overrides
+from app.services.rules import InvalidRecord
+from app.services.validation import RULES, VALIDATORS, normalize_detail
+
+ENTITIES = tuple(VALIDATORS)
+
+
+def _login(args: argparse.Namespace) -> tuple[ApiClient, UserSession]:
+    api = ApiClient(
+        args.base_url,
+        codec=default_codec(CONFIG.json_codec),
+        accept_compression=CONFIG.accept_compression,
+        compress_requests_over=CONFIG.compress_requests_over or None,
+        fields_param=CONFIG.fields_param,
+    )
+    # Sin plazos adaptativos: en un trabajo masivo la latencia cambia con la carga que genera el propio trabajo
+    api.timeouts = TimeoutPolicy(
+        api.latency, connect=CONFIG.connect_timeout, read=CONFIG.read_timeout,
+        overrides=parse_overrides(CONFIG.timeout_overrides),
+    )
+    retry_policy = RetryPolicy(CONFIG.retry_attempts, CONFIG.retry_base_delay, CONFIG.retry_max_delay)
+    api.retrier = RequestRetrier(api.latency, RequestRetrier.default_policies(CONFIG.retry_methods.split(','), retry_policy))
+    session = UserSession()
+    password = args.password or os.getenv('SIGUE_PASSWORD')
+    if not args.username or not password:
+        raise SystemExit('Se requieren --username y --password (o SIGUE_PASSWORD).')
+    result = api.login(username=args.username, password=password)
+    session.token = result.get('token')
+    session.user = result.get('user', {})
+    if args.adaptive:
+        api.limiter = AdaptiveLimiter(initial=args.concurrency, max_limit=args.max_concurrency)
+    return api, session
+
+
+def _workers(api: ApiClient, concurrency: int) -> int:
+    # Con el límite adaptativo hay hilos para el máximo; el límite decide cuántos envían a la vez
+    return api.limiter.max_limit if api.limiter is not None else max(1, concurrency)
+
+
+@contextmanager
+def _live_stats(api: ApiClient, interval: float = 0.5) -> Iterator[None]:
+    """Muestra en stderr el estado del límite adaptativo mientras dura el bloque."""
+    limiter = api.limiter
+    if limiter is None:
+        yield
+        return
+    interactive = sys.stderr.isatty()
+    stop = threading.Event()
+
+    def report() -> None:
+        while not stop.wait(interval if interactive else interval * 10):
+            print(f"\r{limiter.describe()}" if interactive else limiter.describe(), end='' if interactive else '\n',
+                  file=sys.stderr, flush=True)
+
+    thread = threading.Thread(target=report, name='adaptive-stats', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+        print(('\r' if interactive else '') + limiter.describe(), file=sys.stderr, flush=True)
+
+
+class InputFileError(Exception):
+    """El archivo de entrada no se pudo leer o no es JSON válido."""
+
+
+def _read_records(path: str) -> List[Any]:
+    """Lee un arreglo JSON o JSON Lines (un valor por línea) desde un archivo o '-' (stdin)."""
+    try:
+        handle: TextIO = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            text = handle.read()
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+        text = text.strip()
+        if not text:
+            return []
+        if text.startswith('['):
+            return json.loads(text)
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    except (OSError, ValueError) as error:  # ValueError: JSON inválido o texto que no es UTF-8
+        raise InputFileError(f"No se pudo leer {path}: {error}") from None
+
+
+def _objects(records: Iterable[Any]) -> tuple[List[Dict[str, Any]], int]:
+    """Los registros que son objetos JSON; el resto se reporta como fallido (y se cuenta)."""
+    objects: List[Dict[str, Any]] = []
+    invalid = 0
+    for record in records:
+        if isinstance(record, dict):
+            objects.append(record)
+            continue
+        print(json.dumps({'ok': False, 'item': record, 'error': 'Cada registro debe ser un objeto JSON.'}, ensure_ascii=False), flush=True)
+        invalid += 1
+    return objects, invalid
+
+
+def _run_parallel(api: ApiClient, items: Iterable[Any], worker: Callable[[Any], Dict[str, Any]], concurrency: int,
+                  shown: Callable[[Any], Any] = lambda item: item) -> int:
+    """Ejecuta worker sobre cada elemento e imprime un resultado JSON por línea. Devuelve el número de fallos.
+
+    `shown` elige qué se imprime del elemento cuando falla (p. ej. el registro de un par registro/payload).
+    """
+    failures = 0
+
+    def guarded(item: Any) -> Dict[str, Any]:
+        try:
+            return {'ok': True, **worker(item)}
+        except ApiError as error:
+            return {'ok': False, 'item': shown(item), 'status': error.status_code, 'error': error.message}
+        except InvalidRecord as error:
+            return {'ok': False, 'item': shown(item), 'error': str(error), 'errors': error.errors}
+        except (ValueError, KeyError, TypeError) as error:
+            return {'ok': False, 'item': shown(item), 'error': str(error)}
+        except requests.RequestException as error:
+            # Conexión caída o plazo agotado tras los reintentos: falla este registro, no el trabajo
+            return {'ok': False, 'item': shown(item), 'error': f"Error de conexión: {error}"}
+
+    with _live_stats(api), ThreadPoolExecutor(max_workers=_workers(api, concurrency)) as pool:
+        for result in pool.map(guarded, items):
+            failures += 0 if result['ok'] else 1
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    return failures
+
+
+def _validate_batch(entity: str, records: List[Dict[str, Any]], *, creating: bool) -> tuple[List[tuple[Dict[str, Any], Dict[str, Any]]], int]:
+    """Valida el lote completo de una pasada antes de enviar nada.
+
+    Imprime un resultado con los errores por campo de cada registro inválido y devuelve
+    los pares (registro, payload) válidos junto con el número de inválidos.
+    """
+    result = RULES[entity].validate_many(records, creating=creating)
+    for index, errors in result.errors.items():
+        failure = {'ok': False, 'item': records[index], 'error': next(iter(errors.values())), 'errors': errors}
+        print(json.dumps(failure, ensure_ascii=False), flush=True)
+    valid = [(record, payload) for record, payload in zip(records, result.payloads) if payload is not None]
+    return valid, len(result.errors)
+
+
+def _write_rows(rows: List[Dict[str, Any]], fmt: str, output: TextIO) -> None:
+    if fmt == 'csv':
+        columns: List[str] = []
+        for row in rows:
+            columns.extend(key for key in row if key not in columns)
+        writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                             for key, value in row.items()})
+    elif fmt == 'jsonl':
+        for row in rows:
+            output.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        json.dump(rows, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+
+
+def _parse_params(values: Optional[List[str]]) -> Dict[str, str]:
+    params: Dict[str, str] = {}
+    for value in values or []:
+        key, _, param = value.partition('=')
+        params[key] = param
+    return params
+
+
+def cmd_list(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    fields = args.fields.split(',') if args.fields else None
+    rows = api.get(f'/{args.entity}', params=_parse_params(args.param) or None, fields=fields) or []
+    _write_rows(rows, args.format, sys.stdout)
+    return 0
+
+
+def cmd_get(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    return _run_parallel(api, args.ids, lambda item_id: {'id': item_id, 'record': api.get(f'/{args.entity}/{item_id}')}, args.concurrency)
+
+
+def cmd_create(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    records, malformed = _objects(_read_records(args.file))
+    valid, invalid = _validate_batch(args.entity, records, creating=True)
+    invalid += malformed
+
+    def create(item: tuple[Dict[str, Any], Dict[str, Any]]) -> Dict[str, Any]:
+        _record, payload = item
+        if args.dry_run:
+            return {'payload': payload}
+        created = api.post(f'/{args.entity}', payload)
+        return {'id': created.get('id') if isinstance(created, dict) else None}
+
+    return invalid + _run_parallel(api, valid, create, args.concurrency, shown=lambda item: item[0])
+
+
+def cmd_update(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    validate = VALIDATORS[args.entity]
+    records: List[Dict[str, Any]] = []
+    objects, invalid = _objects(_read_records(args.file))
+    for record in objects:
+        if 'id' in record:
+            records.append(record)
+            continue
+        print(json.dumps({'ok': False, 'item': record, 'error': "Cada registro debe incluir 'id'."}, ensure_ascii=False), flush=True)
+        invalid += 1
+    if args.merge:
+        # Con --merge cada registro se valida ya combinado con el actual del servidor
+        items: List[tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = [(record, None) for record in records]
+    else:
+        # Sin --merge el archivo trae el registro completo: se valida todo el lote antes de enviar
+        valid, rejected = _validate_batch(args.entity, records, creating=False)
+        items, invalid = list(valid), invalid + rejected
+
+    def update(item: tuple[Dict[str, Any], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        record, payload = item
+        item_id = record['id']
+        if payload is None:
+            # Completa los campos que no vienen en el archivo con el registro actual del servidor
+            current = normalize_detail(args.entity, api.get(f'/{args.entity}/{item_id}'))
+            payload = validate({**current, **record}, creating=False)
+        if args.dry_run:
+            return {'id': item_id, 'payload': payload}
+        # Con --merge se leyó el registro: si alguien lo cambió mientras tanto, el servidor responde 412
+        api.put(f'/{args.entity}/{item_id}', payload, if_match=api.version_of(f'/{args.entity}/{item_id}') if args.merge else None)
+        return {'id': item_id}
+
+    return invalid + _run_parallel(api, items, update, args.concurrency, shown=lambda item: item[0])
+
+
+def cmd_delete(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    ids = list(args.ids)
+    invalid = 0
+    if args.file:
+        for record in _read_records(args.file):
+            if isinstance(record, dict) and 'id' in record:
+                ids.append(str(record['id']))
+            elif isinstance(record, (int, str)):
+                ids.append(str(record))
+            else:
+                print(json.dumps({'ok': False, 'item': record, 'error': "Cada registro debe ser un ID o un objeto con 'id'."},
+                                 ensure_ascii=False), flush=True)
+                invalid += 1
+    own_id = str(session.user.get('id', ''))
+    if args.entity == 'users' and own_id in ids:
+        raise SystemExit('No puedes eliminar tu propia cuenta de administrador.')
+
+    def delete(item_id: str) -> Dict[str, Any]:
+        if not args.dry_run:
+            api.delete(f'/{args.entity}/{item_id}')
+        return {'id': item_id}
+
+    return invalid + _run_parallel(api, ids, delete, args.concurrency)
+
+
+def cmd_export(api: ApiClient, session: UserSession, args: argparse.Namespace) -> int:
+    rows = api.get(f'/{args.entity}') or []
+    if args.details:
+        # Descarga el detalle de cada registro en paralelo (incluye materias, carreras, alumnos...)
+        with _live_stats(api), ThreadPoolExecutor(max_workers=_workers(api, args.concurrency)) as pool:
+            rows = list(pool.map(lambda row: api.get(f"/{args.entity}/{row['id']}"), rows))
+    if args.output in (None, '-'):
+        _write_rows(rows, args.format, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as handle:
+            _write_rows(rows, args.format, handle)
+        print(f"{len(rows)} registros exportados a {args.output}", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description='Administración de SIGUE desde la línea de comandos.')
+    parser.add_argument('--base-url', default=CONFIG.api_base_url, help='URL base de la API')
+    parser.add_argument('-u', '--username', default=os.getenv('SIGUE_USERNAME'))
+    parser.add_argument('-p', '--password', default=None)
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='peticiones simultáneas (por defecto 4)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='ajusta la concurrencia según la respuesta del servidor (empieza en --concurrency)')
+    parser.add_argument('--max-concurrency', type=int, default=32, help='tope de --adaptive (por defecto 32)')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_cmd = commands.add_parser('list', help='lista los registros de una entidad')
+    list_cmd.add_argument('entity', choices=ENTITIES)
+    list_cmd.add_argument('--param', action='append', metavar='CLAVE=VALOR', help='parámetro de consulta (repetible)')
+    list_cmd.add_argument('--format', choices=('json', 'jsonl', 'csv'), default='json')
+    list_cmd.add_argument('--fields', help='solo estos campos, separados por comas (p. ej. id,name)')
+    list_cmd.set_defaults(handler=cmd_list)
+
+    get_cmd = commands.add_parser('get', help='obtiene el detalle de uno o varios registros')
+    get_cmd.add_argument('entity', choices=ENTITIES)
+    get_cmd.add_argument('ids', nargs='+')
+    get_cmd.set_defaults(handler=cmd_get)
+
+    for name, handler, help_text in (('create', cmd_create, 'crea registros desde un archivo JSON/JSONL'),
+                                     ('update', cmd_update, "actualiza registros (cada uno con su 'id')")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('entity', choices=ENTITIES)
+        sub.add_argument('--file', '-f', required=True, help="archivo JSON o JSONL ('-' para stdin)")
+        sub.add_argument('--dry-run', action='store_true', help='solo valida, no envía nada')
+        if name == 'update':
+            sub.add_argument('--merge', action='store_true', help='completa los campos faltantes con el registro actual')
+        sub.set_defaults(handler=handler)
+
+    delete_cmd = commands.add_parser('delete', help='elimina registros por ID')
+    delete_cmd.add_argument('entity', choices=ENTITIES)
+    delete_cmd.add_argument('ids', nargs='*')
+    delete_cmd.add_argument('--file', '-f', help='archivo JSON/JSONL con IDs o registros con id')
+    delete_cmd.add_argument('--dry-run', action='store_true')
+    delete_cmd.set_defaults(handler=cmd_delete)
+
+    export_cmd = commands.add_parser('export', help='exporta una entidad completa')
+    export_cmd.add_argument('entity', choices=ENTITIES)
+    export_cmd.add_argument('--format', choices=('json', 'jsonl', 'csv'), default='json')
+    export_cmd.add_argument('--output', '-o', help="archivo de salida ('-' para stdout)")
+    export_cmd.add_argument('--details', action='store_true', help='incluye el detalle de cada registro')
+    export_cmd.set_defaults(handler=cmd_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        api, session = _login(args)
+        failures = args.handler(api, session, args)
+    except ApiError as error:
+        print(f"Error de API: {error}", file=sys.stderr)
+        return 2
+    except requests.RequestException as error:
+        print(f"No se pudo conectar con {args.base_url} ({type(error).__name__}).", file=sys.stderr)
+        return 2
+    except InputFileError as error:
+        print(error, file=sys.stderr)
+        return 2
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
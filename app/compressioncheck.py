@@ -0,0 +1,201 @@
+"""Comprueba la compresión HTTP de ApiClient contra el servidor de prueba local.
+
+Levanta app.standin_server en un puerto libre con respuestas comprimidas y revisa que:
+el cliente anuncie Accept-Encoding y decodifique gzip y deflate, que CompressionStats
+cuente los bytes reales del cable (los mismos que envió el servidor), que sin
+compresión o por debajo del umbral todo viaje tal cual, y que los cuerpos grandes se
+envíen con Content-Encoding gzip y el servidor los lea completos:
+
+    python -m app.compressioncheck
+    python -m app.compressioncheck --seed 1000 --compress-over 256
+
+Termina con código 1 si algo falla, para poder correrlo en CI.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+import requests
+
+from app.services.api_client import ApiClient
+from app.services.compression import CompressionStats, compress_body
+from app.standin_server import CapacityModel, StandInStore, WireLog, build_server
+
+
+@dataclass
+class Stand:
+    """Servidor de prueba en marcha para una comprobación."""
+
+    url: str
+    store: StandInStore
+    log: WireLog
+    compress_over: int
+
+
+@dataclass
+class CheckResult:
+    name: str
+    detail: str = ''
+    problems: List[str] = field(default_factory=list)
+
+    def expect(self, condition: bool, problem: str) -> None:
+        if not condition:
+            self.problems.append(problem)
+
+
+def _ratio(wire: int, raw: int) -> str:
+    return f"{wire}/{raw} B ({wire / raw:.0%})" if raw else "0 B"
+
+
+def _listed(stand: Stand, entity: str) -> List[Any]:
+    # Lo que el servidor debió enviar, con la misma ida y vuelta por JSON que hace el cliente
+    return json.loads(json.dumps(list(stand.store.records[entity].values())))
+
+
+def check_gzip_responses(stand: Stand) -> CheckResult:
+    result = CheckResult('respuestas gzip')
+    api = ApiClient(stand.url, accept_compression=True)
+    rows = api.get('/students')
+    result.expect(rows == _listed(stand, 'students'), 'la lista decodificada no coincide con la del servidor')
+    result.expect(any('gzip' in accept for accept in stand.log.accept_encodings), 'el cliente no anunció gzip')
+    stats = api.compression_stats.snapshot()
+    result.expect(stats['compressed_responses'] == 1, f"respuestas comprimidas: {stats['compressed_responses']}, se esperaba 1")
+    result.expect(stats['received_wire'] == stand.log.response_wire['gzip'],
+                  f"bytes recibidos {stats['received_wire']} != enviados por el servidor {stand.log.response_wire['gzip']}")
+    result.expect(stats['received_decoded'] == stand.log.response_raw['gzip'], 'bytes decodificados distintos a los del servidor')
+    result.expect(stats['received_wire'] < stats['received_decoded'], 'la respuesta comprimida no es más chica')
+    result.detail = _ratio(stats['received_wire'], stats['received_decoded'])
+
+    # Un detalle por debajo del umbral viaja sin comprimir aunque el cliente acepte gzip
+    record = next(iter(stand.store.records['students'].values()))
+    if len(json.dumps(record)) < stand.compress_over:
+        api.get(f"/students/{record['id']}")
+        after = api.compression_stats.snapshot()
+        result.expect(after['compressed_responses'] == 1, 'se comprimió una respuesta por debajo del umbral')
+        result.expect(stand.log.response_wire['identity'] > 0, 'el servidor no envió la respuesta chica sin comprimir')
+    return result
+
+
+def check_deflate_responses(stand: Stand) -> CheckResult:
+    result = CheckResult('respuestas deflate')
+    stats = CompressionStats()
+    response = requests.get(f"{stand.url}/teachers", headers={'Accept-Encoding': 'deflate'}, timeout=10)
+    stats.record_response(response)
+    result.expect(response.headers.get('Content-Encoding') == 'deflate', 'el servidor no respondió con deflate')
+    result.expect(response.json() == _listed(stand, 'teachers'), 'la lista decodificada no coincide con la del servidor')
+    result.expect(stats.received_wire == stand.log.response_wire['deflate'],
+                  f"bytes recibidos {stats.received_wire} != enviados por el servidor {stand.log.response_wire['deflate']}")
+    result.detail = _ratio(stats.received_wire, stats.received_decoded)
+    return result
+
+
+def check_identity(stand: Stand) -> CheckResult:
+    result = CheckResult('sin compresión')
+    api = ApiClient(stand.url, accept_compression=False)
+    rows = api.get('/careers')
+    stats = api.compression_stats.snapshot()
+    result.expect(rows == _listed(stand, 'careers'), 'la lista no coincide con la del servidor')
+    result.expect(list(stand.log.accept_encodings) == ['identity'], f"Accept-Encoding enviado: {dict(stand.log.accept_encodings)}")
+    result.expect(stats['compressed_responses'] == 0, 'se contó una respuesta comprimida')
+    result.expect(stats['received_wire'] == stats['received_decoded'], 'sin compresión los bytes del cable deben ser los decodificados')
+    result.detail = _ratio(stats['received_wire'], stats['received_decoded'])
+    return result
+
+
+def check_request_bodies(stand: Stand) -> CheckResult:
+    result = CheckResult('cuerpos gzip')
+    api = ApiClient(stand.url, compress_requests_over=stand.compress_over)
+    big = {'name': 'Grupo grande', 'notes': ' '.join(f'alumno {index}' for index in range(400))}
+    created = api.post('/groups', big)
+    result.expect(stand.log.request_encodings['gzip'] == 1, f"cuerpos gzip recibidos: {stand.log.request_encodings['gzip']}")
+    stored = stand.store.records['groups'].get(created.get('id') if isinstance(created, dict) else None)
+    result.expect(stored is not None and stored['notes'] == big['notes'], 'el servidor no leyó completo el cuerpo comprimido')
+    stats = api.compression_stats.snapshot()
+    result.expect(stats['compressed_requests'] == 1, f"cuerpos comprimidos: {stats['compressed_requests']}, se esperaba 1")
+    result.expect(stats['sent_wire'] < stats['sent_raw'], 'el cuerpo comprimido no es más chico')
+    result.detail = _ratio(stats['sent_wire'], stats['sent_raw'])
+
+    # Por debajo del umbral el cuerpo se envía tal cual
+    if stored is not None:
+        api.put(f"/groups/{stored['id']}", {'name': 'Grupo'})
+    result.expect(api.compression_stats.compressed_requests == 1, 'se comprimió un cuerpo por debajo del umbral')
+    result.expect(stand.log.request_encodings['identity'] >= 1, 'el servidor no recibió el cuerpo chico sin comprimir')
+    return result
+
+
+def check_compress_body(stand: Stand) -> CheckResult:
+    result = CheckResult('compress_body')
+    text = json.dumps({'notes': 'a' * 4096}).encode()
+    result.expect(compress_body(text, None) == (text, None), 'sin umbral no debe comprimir')
+    result.expect(compress_body(text, len(text) + 1) == (text, None), 'por debajo del umbral no debe comprimir')
+    body, encoding = compress_body(text, len(text))
+    result.expect(encoding == 'gzip' and gzip.decompress(body) == text, 'en el umbral debe comprimir con gzip y ser reversible')
+    noise = os.urandom(4096)
+    result.expect(compress_body(noise, 1) == (noise, None), 'si gzip no ahorra nada se envía el original')
+    result.detail = _ratio(len(body), len(text))
+    return result
+
+
+CHECKS: Sequence[Callable[[Stand], CheckResult]] = (
+    check_gzip_responses, check_deflate_responses, check_identity, check_request_bodies, check_compress_body,
+)
+
+
+@contextmanager
+def stand_in(seed: int, compress_over: int) -> Iterator[Stand]:
+    """Servidor de prueba nuevo (con su propio registro del cable) en un puerto libre."""
+    log = WireLog()
+    store = StandInStore(seed)
+    server = build_server('127.0.0.1', 0, CapacityModel(service_time=0.0, jitter=0.0), store,
+                          compress_over=compress_over, log=log)
+    thread = threading.Thread(target=server.serve_forever, name='standin', daemon=True)
+    thread.start()
+    try:
+        yield Stand(f"http://127.0.0.1:{server.server_port}", store, log, compress_over)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def format_result(result: CheckResult) -> str:
+    lines = [f"{result.name:<20} {'FALLA' if result.problems else 'ok':<5} {result.detail}"]
+    lines.extend(f"    - {problem}" for problem in result.problems)
+    return '\n'.join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='app.compressioncheck', description='Comprueba la compresión HTTP del cliente.')
+    parser.add_argument('--seed', type=int, default=300, help='Registros por entidad en el servidor de prueba')
+    parser.add_argument('--compress-over', type=int, default=512, help='Umbral en bytes del servidor y del cliente')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.seed < 20 or args.compress_over < 1:
+        parser.error('--seed debe ser al menos 20 (listas que valga la pena comprimir) y --compress-over positivo')
+    failed = False
+    for check in CHECKS:
+        with stand_in(args.seed, args.compress_over) as stand:
+            try:
+                result = check(stand)
+            except Exception as error:  # Una comprobación que ni corre se reporta y se sigue con el resto
+                result = CheckResult(check.__name__, problems=[f"{type(error).__name__}: {error}"])
+        failed = failed or bool(result.problems)
+        print(format_result(result))
+    print(f"\n{'Hay fallas en la compresión.' if failed else 'Compresión correcta.'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,5 +7,56 @@ load_dotenv()
 @dataclass(frozen=True)
 class AppConfig:
     api_base_url: str = os.getenv("API_BASE_URL", "http://140.84.169.148:25630")
+    # 'orjson' (si está instalado) o 'json' para forzar la librería estándar
+    json_codec: str = os.getenv("API_JSON_CODEC", "orjson")
+    # Compresión HTTP: negociar gzip/deflate (br/zstd si están instalados) en las respuestas
+    # y comprimir con gzip los cuerpos de petición a partir de cierto tamaño (0 = desactivado)
+    accept_compression: bool = os.getenv("API_ACCEPT_COMPRESSION", "1") != "0"
+    compress_requests_over: int = int(os.getenv("API_COMPRESS_REQUESTS_OVER", "0"))
+    # Parámetro con el que se piden solo algunos campos en los listados ('' = no enviarlo)
+    fields_param: str = os.getenv("API_FIELDS_PARAM", "fields")
+    # Precargar los datos de un módulo al pasar el puntero sobre su botón del menú
+    prefetch: bool = os.getenv("SIGUE_PREFETCH", "1") != "0"
+    # Caché LRU de registros de detalle por entidad (0 = desactivada) y su caducidad en segundos
+    record_cache_size: int = int(os.getenv("SIGUE_RECORD_CACHE_SIZE", "256"))
+    record_cache_ttl: float = float(os.getenv("SIGUE_RECORD_CACHE_TTL", "60"))
+    # Recordar la sesión entre ejecuciones (token y usuario en un archivo con permisos 0600)
+    persist_session: bool = os.getenv("SIGUE_PERSIST_SESSION", "0") == "1"
+    session_file: str = os.getenv("SIGUE_SESSION_FILE", os.path.join("~", ".sigue", "session.json"))
+    # Ruta para renovar el token antes de que caduque ('' = la API no lo soporta) y con cuánta antelación (s)
+    auth_refresh_path: str = os.getenv("API_AUTH_REFRESH_PATH", "")
+    token_refresh_margin: float = float(os.getenv("API_TOKEN_REFRESH_MARGIN", "300"))
+    # Enviar altas, cambios y bajas en segundo plano con una bitácora en disco para no perderlos
+    write_behind: bool = os.getenv("SIGUE_WRITE_BEHIND", "0") == "1"
+    outbox_file: str = os.getenv("SIGUE_OUTBOX_FILE", os.path.join("~", ".sigue", "outbox.jsonl"))
+    # Conexiones simultáneas por servidor (0 = sin límite ni prioridades) y cuántas puede ocupar el trabajo de fondo
+    max_connections_per_host: int = int(os.getenv("SIGUE_MAX_CONNECTIONS_PER_HOST", "6"))
+    background_connections: int = int(os.getenv("SIGUE_BACKGROUND_CONNECTIONS", "2"))
+    # Reintentos con espera exponencial al azar: métodos que se repiten ('' = ninguno) e intentos máximos
+    retry_methods: str = os.getenv("API_RETRY_METHODS", "GET,PUT,DELETE")
+    retry_attempts: int = int(os.getenv("API_RETRY_ATTEMPTS", "3"))
+    retry_base_delay: float = float(os.getenv("API_RETRY_BASE_DELAY", "0.2"))
+    retry_max_delay: float = float(os.getenv("API_RETRY_MAX_DELAY", "2"))
+    # Lanzar un GET duplicado si el original tarda más que el percentil indicado de su endpoint
+    hedge_gets: bool = os.getenv("API_HEDGE_GETS", "0") == "1"
+    hedge_percentile: float = float(os.getenv("API_HEDGE_PERCENTILE", "0.95"))
+    # Plazos en segundos: conexión y lectura (tiempo máximo sin recibir datos)
+    connect_timeout: float = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+    read_timeout: float = float(os.getenv("API_READ_TIMEOUT", "10"))
+    # Plazos por endpoint, p. ej. "GET /students=30; POST /auth/login=2/8" (lectura o conexión/lectura)
+    timeout_overrides: str = os.getenv("API_TIMEOUT_OVERRIDES", "")
+    # Calcular la lectura de cada endpoint como factor × su percentil observado (con read_timeout de tope)
+    adaptive_timeouts: bool = os.getenv("API_ADAPTIVE_TIMEOUTS", "0") == "1"
+    adaptive_timeout_percentile: float = float(os.getenv("API_ADAPTIVE_TIMEOUT_PERCENTILE", "0.99"))
+    adaptive_timeout_factor: float = float(os.getenv("API_ADAPTIVE_TIMEOUT_FACTOR", "3"))
+    adaptive_timeout_min: float = float(os.getenv("API_ADAPTIVE_TIMEOUT_MIN", "1"))
+    # Modo diagnóstico: vigilar bloqueos del hilo de la interfaz de más de N ms y reportarlos al salir
+    diagnostics: bool = os.getenv("SIGUE_DIAGNOSTICS", "0") == "1"
+    stall_threshold_ms: int = int(os.getenv("SIGUE_STALL_THRESHOLD_MS", "100"))
+    stall_report_file: str = os.getenv("SIGUE_STALL_REPORT", "")
+    # Perfilar (cProfile + tracemalloc) cada acción desde el arranque; también se activa desde el
+    # menú Diagnóstico, que aparece con este modo, con SIGUE_DIAGNOSTICS o con Ctrl+Alt+P
+    profile: bool = os.getenv("SIGUE_PROFILE", "0") == "1"
+    profile_dir: str = os.getenv("SIGUE_PROFILE_DIR", os.path.join("~", ".sigue", "profiles"))
 
 CONFIG = AppConfig()
@@ -0,0 +1,235 @@
+"""Comprueba que abrir y cerrar los módulos del menú no deja memoria retenida.
+
+Abre y cierra cada ventana varias veces contra una API falsa (sin servidor) y compara
+antes y después: frames que siguen vivos tras gc.collect() (con weakref), crecimiento
+de objetos por tipo, memoria neta por ciclo (tracemalloc) y comandos de Tcl que no se
+liberaron (callbacks de botones, trace de variables, after pendientes):
+
+    python -m app.leakcheck
+    python -m app.leakcheck --cycles 30 --module StudentsWindow --module GroupsWindow
+    xvfb-run python -m app.leakcheck --role STUDENT
+
+Termina con código 1 si algún módulo supera lo tolerado, para poder correrlo en CI.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tkinter as tk
+import tracemalloc
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from tkinter import messagebox
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.services.api_client import ApiClient
+from app.services.session import UserSession
+from app.ui.main_menu import MODULE_WINDOWS, MainMenu, WindowType
+
+# Campos numéricos que las ventanas convierten o comparan como números
+NUMERIC_FIELDS = ('id', 'semester', 'semesters', 'credits', 'maxStudents', 'capacity')
+
+
+class FakeRecord(dict):
+    """Registro que inventa cualquier campo que la ventana lea con record['campo']."""
+
+    def __missing__(self, key: str) -> Any:
+        if key.endswith('Ids'):
+            return []
+        if key in NUMERIC_FIELDS or key.endswith('Id'):
+            return 1
+        return f"{key} {dict.get(self, 'id', 1)}"
+
+
+class FakeApi(ApiClient):
+    """ApiClient que responde en memoria: listas de `rows` registros y el detalle de cada uno."""
+
+    def __init__(self, role: str, rows: int = 3) -> None:
+        super().__init__('http://leakcheck.invalid')
+        self.role = role
+        self.rows = rows
+        self.calls = 0
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        self.calls += 1
+        if method.upper() != 'GET':
+            return FakeRecord(id=1)
+        segments = [segment for segment in path.split('?', 1)[0].split('/') if segment]
+        if segments and segments[-1].isdigit():
+            return self._record(int(segments[-1]), segments[0])
+        if segments[-1:] == ['me']:
+            return self._record(1, segments[0])
+        return [self._record(index, segments[0] if segments else '') for index in range(1, self.rows + 1)]
+
+    def _record(self, record_id: int, resource: str) -> FakeRecord:
+        return FakeRecord(
+            id=record_id, name=f"{resource} {record_id}", email=f"user{record_id}@leakcheck.invalid",
+            username=f"user{record_id}", role=self.role, status='ACTIVE',
+        )
+
+
+@dataclass
+class LeakResult:
+    module: str
+    cycles: int
+    alive: int = 0
+    bytes_per_cycle: float = 0.0
+    tcl_commands: int = 0
+    type_growth: Dict[str, int] = field(default_factory=dict)
+    top_allocations: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def failures(self, max_bytes_per_cycle: float, max_objects_per_cycle: float) -> List[str]:
+        problems = list(self.errors)
+        if self.alive:
+            problems.append(f"{self.alive} de {self.cycles} frames cerrados siguen vivos")
+        if self.bytes_per_cycle > max_bytes_per_cycle:
+            problems.append(f"crece {self.bytes_per_cycle / 1024:.1f} KiB por ciclo")
+        if self.tcl_commands > 0:
+            problems.append(f"{self.tcl_commands} comandos de Tcl sin liberar")
+        for name, growth in self.type_growth.items():
+            if growth > max_objects_per_cycle * self.cycles:
+                problems.append(f"+{growth} objetos {name}")
+        return problems
+
+
+def _silence_dialogs(log: List[str]) -> None:
+    """Los avisos se anotan en lugar de bloquear el ciclo esperando un clic."""
+
+    def record(kind: str, answer: Any) -> Any:
+        def show(title: str = '', message: str = '', **_: Any) -> Any:
+            log.append(f"{kind}: {title}: {message}")
+            return answer
+        return show
+
+    for name in ('showinfo', 'showwarning', 'showerror'):
+        setattr(messagebox, name, record(name, 'ok'))
+    for name in ('askyesno', 'askokcancel', 'askretrycancel'):
+        setattr(messagebox, name, record(name, False))
+    messagebox.askyesnocancel = record('askyesnocancel', None)
+
+
+def _type_counts() -> Counter:
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def _tcl_commands(root: tk.Tk) -> int:
+    return len(root.tk.splitlist(root.tk.call('info', 'commands')))
+
+
+def _settle(root: tk.Tk) -> None:
+    for _ in range(3):
+        root.update()
+    gc.collect()
+
+
+def check_module(
+    root: tk.Tk,
+    menu: MainMenu,
+    window_class: WindowType,
+    cycles: int,
+    warmup: int = 2,
+    dialogs: Optional[List[str]] = None,
+) -> LeakResult:
+    name = window_class.__name__
+    result = LeakResult(name, cycles)
+
+    def cycle() -> Optional[weakref.ref]:
+        menu._load_module(name, window_class)
+        root.update()
+        frame = weakref.ref(menu.current_content_frame) if menu.current_content_frame is not None else None
+        menu._show_welcome_screen()
+        root.update()
+        return frame
+
+    # Los primeros ciclos llenan cachés de estilos, fuentes e imports; no cuentan como fuga
+    try:
+        for _ in range(warmup):
+            cycle()
+    except Exception as error:  # Un módulo que ni abre se reporta y se sigue con el resto
+        result.errors.append(f"no se pudo abrir: {type(error).__name__}: {error}")
+        return result
+    _settle(root)
+    opened_dialogs = len(dialogs) if dialogs is not None else 0
+    counts_before = _type_counts()
+    commands_before = _tcl_commands(root)
+    snapshot_before = tracemalloc.take_snapshot()
+
+    frames = [cycle() for _ in range(cycles)]
+
+    _settle(root)
+    snapshot_after = tracemalloc.take_snapshot()
+    result.tcl_commands = _tcl_commands(root) - commands_before
+    counts_after = _type_counts()
+    result.alive = sum(1 for frame in frames if frame is not None and frame() is not None)
+
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    differences = snapshot_after.filter_traces(ignore).compare_to(snapshot_before.filter_traces(ignore), 'lineno')
+    result.bytes_per_cycle = sum(stat.size_diff for stat in differences) / cycles
+    result.top_allocations = [str(stat) for stat in differences[:5] if stat.size_diff > 0]
+    growth = counts_after - counts_before
+    result.type_growth = dict(growth.most_common(10))
+    if dialogs is not None and len(dialogs) > opened_dialogs:
+        result.errors.append(f"mostró {len(dialogs) - opened_dialogs} avisos (p. ej. {dialogs[opened_dialogs]})")
+    return result
+
+
+def format_result(result: LeakResult, problems: Sequence[str]) -> str:
+    status = 'FUGA' if problems else 'ok'
+    lines = [
+        f"{result.module:<18} {status:<5} vivos={result.alive}/{result.cycles} "
+        f"memoria={result.bytes_per_cycle / 1024:+.1f} KiB/ciclo tcl={result.tcl_commands:+d}"
+    ]
+    for problem in problems:
+        lines.append(f"    - {problem}")
+    if problems:
+        for allocation in result.top_allocations:
+            lines.append(f"      {allocation}")
+    return '\n'.join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    names = [window_class.__name__ for window_class in MODULE_WINDOWS]
+    parser = argparse.ArgumentParser(prog='app.leakcheck', description='Detecta fugas de memoria al cambiar de módulo.')
+    parser.add_argument('--cycles', type=int, default=20, help='Veces que se abre y cierra cada módulo')
+    parser.add_argument('--warmup', type=int, default=2, help='Ciclos previos que no se miden')
+    parser.add_argument('--module', action='append', choices=names, help='Módulo a revisar (repetible; por defecto todos)')
+    parser.add_argument('--role', default='ADMIN', choices=('ADMIN', 'TEACHER', 'STUDENT'))
+    parser.add_argument('--rows', type=int, default=3, help='Registros por lista de la API falsa')
+    parser.add_argument('--max-kib-per-cycle', type=float, default=16.0, help='Memoria neta tolerada por ciclo')
+    parser.add_argument('--max-objects-per-cycle', type=float, default=5.0, help='Objetos de un mismo tipo tolerados por ciclo')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    selected = [cls for cls in MODULE_WINDOWS if not args.module or cls.__name__ in args.module]
+    dialogs: List[str] = []
+    _silence_dialogs(dialogs)
+
+    root = tk.Tk()
+    root.withdraw()
+    api = FakeApi(args.role, rows=args.rows)
+    session = UserSession(token='leakcheck', user={'id': '1', 'nombre': 'Prueba de fugas', 'role': args.role})
+    menu = MainMenu(root, api, session)
+    tracemalloc.start(10)
+    failed = False
+    try:
+        for window_class in selected:
+            result = check_module(root, menu, window_class, args.cycles, args.warmup, dialogs)
+            problems = result.failures(args.max_kib_per_cycle * 1024, args.max_objects_per_cycle)
+            failed = failed or bool(problems)
+            print(format_result(result, problems))
+    finally:
+        tracemalloc.stop()
+        if session.bootstrap is not None:
+            session.bootstrap.cancel()
+        root.destroy()
+    print(f"\n{'Se encontraron fugas.' if failed else 'Sin fugas.'} ({api.calls} peticiones a la API falsa)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+import requests
+
+from app.services.api_client import ApiError
+
+T = TypeVar('T')
+
+
+@dataclass
+class AdaptiveStats:
+    completed: int = 0
+    server_errors: int = 0
+    overloaded: int = 0
+    retried: int = 0
+    increases: int = 0
+    decreases: int = 0
+    paused_seconds: float = 0.0
+    _latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200), repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._latencies)
+            return {
+                'completed': self.completed,
+                'server_errors': self.server_errors,
+                'overloaded': self.overloaded,
+                'retried': self.retried,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'paused_s': round(self.paused_seconds, 1),
+                'p50_ms': round(recent[len(recent) // 2] * 1000, 1) if recent else 0.0,
+                'p95_ms': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1) if recent else 0.0,
+            }
+
+
+class AdaptiveLimiter:
+    """Límite de peticiones simultáneas que se ajusta solo (AIMD) durante un trabajo masivo.
+
+    Mientras la latencia se mantiene cerca de la habitual y no hay errores del servidor,
+    el límite sube de a poco (≈ +1 por cada ronda de `limit` respuestas). Ante un 429/503,
+    una latencia de más de `latency_tolerance` veces la habitual o demasiados 5xx, se
+    reduce a la mitad, una sola vez por ronda: las respuestas de peticiones que salieron
+    antes del recorte no vuelven a recortar. Si el servidor manda `Retry-After` no se
+    envía nada hasta que pase ese tiempo, y lo rechazado por sobrecarga se reintenta.
+    """
+
+    OVERLOAD_STATUS = (429, 503)
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        error_threshold: float = 0.1,
+        window: int = 20,
+        max_attempts: int = 5,
+        default_pause: float = 0.25,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.max_attempts = max(1, max_attempts)
+        # Pausa tras un 429/503 que no trae Retry-After
+        self.default_pause = default_pause
+        self.stats = AdaptiveStats()
+        self.in_flight = 0
+        # Latencia habitual: media móvil de las respuestas sanas
+        self.baseline: Optional[float] = None
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = error del servidor
+        self._last_cut = 0.0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def call(self, fn: Callable[..., T], *args: Any) -> T:
+        """Ejecuta `fn` dentro del límite; lo rechazado por sobrecarga se reintenta tras la pausa."""
+        attempt = 1
+        while True:
+            started = self._acquire()
+            try:
+                result = fn(*args)
+            except (ApiError, requests.ConnectionError, requests.Timeout) as error:
+                overloaded = self._release(started, error)
+                if not overloaded or attempt >= self.max_attempts:
+                    raise
+                attempt += 1
+                with self.stats._lock:
+                    self.stats.retried += 1
+                continue
+            except BaseException:
+                self._release(started, None, count=False)
+                raise
+            self._release(started, None)
+            return result
+
+    def _acquire(self) -> float:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    self._cond.wait()
+            self.in_flight += 1
+            return now
+
+    def _release(self, started: float, error: Optional[BaseException], count: bool = True) -> bool:
+        """Registra el resultado y ajusta el límite; True si el servidor rechazó por sobrecarga."""
+        now = time.monotonic()
+        latency = now - started
+        status = error.status_code if isinstance(error, ApiError) else None
+        overloaded = status in self.OVERLOAD_STATUS
+        # Los 4xx son problemas del registro, no del servidor: no cuentan para el ajuste
+        server_error = error is not None and (status is None or status >= 500)
+        with self._cond:
+            self.in_flight -= 1
+            if count and (error is None or server_error or overloaded):
+                self._outcomes.append(server_error or overloaded)
+                self._adjust(started, now, latency, error, overloaded)
+            self._cond.notify_all()
+        with self.stats._lock:
+            self.stats.completed += 1 if count and not overloaded else 0
+            self.stats.server_errors += 1 if server_error and not overloaded else 0
+            self.stats.overloaded += 1 if overloaded else 0
+            if error is None and count:
+                self.stats._latencies.append(latency)
+        return overloaded
+
+    def _adjust(self, started: float, now: float, latency: float, error: Optional[BaseException], overloaded: bool) -> None:
+        if overloaded:
+            retry_after = getattr(error, 'retry_after', None)
+            pause_until = now + (retry_after if retry_after is not None else self.default_pause)
+            if pause_until > self._paused_until:
+                with self.stats._lock:
+                    self.stats.paused_seconds += pause_until - max(now, self._paused_until)
+                self._paused_until = pause_until
+        spike = error is None and self.baseline is not None and latency > self.baseline * self.latency_tolerance
+        full_window = len(self._outcomes) == self._outcomes.maxlen
+        failing = full_window and sum(self._outcomes) / len(self._outcomes) > self.error_threshold
+        if overloaded or spike or failing:
+            if started >= self._last_cut:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_cut = now
+                self._outcomes.clear()
+                with self.stats._lock:
+                    self.stats.decreases += 1
+            return
+        if error is not None:
+            return
+        self.baseline = latency if self.baseline is None else self.baseline * 0.9 + latency * 0.1
+        if self.in_flight + 1 >= int(self.limit) and self.limit < self.max_limit:
+            # Solo se sube si el límite actual de verdad se está usando
+            previous = int(self.limit)
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            if int(self.limit) > previous:
+                with self.stats._lock:
+                    self.stats.increases += 1
+
+    def describe(self) -> str:
+        """Una línea con el estado actual, para mostrarla mientras corre el trabajo."""
+        stats = self.stats.snapshot()
+        with self._cond:
+            limit, in_flight = int(self.limit), self.in_flight
+            paused = max(0.0, self._paused_until - time.monotonic())
+        line = (
+            f"límite {limit:>3} | en vuelo {in_flight:>3} | hechas {stats['completed']} | "
+            f"p50 {stats['p50_ms']} ms | p95 {stats['p95_ms']} ms | 429/503 {stats['overloaded']} | "
+            f"5xx {stats['server_errors']} | reintentos {stats['retried']}"
+        )
+        return f"{line} | pausa {paused:.1f} s" if paused >= 0.05 else line
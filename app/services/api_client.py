@@ -1,25 +1,86 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Optional
+import time
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
 
 import requests
 
+from app.services.compression import SUPPORTED_ENCODINGS, CompressionStats, compress_body
+from app.services.json_codec import JsonCodec, default_codec
+from app.services.latency import LatencyTracker
+from app.services.prefetch import MISS, PrefetchEngine
+from app.services.record_cache import RecordCache, parse_record_path
+from app.services.scheduler import RequestScheduler
+from app.services.timeouts import TimeoutPolicy
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.adaptive import AdaptiveLimiter
+    from app.services.outbox import Outbox
+    from app.services.retry import RequestRetrier
+
 
 class ApiClient:
     """Cliente HTTP sencillo para consumir la API REST del servidor."""
 
-    def __init__(self, base_url: str, timeout: int = 10) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10,
+        codec: Optional[JsonCodec] = None,
+        *,
+        connect_timeout: float = 3.05,
+        accept_compression: bool = True,
+        compress_requests_over: Optional[int] = None,
+        fields_param: str = 'fields',
+    ) -> None:
         self.base_url = base_url.rstrip('/')
-        self.timeout = timeout
+        self.codec = codec or default_codec()
+        self.accept_compression = accept_compression
+        # Umbral en bytes a partir del cual se comprime el cuerpo (None = nunca)
+        self.compress_requests_over = compress_requests_over
+        self.compression_stats = CompressionStats()
+        # Nombre del parámetro de consulta para pedir solo ciertos campos ('' = no se envía)
+        self.fields_param = fields_param
+        # Precarga opcional de lecturas (ver PrefetchEngine); la asigna la aplicación
+        self.prefetcher: Optional[PrefetchEngine] = None
+        # Caché opcional de registros de detalle (GET /{entidad}/{id})
+        self.records: Optional[RecordCache] = None
+        # Cola opcional de escrituras en segundo plano (ver app.services.outbox.Outbox)
+        self.outbox: Optional['Outbox'] = None
+        # Turnos opcionales por prioridad y límite de conexiones por host (ver RequestScheduler)
+        self.scheduler: Optional[RequestScheduler] = None
+        # Límite adaptativo de concurrencia para trabajos masivos (ver app.services.adaptive)
+        self.limiter: Optional['AdaptiveLimiter'] = None
+        # Reintentos y peticiones de respaldo opcionales (ver app.services.retry)
+        self.retrier: Optional['RequestRetrier'] = None
+        # Latencias observadas por endpoint
+        self.latency = LatencyTracker()
+        # Plazos de conexión y lectura por endpoint; `timeout` es el de lectura por defecto
+        self.timeouts = TimeoutPolicy(self.latency, connect=connect_timeout, read=timeout)
+        # Última versión (ETag) conocida de cada ruta leída o escrita, para enviar If-Match
+        self.versions: Dict[str, str] = {}
         self._token: Optional[str] = None
 
-    def set_token(self, token: Optional[str]) -> None:
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    def set_token(self, token: Optional[str], *, same_session: bool = False) -> None:
+        # Una renovación del token de la misma sesión conserva lo que ya está en caché
+        if token != self._token and not same_session and self.prefetcher is not None:
+            self.prefetcher.invalidate()  # Lo precargado pertenece a la sesión anterior
+        if token != self._token and not same_session and self.records is not None:
+            self.records.invalidate()
+        if token != self._token and not same_session:
+            self.versions.clear()
         self._token = token
 
     def _build_headers(self, extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         headers: Dict[str, str] = {
             "Accept": "application/json",
+            "Accept-Encoding": SUPPORTED_ENCODINGS if self.accept_compression else "identity",
             "Content-Type": "application/json"
         }
         if self._token:
@@ -28,21 +89,92 @@ class ApiClient:
             headers.update(extra_headers)
         return headers
 
-    def request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None) -> Any:
+    def query_params(self, params: Optional[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Parámetros finales de una lectura, incluyendo la proyección de campos si hay."""
+        if not fields or not self.fields_param:
+            return params
+        return {**(params or {}), self.fields_param: ','.join(fields)}
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        params = self.query_params(params, fields)
+        if method.upper() != 'GET' and self.prefetcher is not None:
+            # Una escritura puede dejar obsoleta cualquier lectura precargada (p. ej. /users/unassigned)
+            self.prefetcher.invalidate()
+        if method.upper() != 'GET' and self.records is not None:
+            self.records.invalidate_for_write(path)
+        payload = self.codec.dumps(data) if data is not None else None
+        extra_headers: Dict[str, str] = dict(headers or {})
+        if payload is not None:
+            raw_size = len(payload)
+            payload, encoding = compress_body(payload, self.compress_requests_over)
+            if encoding:
+                extra_headers["Content-Encoding"] = encoding
+            self.compression_stats.record_request(raw_size, len(payload))
+        headers = self._build_headers(extra_headers)
+
+        def attempt() -> requests.Response:
+            if self.limiter is not None:
+                return self.limiter.call(self._send, method, path, headers, params, payload)
+            return self._send(method, path, headers, params, payload)
+
+        response = self.retrier.execute(method, path, attempt, headers) if self.retrier is not None else attempt()
+        result = self.codec.loads(response.content) if response.content else None
+        self._remember_version(method.upper(), path, response, result)
+        if result is not None and fields:
+            # Si el servidor ignora la proyección, se recorta aquí para no retener campos que nadie usa
+            return project_fields(result, fields)
+        return result
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        payload: Optional[bytes],
+    ) -> requests.Response:
         url = f"{self.base_url}{path}"
-        payload = json.dumps(data) if data is not None else None
-        response = requests.request(
-            method=method.upper(),
-            url=url,
-            headers=self._build_headers(),
-            params=params,
-            data=payload,
-            timeout=self.timeout
-        )
+        with self.scheduler.slot(url) if self.scheduler is not None else nullcontext():
+            started = time.monotonic()
+            try:
+                response = requests.request(
+                    method=method.upper(),
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=payload,
+                    timeout=self.timeouts.for_request(method, path)
+                )
+            except requests.Timeout:
+                self.timeouts.note_timeout(method, path)
+                raise
+            self.latency.record(method, path, time.monotonic() - started)
+        self.compression_stats.record_response(response)
         self._raise_for_status(response)
-        if response.content:
-            return response.json()
-        return None
+        return response
+
+    def _remember_version(self, method: str, path: str, response: requests.Response, result: Any) -> None:
+        if method == 'DELETE':
+            self.versions.pop(path, None)
+            return
+        etag = response.headers.get('ETag')
+        if not etag and isinstance(result, dict) and result.get('version') is not None:
+            etag = f'"{result["version"]}"'  # La API expone la versión en el cuerpo en lugar de la cabecera
+        if etag and method in ('GET', 'PUT'):
+            self.versions[path] = etag
+
+    def version_of(self, path: str) -> Optional[str]:
+        """ETag con el que se leyó por última vez `path` (None si el servidor no lo indicó)."""
+        return self.versions.get(path)
 
     def _raise_for_status(self, response: requests.Response) -> None:
         try:
@@ -50,10 +182,13 @@ class ApiClient:
         except requests.HTTPError as error:
             message: str
             try:
-                message = response.json().get("message", str(error))
-            except ValueError:
+                message = self.codec.loads(response.content).get("message", str(error))
+            except (ValueError, TypeError, AttributeError):
                 message = str(error)
-            raise ApiError(status_code=response.status_code, message=message) from error
+            raise ApiError(
+                status_code=response.status_code, message=message,
+                retry_after=parse_retry_after(response.headers.get('Retry-After')),
+            ) from error
 
     # Métodos auxiliares de alto nivel
     def login(self, username: str, password: str) -> Dict[str, Any]:
@@ -61,24 +196,65 @@ class ApiClient:
         self.set_token(result.get("token"))
         return result
 
-    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        return self.request("GET", path, params=params)
+    def refresh_token(self, path: str) -> Optional[str]:
+        """Pide un token nuevo para la sesión actual (si la API lo soporta) y lo empieza a usar."""
+        result = self.request("POST", path)
+        token = result.get("token") if isinstance(result, dict) else None
+        if token:
+            self.set_token(token, same_session=True)
+        return token
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, fields: Optional[Sequence[str]] = None) -> Any:
+        if self.prefetcher is not None:
+            result = self.prefetcher.claim(path, self.query_params(params, fields))
+            if result is not MISS:
+                return result
+        record_path = parse_record_path(path) if self.records is not None and not params and not fields else None
+        if record_path is not None:
+            return self.records.get(*record_path)
+        return self.request("GET", path, params=params, fields=fields)
 
     def post(self, path: str, data: Dict[str, Any]) -> Any:
         return self.request("POST", path, data=data)
 
-    def put(self, path: str, data: Dict[str, Any]) -> Any:
-        return self.request("PUT", path, data=data)
+    def put(self, path: str, data: Dict[str, Any], *, if_match: Optional[str] = None) -> Any:
+        """Con `if_match` el servidor responde 412 si el registro cambió desde que se leyó."""
+        return self.request("PUT", path, data=data, headers={"If-Match": if_match} if if_match else None)
+
+    def delete(self, path: str, *, if_match: Optional[str] = None) -> Any:
+        return self.request("DELETE", path, headers={"If-Match": if_match} if if_match else None)
+
 
-    def delete(self, path: str) -> Any:
-        return self.request("DELETE", path)
+def project_fields(data: Any, fields: Sequence[str]) -> Any:
+    """Deja solo `fields` en un registro o en una lista de registros."""
+    if isinstance(data, list):
+        return [{key: item[key] for key in fields if key in item} if isinstance(item, dict) else item for item in data]
+    if isinstance(data, dict):
+        return {key: data[key] for key in fields if key in data}
+    return data
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos que pide esperar la cabecera Retry-After (en segundos o como fecha HTTP)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class ApiError(Exception):
-    def __init__(self, status_code: int, message: str) -> None:
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None) -> None:
         super().__init__(message)
         self.status_code = status_code
         self.message = message
+        # Con 429/503 el servidor puede indicar cuánto esperar antes de reintentar
+        self.retry_after = retry_after
 
     def __str__(self) -> str:
         return f"[{self.status_code}] {self.message}"
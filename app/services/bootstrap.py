@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from app.services.prefetch import MISS
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.api_client import ApiClient
+    from app.services.session import UserSession
+
+# (ruta, parámetros, campos) de una lectura que depende del resultado de otra
+BootstrapRequest = Tuple[str, Optional[Dict[str, Any]], Optional[Sequence[str]]]
+
+
+class BootstrapBundle:
+    """Lecturas iniciales de un rol, lanzadas en paralelo en cuanto llega el token.
+
+    Cada ventana declara en `bootstrap(bundle, role)` lo que necesita para mostrarse y,
+    cuando `ready` indica que ya llegó todo lo suyo, toma los resultados con `take` (una
+    sola vez) en lugar de encadenar peticiones; así el hilo de Tk nunca espera a la red. Las lecturas que dependen de otra (p. ej. las materias de la carrera
+    del alumno) se lanzan en cuanto termina aquella, sin ocupar un hilo esperando.
+    """
+
+    def __init__(self, api: 'ApiClient', max_workers: int = 4) -> None:
+        self.api = api
+        self.started_at = time.monotonic()
+        # Milisegundos desde el inicio hasta que terminó cada lectura
+        self.timings: Dict[str, float] = {}
+        self._futures: Dict[str, Future] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self._owner = ''
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bootstrap')
+
+    def fetch(self, name: str, path: str, params: Optional[Dict[str, Any]] = None, fields: Optional[Sequence[str]] = None) -> None:
+        self._register(name, self._pool.submit(self._get, name, (path, params, fields)))
+
+    def then(self, name: str, after: str, build: Callable[[Any], Optional[BootstrapRequest]]) -> None:
+        """Programa `name` cuando termine `after`; `build` recibe su resultado y devuelve la petición (o None)."""
+        result: Future = Future()
+        self._register(name, result)
+
+        def run(source: Future) -> None:
+            if not result.set_running_or_notify_cancel():
+                return
+            try:
+                request = build(source.result())
+                result.set_result(self._get(name, request) if request is not None else None)
+            except BaseException as error:  # noqa: BLE001 - se entrega a quien haga take()
+                result.set_exception(error)
+
+        def chain(source: Future) -> None:
+            try:
+                self._pool.submit(run, source)
+            except RuntimeError:  # el paquete ya se canceló (cierre de sesión)
+                result.cancel()
+
+        self._futures[after].add_done_callback(chain)
+
+    def _register(self, name: str, future: Future) -> None:
+        with self._lock:
+            self._futures[name] = future
+            self._owners.setdefault(self._owner, set()).add(name)
+
+    def _get(self, name: str, request: BootstrapRequest) -> Any:
+        path, params, fields = request
+        try:
+            return self.api.request('GET', path, params=params, fields=fields)
+        finally:
+            self.timings[name] = round((time.monotonic() - self.started_at) * 1000, 1)
+
+    def take(self, name: str) -> Any:
+        """Resultado de `name` (esperándolo si aún está en vuelo) o MISS si no se pidió, ya se tomó o falló."""
+        with self._lock:
+            future = self._futures.pop(name, None)
+            for names in self._owners.values():
+                names.discard(name)
+        if future is None:
+            return MISS
+        try:
+            return future.result()
+        except (CancelledError, Exception):  # noqa: BLE001 - quien llama repite la lectura y muestra el error
+            return MISS
+
+    def ready(self, owner: str) -> bool:
+        """True si todas las lecturas sin tomar de la ventana `owner` ya terminaron (take no esperará)."""
+        with self._lock:
+            return all(self._futures[name].done() for name in self._owners.get(owner, ()) if name in self._futures)
+
+    def pending(self, owner: str) -> bool:
+        """True si la ventana `owner` aún tiene lecturas sin tomar (no hace falta precargarla)."""
+        with self._lock:
+            return bool(self._owners.get(owner))
+
+    def cancel(self) -> None:
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+            self._owners.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start_bootstrap(api: 'ApiClient', role: Optional[str], windows: Iterable[Any]) -> Optional[BootstrapBundle]:
+    """Crea el paquete del rol con lo que declaren las ventanas; None si ninguna necesita nada."""
+    if not role:
+        return None
+    bundle = BootstrapBundle(api)
+    for window_class in windows:
+        declare = getattr(window_class, 'bootstrap', None)
+        if declare is None:
+            continue
+        bundle._owner = window_class.__name__
+        declare(bundle, role)
+    bundle._owner = ''
+    if not bundle._futures:
+        bundle.cancel()
+        return None
+    return bundle
+
+
+def take_or_get(
+    api: 'ApiClient',
+    session: 'UserSession',
+    name: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Any:
+    """Usa la lectura del paquete inicial si existe; si no, hace la petición normal."""
+    bundle = session.bootstrap
+    result = bundle.take(name) if bundle is not None else MISS
+    return api.get(path, params=params, fields=fields) if result is MISS else result
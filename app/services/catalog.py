@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    subject_id: int
+    career_id: Optional[int]
+    label: str
+    order: int
+
+
+class SubjectCatalog:
+    """Materias indexadas por ID y por carrera, con la etiqueta del Listbox ya calculada.
+
+    Filtrar por carreras cuesta O(materias de esas carreras) en lugar de recorrer
+    todas las materias y buscar linealmente el nombre de cada carrera.
+    """
+
+    def __init__(self, subjects: Iterable[Mapping[str, Any]] = (), careers: Iterable[Mapping[str, Any]] = ()) -> None:
+        career_names = {career['id']: career['name'] for career in careers}
+        self.entries: List[CatalogEntry] = []
+        self.by_id: Dict[int, CatalogEntry] = {}
+        self.by_career: Dict[Optional[int], List[CatalogEntry]] = {}
+
+        for order, subject in enumerate(subjects):
+            career_id = subject.get('careerId')
+            entry = CatalogEntry(
+                subject_id=subject['id'],
+                career_id=career_id,
+                label=f"{subject['id']} - {subject['name']} ({career_names.get(career_id, '')})",
+                order=order,
+            )
+            self.entries.append(entry)
+            self.by_id[entry.subject_id] = entry
+            self.by_career.setdefault(career_id, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, subject_id: object) -> bool:
+        return subject_id in self.by_id
+
+    def filter(self, career_ids: Set[int]) -> List[CatalogEntry]:
+        """Materias de las carreras indicadas (todas si el conjunto está vacío), en el orden original."""
+        if not career_ids:
+            return self.entries
+        if len(career_ids) == 1:
+            return self.by_career.get(next(iter(career_ids)), [])
+        selected = [entry for career_id in career_ids for entry in self.by_career.get(career_id, [])]
+        selected.sort(key=lambda entry: entry.order)
+        return selected
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Tuple
+
+# Mayor que cualquier letra: "ñ" queda como "n" + LAST, después de toda palabra con "n" y antes de "o"
+LAST = '\U0010ffff'
+
+SortKey = Tuple[int, Any, str]
+
+
+def spanish_key(text: str) -> str:
+    """Clave de orden en español: sin mayúsculas ni acentos ('Álvarez' junto a 'alvarez'), con la ñ después de la n."""
+    folded = text.casefold()
+    if folded.isascii():
+        return folded
+    decomposed = unicodedata.normalize('NFD', folded).replace('n\u0303', 'n' + LAST)  # ñ ya descompuesta: n + tilde
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=65536, typed=True)
+def sort_key(value: Any) -> SortKey:
+    """Clave para ordenar una celda: los números (IDs, semestres) por valor y antes que los textos.
+
+    Se guarda en caché por valor: las columnas repiten mucho (carreras, semestres, apellidos).
+    """
+    if isinstance(value, bool) or value is None:
+        return (1, 0, spanish_key('' if value is None else str(value)))
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    text = str(value).strip()
+    if text.isdecimal():  # isdigit() también acepta '²', que int() rechaza
+        return (0, int(text), '')
+    return (1, 0, spanish_key(text))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+# urllib3 ya descomprime gzip/deflate y, si están instalados brotli/zstandard, también br/zstd.
+# ACCEPT_ENCODING refleja exactamente los decodificadores disponibles en este equipo.
+SUPPORTED_ENCODINGS = ACCEPT_ENCODING
+
+
+@dataclass
+class CompressionStats:
+    """Contadores de bytes ahorrados por la compresión (enviados y recibidos)."""
+
+    sent_raw: int = 0
+    sent_wire: int = 0
+    received_wire: int = 0
+    received_decoded: int = 0
+    compressed_requests: int = 0
+    compressed_responses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def bytes_saved(self) -> int:
+        return (self.sent_raw - self.sent_wire) + (self.received_decoded - self.received_wire)
+
+    def record_request(self, raw_size: int, wire_size: int) -> None:
+        with self._lock:
+            self.sent_raw += raw_size
+            self.sent_wire += wire_size
+            if wire_size < raw_size:
+                self.compressed_requests += 1
+
+    def record_response(self, response: requests.Response) -> None:
+        decoded = len(response.content)
+        encoding = response.headers.get('Content-Encoding', 'identity').lower()
+        # raw.tell() devuelve los bytes leídos del socket, antes de descomprimir
+        wire = decoded
+        tell = getattr(response.raw, 'tell', None)
+        if encoding != 'identity' and callable(tell):
+            wire = tell() or decoded
+        with self._lock:
+            self.received_wire += wire
+            self.received_decoded += decoded
+            if encoding != 'identity':
+                self.compressed_responses += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'sent_raw': self.sent_raw,
+                'sent_wire': self.sent_wire,
+                'received_wire': self.received_wire,
+                'received_decoded': self.received_decoded,
+                'compressed_requests': self.compressed_requests,
+                'compressed_responses': self.compressed_responses,
+                'bytes_saved': self.bytes_saved,
+            }
+
+
+def compress_body(payload: bytes, threshold: Optional[int]) -> Tuple[bytes, Optional[str]]:
+    """Comprime con gzip el cuerpo si supera el umbral. Devuelve (cuerpo, Content-Encoding)."""
+    if threshold is None or len(payload) < threshold:
+        return payload, None
+    compressed = gzip.compress(payload, compresslevel=6)
+    if len(compressed) >= len(payload):
+        return payload, None
+    return compressed, 'gzip'
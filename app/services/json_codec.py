@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+try:  # orjson es opcional: si no está instalado usamos la librería estándar
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None  # type: ignore[assignment]
+
+
+class JsonCodec:
+    """Codificador JSON de la librería estándar (siempre disponible)."""
+
+    name = 'json'
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, content: bytes) -> Any:
+        # json.loads acepta bytes y detecta la codificación (UTF-8/16/32) por sí mismo
+        return json.loads(content)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codificador basado en orjson: decodifica directamente desde bytes, sin pasar por str."""
+
+    name = 'orjson'
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+def default_codec(preferred: Optional[str] = None) -> JsonCodec:
+    """Devuelve el codificador más rápido disponible, o el indicado por nombre ('json' / 'orjson')."""
+    if preferred == 'json' or orjson is None:
+        return JsonCodec()
+    return OrjsonCodec()
+
+
+def _benchmark(rows: int = 5000, rounds: int = 20) -> None:
+    """Microbenchmark con cargas parecidas a las respuestas de /students y /groups."""
+    import timeit
+
+    students = [
+        {
+            'id': i, 'userId': 10_000 + i, 'name': f"Alumno Ñúñez Pérez {i}", 'email': f"alumno{i}@universidad.mx",
+            'status': 'ACTIVE' if i % 7 else 'INACTIVE', 'dateOfBirth': '2001-05-17', 'careerId': i % 12 + 1,
+            'subjects': [{'subjectId': s, 'name': f"Materia {s}", 'semester': s % 9 + 1} for s in range(i % 6)],
+        }
+        for i in range(rows)
+    ]
+    groups = [
+        {
+            'id': i, 'name': f"G-{i:04d}", 'semester': i % 9 + 1, 'maxStudents': 40, 'careerId': i % 12 + 1,
+            'careerName': 'Ingeniería en Computación', 'subjectName': 'Cálculo Diferencial', 'teacherName': 'María José Gómez',
+            'scheduleTime': '07:00', 'students': [{'studentId': s, 'name': f"Alumno {s}", 'status': 'ACTIVE'} for s in range(30)],
+        }
+        for i in range(rows // 10)
+    ]
+
+    codecs = [JsonCodec()] + ([OrjsonCodec()] if orjson is not None else [])
+    for label, payload in (('students', students), ('groups', groups)):
+        encoded = JsonCodec().dumps(payload)
+        print(f"{label}: {len(encoded) / 1_048_576:.2f} MiB")
+        for codec in codecs:
+            decode = timeit.timeit(lambda: codec.loads(encoded), number=rounds) / rounds
+            encode = timeit.timeit(lambda: codec.dumps(payload), number=rounds) / rounds
+            print(f"  {codec.name:<7} loads {decode * 1000:8.2f} ms   dumps {encode * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    _benchmark()
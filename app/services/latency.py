@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Segmentos numéricos de una ruta (/students/14 -> /students/{id})
+NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def path_template(path: str) -> str:
+    return NUMERIC_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+class LatencyTracker:
+    """Latencias recientes de cada método y plantilla de ruta ('GET /students/{id}').
+
+    Sirve para decidir cuándo lanzar una petición de respaldo o qué plazo darle a una
+    respuesta, a partir de lo que de verdad tarda cada endpoint.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, path: str) -> str:
+        return f"{method.upper()} {path_template(path)}"
+
+    def record(self, method: str, path: str, seconds: float) -> None:
+        key = self.key(method, path)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, method: str, path: str, q: float, min_samples: int = 20) -> Optional[float]:
+        """Percentil `q` (0-1) en segundos, o None si todavía no hay `min_samples` mediciones."""
+        with self._lock:
+            samples = self._samples.get(self.key(method, path))
+            if samples is None or len(samples) < min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            copies = {key: sorted(samples) for key, samples in self._samples.items()}
+        return {
+            key: {
+                'count': len(ordered),
+                'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1),
+                'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            }
+            for key, ordered in copies.items() if ordered
+        }
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+@lru_cache(maxsize=65536)
+def fold(text: str) -> str:
+    """Texto para comparar sin distinguir mayúsculas ni acentos ('Núñez' -> 'nunez')."""
+    if text.isascii():
+        return text.casefold()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class OptionIndex:
+    """Opciones de un combobox indexadas en ambos sentidos (ID -> texto y texto -> ID).
+
+    Reemplaza recorrer un dict buscando la llave de un valor: `label_of` e `id_of` son
+    O(1). `search` filtra por subcadena sin acentos ni mayúsculas; como al escribir
+    cada consulta suele extender la anterior, se filtra sobre los resultados previos
+    en lugar de recorrer otra vez todas las opciones.
+    """
+
+    def __init__(self, options: Iterable[Tuple[Hashable, str]] = ()) -> None:
+        self.labels: List[str] = []
+        self._folded: List[str] = []
+        self._ids: List[Hashable] = []
+        self._label_by_id: Dict[Hashable, str] = {}
+        self._id_by_label: Dict[str, Hashable] = {}
+        # Última búsqueda (texto normalizado, posiciones que coinciden)
+        self._last: Optional[Tuple[str, List[int]]] = None
+        for option_id, label in options:
+            self.add(option_id, label)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, option_id: object) -> bool:
+        return option_id in self._label_by_id
+
+    def add(self, option_id: Hashable, label: str) -> None:
+        """Agrega la opción al final (si el ID ya existe, solo se le asigna un texto adicional)."""
+        self._id_by_label[label] = option_id
+        if option_id in self._label_by_id:
+            return
+        self._label_by_id[option_id] = label
+        self._ids.append(option_id)
+        self.labels.append(label)
+        self._folded.append(fold(label))
+        self._last = None
+
+    def label_of(self, option_id: Any, default: str = '') -> str:
+        return self._label_by_id.get(option_id, default)
+
+    def id_of(self, label: str) -> Optional[Any]:
+        return self._id_by_label.get(label)
+
+    def search(self, query: str, limit: Optional[int] = None) -> Tuple[List[str], int]:
+        """Textos que contienen `query` (los primeros `limit`) y cuántos coinciden en total."""
+        needle = fold(query.strip())
+        if not needle:
+            return (self.labels if limit is None else self.labels[:limit]), len(self.labels)
+        if self._last is not None and self._last[0] in needle:
+            candidates = self._last[1]
+        else:
+            candidates = range(len(self._folded))
+        folded = self._folded
+        matches = [position for position in candidates if needle in folded[position]]
+        self._last = (needle, matches)
+        shown = matches if limit is None else matches[:limit]
+        return [self.labels[position] for position in shown], len(matches)
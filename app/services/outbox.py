@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set
+
+import requests
+
+from app.services.api_client import ApiError
+from app.services.record_cache import parse_record_path
+from app.services.scheduler import RequestPreempted
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.api_client import ApiClient
+
+# Estados de una mutación
+PENDING = 'pending'
+DONE = 'done'
+CONFLICT = 'conflict'
+
+
+@dataclass
+class Mutation:
+    id: str
+    method: str
+    path: str
+    entity: str
+    data: Optional[Dict[str, Any]] = None
+    record_id: Optional[int] = None
+    owner: Any = None
+    created_at: float = 0.0
+    headers: Optional[Dict[str, str]] = None
+    status: str = PENDING
+    attempts: int = 0
+    error: str = ''
+    result: Any = None
+
+    def to_json(self) -> Dict[str, Any]:
+        record = asdict(self)
+        for transient in ('status', 'attempts', 'error', 'result'):
+            del record[transient]
+        return record
+
+
+@dataclass
+class OutboxStats:
+    submitted: int = 0
+    sent: int = 0
+    retried: int = 0
+    conflicts: int = 0
+    replayed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'submitted': self.submitted, 'sent': self.sent, 'retried': self.retried,
+                'conflicts': self.conflicts, 'replayed': self.replayed,
+            }
+
+
+class MutationJournal:
+    """Bitácora en disco (JSON Lines, solo se agrega) de las escrituras pendientes.
+
+    Cada línea es un evento: 'enqueue' con la mutación completa, o 'done'/'conflict'
+    con su id. Al abrir la aplicación se reconstruyen las que no terminaron y el
+    archivo se compacta para que solo queden esas.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def append(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            with os.fdopen(fd, 'a', encoding='utf-8') as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def load(self) -> List[Mutation]:
+        """Mutaciones encoladas que no llegaron a terminar, en el orden en que se crearon."""
+        pending: Dict[str, Mutation] = {}
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Línea truncada por un cierre inesperado
+                    if event.get('op') == 'enqueue':
+                        mutation = Mutation(**event['mutation'])
+                        pending[mutation.id] = mutation
+                    else:
+                        pending.pop(event.get('id'), None)
+        except OSError:
+            return []
+        mutations = list(pending.values())
+        self._compact(mutations)
+        return mutations
+
+    def _compact(self, mutations: List[Mutation]) -> None:
+        with self._lock:
+            if not os.path.exists(self.path):
+                return
+            temp_path = f"{self.path}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                for mutation in mutations:
+                    handle.write(json.dumps({'op': 'enqueue', 'mutation': mutation.to_json()}, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.path)
+
+
+class Outbox:
+    """Cola de escrituras (POST/PUT/DELETE) que se envían en segundo plano.
+
+    Las mutaciones de una misma entidad se envían en orden, una tras otra; entidades
+    distintas avanzan en paralelo. Cada una lleva un Idempotency-Key fijo, así que
+    reintentarla tras un corte (o tras reiniciar la aplicación) no la duplica. Los errores
+    de red y los 5xx/429 se reintentan con espera creciente; cualquier otro rechazo del
+    servidor se marca como conflicto para mostrárselo al usuario y la cola sigue.
+
+    Una escritura condicional (If-Match) hecha sobre la versión que reemplazó otra
+    escritura propia ya confirmada se envía con la versión nueva: guardar dos veces
+    seguidas el mismo registro no es un conflicto consigo mismo.
+    """
+
+    RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        api: 'ApiClient',
+        journal: Optional[MutationJournal] = None,
+        max_workers: int = 4,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.api = api
+        self.journal = journal
+        self.max_backoff = max_backoff
+        self.stats = OutboxStats()
+        self.owner: Any = None
+        self._lanes: Dict[str, Deque[Mutation]] = {}
+        self._active: Set[str] = set()
+        self._conflicts: List[Mutation] = []
+        # Por ruta: ETag anterior -> ETag que dejó una escritura propia confirmada
+        self._superseded: Dict[str, Dict[str, str]] = {}
+        self._running = False
+        self._stopped = threading.Event()  # Interrumpe la espera entre reintentos al pausar
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='outbox')
+        self._stored = journal.load() if journal is not None else []
+
+    def start(self, owner: Any) -> None:
+        """Empieza a enviar (tras iniciar sesión), incluidas las pendientes de `owner` de la bitácora."""
+        with self._lock:
+            if owner != self.owner:
+                self._superseded.clear()
+            self.owner = owner
+            self._running = True
+            self._stopped.clear()
+            for mutation in [item for item in self._stored if item.owner == owner]:
+                self._stored.remove(mutation)
+                if mutation.status == PENDING:
+                    self._enqueue(mutation)
+                    with self.stats._lock:
+                        self.stats.replayed += 1
+            for entity in list(self._lanes):
+                self._dispatch(entity)
+
+    def pause(self) -> None:
+        """Deja de enviar (cierre de sesión); lo pendiente sigue en la bitácora para la próxima vez."""
+        with self._lock:
+            self._running = False
+            self._stopped.set()
+            self.owner = None
+            for lane in self._lanes.values():
+                self._stored.extend(lane)
+                lane.clear()
+
+    def submit(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Mutation:
+        parsed = parse_record_path(path)
+        mutation = Mutation(
+            id=str(uuid.uuid4()),
+            method=method.upper(),
+            path=path,
+            entity=parsed[0] if parsed else path.strip('/').split('/')[0],
+            data=data,
+            record_id=parsed[1] if parsed else None,
+            owner=self.owner,
+            created_at=time.time(),
+            headers=headers,
+        )
+        if self.journal is not None:
+            self.journal.append({'op': 'enqueue', 'mutation': mutation.to_json()})
+        with self._lock:
+            self._enqueue(mutation)
+            with self.stats._lock:
+                self.stats.submitted += 1
+            self._dispatch(mutation.entity)
+        return mutation
+
+    def _enqueue(self, mutation: Mutation) -> None:
+        self._lanes.setdefault(mutation.entity, deque()).append(mutation)
+
+    def _dispatch(self, entity: str) -> None:
+        if self._running and entity not in self._active and self._lanes.get(entity):
+            self._active.add(entity)
+            self._pool.submit(self._drain, entity)
+
+    def _drain(self, entity: str) -> None:
+        try:
+            while True:
+                with self._lock:
+                    lane = self._lanes.get(entity)
+                    if not self._running or not lane:
+                        return
+                    mutation = lane[0]
+                self._send(mutation)
+                with self._lock:
+                    if lane and lane[0] is mutation:
+                        lane.popleft()
+        finally:
+            # Pase lo que pase la entidad vuelve a poder despacharse
+            with self._lock:
+                self._active.discard(entity)
+                self._idle.notify_all()
+
+    def _send(self, mutation: Mutation) -> None:
+        delay = 0.5
+        while True:
+            mutation.attempts += 1
+            headers = {**(mutation.headers or {}), 'Idempotency-Key': mutation.id}
+            if 'If-Match' in headers:
+                headers['If-Match'] = self._current_version(mutation.path, headers['If-Match'])
+            try:
+                mutation.result = self.api.request(mutation.method, mutation.path, data=mutation.data, headers=headers)
+            except ApiError as error:
+                if error.status_code not in self.RETRYABLE_STATUS:
+                    self._finish(mutation, CONFLICT, error.message)
+                    return
+            except (requests.RequestException, RequestPreempted):
+                pass  # Red caída o petición descartada antes de salir: se reintenta
+            except Exception as error:
+                # Cualquier otra falla (respuesta ilegible, error propio) se muestra como conflicto
+                self._finish(mutation, CONFLICT, str(error) or type(error).__name__)
+                return
+            else:
+                self._supersede(mutation, headers.get('If-Match'))
+                self._finish(mutation, DONE)
+                return
+            with self.stats._lock:
+                self.stats.retried += 1
+            if self._stopped.wait(delay):
+                return  # Se reintentará al volver a iniciar sesión
+            delay = min(self.max_backoff, delay * 2)
+
+    def _current_version(self, path: str, etag: str) -> str:
+        """La versión que dejaron las escrituras propias confirmadas a partir de `etag`."""
+        with self._lock:
+            chain = self._superseded.get(path, {})
+            seen = {etag}
+            while etag in chain and chain[etag] not in seen:
+                etag = chain[etag]
+                seen.add(etag)
+        return etag
+
+    def _supersede(self, mutation: Mutation, previous: Optional[str]) -> None:
+        with self._lock:
+            if mutation.method == 'DELETE':
+                self._superseded.pop(mutation.path, None)
+                return
+            current = self.api.version_of(mutation.path)
+            if previous and current and current != previous:
+                self._superseded.setdefault(mutation.path, {})[previous] = current
+
+    def _finish(self, mutation: Mutation, status: str, error: str = '') -> None:
+        if self.journal is not None:
+            self.journal.append({'op': status, 'id': mutation.id})
+        with self._lock:
+            mutation.status = status
+            mutation.error = error
+            if status == CONFLICT:
+                self._conflicts.append(mutation)
+        with self.stats._lock:
+            if status == CONFLICT:
+                self.stats.conflicts += 1
+            else:
+                self.stats.sent += 1
+
+    def pending(self, entity: Optional[str] = None) -> List[Mutation]:
+        with self._lock:
+            return [
+                mutation for lane_entity, lane in self._lanes.items() if entity in (None, lane_entity)
+                for mutation in lane if mutation.status == PENDING
+            ]
+
+    def take_conflicts(self, entity: Optional[str] = None) -> List[Mutation]:
+        """Conflictos aún no mostrados (de `entity` o de todas), para avisar al usuario una sola vez."""
+        with self._lock:
+            taken = [mutation for mutation in self._conflicts if entity in (None, mutation.entity)]
+            self._conflicts = [mutation for mutation in self._conflicts if mutation not in taken]
+            return taken
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que no quede nada en vuelo; devuelve False si se agotó el tiempo."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self) -> None:
+        self.pause()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from app.services.scheduler import BACKGROUND, Ticket, current_ticket, request_priority
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.api_client import ApiClient
+
+# Una petición a precargar: una ruta, (ruta, parámetros) o (ruta, parámetros, campos)
+PrefetchRequest = Union[
+    str,
+    Tuple[str, Optional[Mapping[str, Any]]],
+    Tuple[str, Optional[Mapping[str, Any]], Optional[Sequence[str]]],
+]
+RequestKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+MISS = object()
+
+
+def request_key(path: str, params: Optional[Mapping[str, Any]] = None) -> RequestKey:
+    return path, tuple(sorted((str(key), str(value)) for key, value in (params or {}).items()))
+
+
+@dataclass
+class _Entry:
+    future: Future
+    queued_at: float
+    owner: str
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Las precargas esperan turno como trabajo de fondo hasta que alguien reclama el resultado
+    ticket: Ticket = field(default_factory=lambda: Ticket(BACKGROUND))
+
+
+@dataclass
+class PrefetchStats:
+    scheduled: int = 0
+    hits: int = 0
+    misses: int = 0
+    wasted: int = 0
+    cancelled: int = 0
+    saved_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'scheduled': self.scheduled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'wasted': self.wasted,
+                'cancelled': self.cancelled,
+                'hit_rate': round(self.hit_rate, 3),
+                'saved_ms': round(self.saved_seconds * 1000, 1),
+                'avg_saved_ms_per_hit': round(self.saved_seconds * 1000 / self.hits, 1) if self.hits else 0.0,
+            }
+
+
+class PrefetchEngine:
+    """Precarga en segundo plano las lecturas (GET) que va a necesitar un módulo.
+
+    Las respuestas se guardan poco tiempo (ttl) y se entregan una sola vez: la primera
+    llamada a ApiClient.get con la misma ruta y parámetros se queda con el resultado
+    (o espera a que termine si aún está en vuelo) en lugar de hacer otra petición.
+    """
+
+    def __init__(self, api: 'ApiClient', max_workers: int = 2, ttl: float = 30.0) -> None:
+        self.api = api
+        self.ttl = ttl
+        self.stats = PrefetchStats()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._entries: Dict[RequestKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def warm(self, requests: Iterable[PrefetchRequest], owner: str = '') -> None:
+        """Programa las peticiones que no estén ya en vuelo o recién descargadas."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            for request in requests:
+                path, params, fields = (tuple(request) + (None, None))[:3] if not isinstance(request, str) else (request, None, None)
+                params = dict(params) if params else None
+                # La llave incluye la proyección, igual que la que usará ApiClient.get
+                key = request_key(path, self.api.query_params(params, fields))
+                if key in self._entries:
+                    continue
+                entry = _Entry(future=Future(), queued_at=now, owner=owner)
+                entry.future = self._pool.submit(self._fetch, entry, path, params, fields)
+                self._entries[key] = entry
+                self.stats.scheduled += 1
+
+    def _fetch(self, entry: _Entry, path: str, params: Optional[Dict[str, Any]], fields: Optional[Sequence[str]]) -> Any:
+        entry.started_at = time.monotonic()
+        try:
+            with request_priority(entry.ticket):
+                return self.api.request('GET', path, params=params, fields=fields)
+        finally:
+            entry.finished_at = time.monotonic()
+
+    def cancel(self, owner: str) -> None:
+        """Cancela lo que `owner` dejó en cola y todavía no empezó (p. ej. el puntero salió del botón)."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.owner == owner and (entry.future.cancel() or self._drop_queued(entry)):
+                    del self._entries[key]
+                    self.stats.cancelled += 1
+
+    def _drop_queued(self, entry: _Entry) -> bool:
+        # Ya empezó pero sigue esperando turno en el planificador: se descarta sin enviarse
+        return self.api.scheduler is not None and self.api.scheduler.cancel(entry.ticket)
+
+    def claim(self, path: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+        """Devuelve la respuesta precargada o MISS. Si falló, también MISS para que se reintente en primer plano."""
+        key = request_key(path, params)
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            with self.stats._lock:
+                self.stats.misses += 1
+            return MISS
+
+        wait_start = time.monotonic()
+        if self.api.scheduler is not None:
+            # Quien reclama ya está esperando: la precarga deja de ser trabajo de fondo
+            self.api.scheduler.promote(entry.ticket, current_ticket().priority)
+        try:
+            result = entry.future.result()
+        except (CancelledError, Exception):  # noqa: BLE001 - el error se repetirá en primer plano
+            with self.stats._lock:
+                self.stats.misses += 1
+            return MISS
+        waited = time.monotonic() - wait_start
+        duration = (entry.finished_at or wait_start) - (entry.started_at or entry.queued_at)
+        with self.stats._lock:
+            self.stats.hits += 1
+            self.stats.saved_seconds += max(0.0, duration - waited)
+        return result
+
+    def invalidate(self, prefix: str = '') -> None:
+        """Descarta las precargas cuya ruta empieza con `prefix` (todas si está vacío)."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0].startswith(prefix)]:
+                entry = self._entries.pop(key)
+                entry.future.cancel()
+
+    def _expire(self, now: float) -> None:
+        expired: List[RequestKey] = [
+            key for key, entry in self._entries.items()
+            if entry.finished_at is not None and now - entry.finished_at > self.ttl
+        ]
+        for key in expired:
+            del self._entries[key]
+        with self.stats._lock:
+            self.stats.wasted += len(expired)
+
+    def shutdown(self) -> None:
+        self.invalidate()
+        self._pool.shutdown(wait=False, cancel_futures=True)
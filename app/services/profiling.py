@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import itertools
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Lo que no cabe en un nombre de archivo
+UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class ActionProfiler:
+    """Perfil de CPU (cProfile) y de memoria (tracemalloc) de cada acción del usuario.
+
+    Las clases se instrumentan una sola vez al arrancar (`instrument`); mientras
+    `enabled` sea False los envoltorios solo comprueban esa bandera. Cada acción
+    perfilada deja en `directory` un `.prof` (para snakeviz o pstats) y un `.txt` con
+    la duración, las funciones más costosas y las líneas que más memoria reservaron.
+    Se perfila una acción a la vez en todo el proceso: una acción dentro de otra (p. ej.
+    ApiClient.request dentro de un _save) queda incluida en el perfil de la de afuera, y
+    las de otros hilos que coinciden con ella corren sin perfil.
+    """
+
+    def __init__(self, directory: str, enabled: bool = False, top: int = 15) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.enabled = enabled
+        self.top = top
+        self._seq = itertools.count(1)
+        # Hilo con la acción que se está perfilando. cProfile (desde 3.12) admite un solo
+        # perfilador activo por proceso: mientras haya una, las demás (anidadas o de otros
+        # hilos, como las peticiones del prefetch o del outbox) corren sin perfil
+        self._owner: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def action(self, name: str) -> Iterator[None]:
+        if not self.enabled or not self._claim():
+            yield
+            return
+        profiler = cProfile.Profile()
+        started_tracing = False
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            started = time.perf_counter()
+            profiler.enable()
+            profiling = True
+        except ValueError:
+            # Otra herramienta (un depurador, coverage) ya ocupa el perfilador del proceso
+            profiling = False
+            if started_tracing:
+                tracemalloc.stop()
+            self._release()
+        if not profiling:
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            try:
+                elapsed = time.perf_counter() - started
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+                self._release()
+            self._write(name, elapsed, peak, profiler, before, after)
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if self._owner is not None:
+                return False
+            self._owner = threading.get_ident()
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._owner = None
+
+    def _write(
+        self,
+        name: str,
+        elapsed: float,
+        peak: int,
+        profiler: cProfile.Profile,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(
+            self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._seq):04d}-{UNSAFE_CHARS.sub('_', name)}"
+        )
+        profiler.dump_stats(f"{base}.prof")
+
+        cpu = io.StringIO()
+        pstats.Stats(profiler, stream=cpu).sort_stats('cumulative').print_stats(self.top)
+        # Se ignora lo que reserva el propio tracemalloc al tomar las instantáneas
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        allocations = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')[:self.top]
+        with open(f"{base}.txt", 'w', encoding='utf-8') as handle:
+            handle.write(f"Acción: {name}\nDuración: {elapsed * 1000:.1f} ms\nPico de memoria: {peak / 1024:.1f} KiB\n")
+            handle.write("\nLíneas que más memoria reservaron (neto):\n")
+            for stat in allocations:
+                handle.write(f"  {stat}\n")
+            handle.write(f"\nFunciones por tiempo acumulado:\n{cpu.getvalue()}")
+
+    def wrap(self, function: Callable[..., Any], name: str, describe: Optional[Callable[..., str]] = None) -> Callable[..., Any]:
+        """Envuelve `function`; `describe` recibe los mismos argumentos y completa el nombre de la acción."""
+
+        @functools.wraps(function)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return function(*args, **kwargs)
+            label = f"{name} {describe(*args, **kwargs)}" if describe is not None else name
+            with self.action(label):
+                return function(*args, **kwargs)
+
+        profiled.__wrapped_profiler__ = self  # type: ignore[attr-defined]
+        return profiled
+
+    def instrument(
+        self,
+        cls: type,
+        include: Callable[[str], bool],
+        describe: Optional[Callable[..., str]] = None,
+    ) -> None:
+        """Envuelve los métodos de `cls` cuyo nombre cumpla `include` (una sola vez)."""
+        for attribute, value in list(vars(cls).items()):
+            if callable(value) and include(attribute) and not hasattr(value, '__wrapped_profiler__'):
+                setattr(cls, attribute, self.wrap(value, f"{cls.__name__}.{attribute}", describe))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from app.services.scheduler import BACKGROUND, Ticket, current_ticket, request_priority
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.api_client import ApiClient
+
+# Rutas de detalle: /{entidad}/{id}
+RECORD_PATH = re.compile(r'^/(?P<entity>[a-z]+)/(?P<id>\d+)$')
+
+
+def parse_record_path(path: str) -> Optional[Tuple[str, int]]:
+    match = RECORD_PATH.match(path)
+    if not match:
+        return None
+    return match.group('entity'), int(match.group('id'))
+
+
+@dataclass
+class RecordCacheStats:
+    hits: int = 0
+    misses: int = 0
+    joined: int = 0
+    prefetched: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'joined': self.joined,
+                'prefetched': self.prefetched, 'evictions': self.evictions, 'invalidations': self.invalidations,
+            }
+
+
+class RecordCache:
+    """Caché LRU con caducidad de los registros de detalle (GET /{entidad}/{id}), uno por entidad.
+
+    Además de servir lo ya leído, puede precargar en segundo plano los registros vecinos
+    de la fila seleccionada para que recorrer una tabla con el teclado no espere a la red.
+    """
+
+    def __init__(self, api: 'ApiClient', max_entries: int = 256, ttl: float = 60.0, max_workers: int = 2) -> None:
+        self.api = api
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = RecordCacheStats()
+        self._stores: Dict[str, 'OrderedDict[int, Tuple[float, Any]]'] = {}
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+        # Prioridad de cada precarga en vuelo, para subirla si la interfaz se une a ella
+        self._tickets: Dict[Tuple[str, int], Ticket] = {}
+        # Cambia con cada invalidación; una precarga iniciada antes no debe guardar datos viejos
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='records')
+
+    def get(self, entity: str, record_id: int) -> Any:
+        key = (entity, record_id)
+        with self._lock:
+            cached = self._lookup(entity, record_id)
+            future = self._inflight.get(key) if cached is None else None
+            ticket = self._tickets.get(key)
+        if cached is not None:
+            self._count('hits')
+            return cached
+        if future is not None:
+            self._count('joined')
+            if ticket is not None and self.api.scheduler is not None:
+                self.api.scheduler.promote(ticket, current_ticket().priority)
+            try:
+                return future.result()
+            except Exception:  # noqa: BLE001 - se reintenta en primer plano para mostrar el error
+                pass
+        self._count('misses')
+        generation = self._generation
+        record = self.api.request('GET', f'/{entity}/{record_id}')
+        self.put(entity, record_id, record, generation)
+        return record
+
+    def prefetch(self, entity: str, record_ids: Iterable[Any]) -> None:
+        """Descarga en segundo plano los registros que no estén en caché ni en vuelo."""
+        with self._lock:
+            for raw_id in record_ids:
+                record_id = int(raw_id)
+                key = (entity, record_id)
+                if key in self._inflight or self._lookup(entity, record_id, touch=False) is not None:
+                    continue
+                self._tickets[key] = Ticket(BACKGROUND)
+                self._inflight[key] = self._pool.submit(self._fetch, entity, record_id, self._generation)
+
+    def _fetch(self, entity: str, record_id: int, generation: int) -> Any:
+        try:
+            with request_priority(self._tickets.get((entity, record_id)) or BACKGROUND):
+                record = self.api.request('GET', f'/{entity}/{record_id}')
+            self.put(entity, record_id, record, generation)
+            self._count('prefetched')
+            return record
+        finally:
+            with self._lock:
+                self._inflight.pop((entity, record_id), None)
+                self._tickets.pop((entity, record_id), None)
+
+    def put(self, entity: str, record_id: int, record: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            store = self._stores.setdefault(entity, OrderedDict())
+            store[record_id] = (time.monotonic(), record)
+            store.move_to_end(record_id)
+            while len(store) > self.max_entries:
+                store.popitem(last=False)
+                self._count('evictions')
+
+    def invalidate(self, entity: Optional[str] = None, record_id: Optional[int] = None) -> None:
+        """Invalida un registro, una entidad completa o toda la caché."""
+        with self._lock:
+            if entity is None:
+                self._stores.clear()
+            elif record_id is None:
+                self._stores.pop(entity, None)
+            else:
+                self._stores.get(entity, OrderedDict()).pop(record_id, None)
+            self._generation += 1
+            self._count('invalidations')
+
+    def invalidate_for_write(self, path: str) -> None:
+        """Tras un POST/PUT/DELETE: se descarta ese registro y los detalles de otras entidades,
+        que pueden incluirlo (p. ej. un grupo lista a sus alumnos)."""
+        parsed = parse_record_path(path)
+        entity = parsed[0] if parsed else path.strip('/').split('/')[0]
+        with self._lock:
+            for other in [name for name in self._stores if name != entity]:
+                del self._stores[other]
+            if parsed:
+                self._stores.get(entity, OrderedDict()).pop(parsed[1], None)
+            self._generation += 1
+            self._count('invalidations')
+
+    def _lookup(self, entity: str, record_id: int, touch: bool = True) -> Any:
+        store = self._stores.get(entity)
+        if not store or record_id not in store:
+            return None
+        stored_at, record = store[record_id]
+        if time.monotonic() - stored_at > self.ttl:
+            del store[record_id]
+            return None
+        if touch:
+            store.move_to_end(record_id)
+        return record
+
+    def _count(self, name: str) -> None:
+        with self.stats._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def shutdown(self) -> None:
+        self.invalidate()
+        self._pool.shutdown(wait=False, cancel_futures=True)
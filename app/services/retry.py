@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import requests
+
+from app.services.api_client import ApiError
+from app.services.latency import LatencyTracker
+from app.services.scheduler import current_ticket, request_priority
+
+# Métodos que se pueden repetir sin riesgo de aplicar dos veces un cambio
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Cuántas veces y con qué espera se repite una petición fallida de un método."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+    retry_status: Tuple[int, ...] = (502, 503, 504)
+    # Tope para lo que pida el servidor en Retry-After
+    max_retry_after: float = 10.0
+
+    def retryable(self, error: BaseException, conditional: bool = False) -> bool:
+        if isinstance(error, ApiError):
+            return error.status_code in self.retry_status
+        if conditional and isinstance(error, requests.Timeout) and not isinstance(error, requests.ConnectTimeout):
+            # Con If-Match, si la escritura se aplicó y solo se perdió la respuesta, repetirla daría 412
+            return False
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes del intento `attempt + 1`: backoff exponencial con jitter completo."""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    retries: int = 0
+    recovered: int = 0
+    gave_up: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests, 'retries': self.retries, 'recovered': self.recovered,
+                'gave_up': self.gave_up, 'hedged': self.hedged, 'hedge_wins': self.hedge_wins,
+                'reasons': dict(self.reasons),
+            }
+
+
+class RequestRetrier:
+    """Reintentos por método y peticiones de respaldo (hedging) para las lecturas.
+
+    Solo se reintentan los métodos con política (por defecto los idempotentes), ante
+    errores de red y 502/503/504, esperando un tiempo exponencial al azar entre intentos
+    (o lo que pida Retry-After). Las escrituras condicionales (If-Match) no se repiten si
+    se agotó el plazo de lectura, y las del outbox (con Idempotency-Key) no se repiten
+    aquí: el outbox ya las reintenta con su propia espera. Con `hedge` activo, si un GET tarda más que el percentil
+    `hedge_percentile` de su endpoint se lanza un duplicado y gana la primera respuesta;
+    `hedge_budget` limita los duplicados a esa fracción de los GET.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyTracker,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        *,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        hedge_budget: float = 0.1,
+        max_workers: int = 8,
+    ) -> None:
+        self.latency = latency
+        self.policies = policies if policies is not None else self.default_policies()
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_budget = hedge_budget
+        self.stats = RetryStats()
+        self._gets = 0
+        self._pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge') if hedge else None
+        )
+
+    @staticmethod
+    def default_policies(methods: Iterable[str] = IDEMPOTENT_METHODS, policy: Optional[RetryPolicy] = None) -> Dict[str, RetryPolicy]:
+        policy = policy or RetryPolicy()
+        return {method.strip().upper(): policy for method in methods if method.strip()}
+
+    def execute(
+        self,
+        method: str,
+        path: str,
+        send: Callable[[], requests.Response],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        method = method.upper()
+        headers = headers or {}
+        policy = None if 'Idempotency-Key' in headers else self.policies.get(method)
+        conditional = 'If-Match' in headers
+        with self.stats._lock:
+            self.stats.requests += 1
+        attempt = 1
+        while True:
+            try:
+                response = self._hedged(path, send) if method == 'GET' else send()
+            except (ApiError, requests.ConnectionError, requests.Timeout) as error:
+                if policy is None or attempt >= policy.max_attempts or not policy.retryable(error, conditional):
+                    if attempt > 1:
+                        self._count('gave_up')
+                    raise
+                reason = str(error.status_code) if isinstance(error, ApiError) else type(error).__name__
+                with self.stats._lock:
+                    self.stats.retries += 1
+                    self.stats.reasons[reason] = self.stats.reasons.get(reason, 0) + 1
+                time.sleep(policy.delay(attempt, getattr(error, 'retry_after', None)))
+                attempt += 1
+                continue
+            if attempt > 1:
+                self._count('recovered')
+            return response
+
+    def _hedged(self, path: str, send: Callable[[], requests.Response]) -> requests.Response:
+        delay = self._hedge_delay(path)
+        if delay is None or self._pool is None:
+            return send()
+        ticket = current_ticket()  # Los hilos del respaldo esperan turno con la prioridad de quien llama
+
+        def run() -> requests.Response:
+            with request_priority(ticket):
+                return send()
+
+        primary = self._pool.submit(run)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        self._count('hedged')
+        backup = self._pool.submit(run)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count('hedge_wins')
+                    return future.result()
+        return primary.result()  # Fallaron las dos: se propaga el error de la original
+
+    def _hedge_delay(self, path: str) -> Optional[float]:
+        if not self.hedge:
+            return None
+        with self.stats._lock:
+            self._gets += 1
+            if self.stats.hedged >= self._gets * self.hedge_budget:
+                return None
+        observed = self.latency.percentile('GET', path, self.hedge_percentile)
+        return None if observed is None else max(self.hedge_min_delay, observed)
+
+    def _count(self, name: str) -> None:
+        with self.stats._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
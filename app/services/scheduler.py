@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+# Clases de prioridad (menor = más urgente)
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', NORMAL: 'normal', BACKGROUND: 'background'}
+
+
+class RequestPreempted(Exception):
+    """La petición se descartó mientras esperaba turno, antes de enviarse."""
+
+
+class Ticket:
+    """Prioridad con la que esperan turno las peticiones de un hilo; se puede subir mientras esperan."""
+
+    __slots__ = ('priority', 'cancelled')
+
+    def __init__(self, priority: int) -> None:
+        self.priority = priority
+        self.cancelled = False
+
+
+_local = threading.local()
+
+
+@contextmanager
+def request_priority(priority: Union[int, Ticket]) -> Iterator[Ticket]:
+    """Las peticiones que haga este hilo dentro del bloque usan `priority` (una clase o un Ticket)."""
+    ticket = priority if isinstance(priority, Ticket) else Ticket(priority)
+    previous = getattr(_local, 'ticket', None)
+    _local.ticket = ticket
+    try:
+        yield ticket
+    finally:
+        _local.ticket = previous
+
+
+def current_ticket() -> Ticket:
+    ticket = getattr(_local, 'ticket', None)
+    if ticket is not None:
+        return ticket
+    # Sin indicación explícita: lo que corre en el hilo de la interfaz es lo que el usuario está esperando
+    return Ticket(INTERACTIVE if threading.current_thread() is threading.main_thread() else NORMAL)
+
+
+@dataclass
+class _ClassStats:
+    requests: int = 0
+    waited: float = 0.0
+    max_wait: float = 0.0
+    preempted: int = 0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+
+@dataclass
+class SchedulerStats:
+    classes: Dict[int, _ClassStats] = field(default_factory=lambda: {level: _ClassStats() for level in PRIORITY_NAMES})
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_wait(self, priority: int, waited: float) -> None:
+        with self._lock:
+            stats = self.classes[priority]
+            stats.requests += 1
+            stats.waited += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            stats.recent.append(waited)
+
+    def record_preempted(self, priority: int) -> None:
+        with self._lock:
+            self.classes[priority].preempted += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Espera en cola por clase (ms): media, p95 de las últimas peticiones y máxima."""
+        with self._lock:
+            report = {}
+            for level, stats in self.classes.items():
+                recent = sorted(stats.recent)
+                p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+                report[PRIORITY_NAMES[level]] = {
+                    'requests': stats.requests,
+                    'avg_wait_ms': round(stats.waited * 1000 / stats.requests, 1) if stats.requests else 0.0,
+                    'p95_wait_ms': round(p95 * 1000, 1),
+                    'max_wait_ms': round(stats.max_wait * 1000, 1),
+                    'preempted': stats.preempted,
+                }
+            return report
+
+
+@dataclass
+class _Waiter:
+    ticket: Ticket
+    seq: int
+
+
+class RequestScheduler:
+    """Reparte las conexiones a cada servidor entre las peticiones según su prioridad.
+
+    Cada host admite como máximo `max_per_host` peticiones a la vez. Las que no caben
+    esperan turno y se atienden por clase (interactiva, normal, de fondo) y, dentro de
+    una clase, por orden de llegada. Para que un clic no espere detrás de una
+    exportación, `reserved_interactive` conexiones quedan siempre libres para las
+    interactivas y el trabajo de fondo nunca ocupa más de `background_limit`. Lo de
+    fondo que aún espera se puede subir de prioridad (alguien ya espera su resultado)
+    o descartar (`cancel`/`preempt`).
+    """
+
+    def __init__(self, max_per_host: int = 6, background_limit: int = 2, reserved_interactive: int = 1) -> None:
+        self.max_per_host = max(1, max_per_host)
+        self.reserved_interactive = max(0, min(reserved_interactive, self.max_per_host - 1))
+        self.background_limit = max(1, background_limit)
+        self.stats = SchedulerStats()
+        self._active: Dict[str, List[int]] = {}
+        self._queues: Dict[str, List[_Waiter]] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, url: str, ticket: Optional[Ticket] = None) -> Iterator[None]:
+        """Espera turno para hacer una petición a `url` y libera la conexión al terminar."""
+        host = urlsplit(url).netloc
+        priority = self._acquire(host, ticket or current_ticket())
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active[host][priority] -= 1
+                self._cond.notify_all()
+
+    def _acquire(self, host: str, ticket: Ticket) -> int:
+        waiter = _Waiter(ticket, next(self._seq))
+        started = time.monotonic()
+        with self._cond:
+            queue = self._queues.setdefault(host, [])
+            queue.append(waiter)
+            try:
+                while self._next(host) is not waiter:
+                    if ticket.cancelled:
+                        self.stats.record_preempted(ticket.priority)
+                        raise RequestPreempted(f"Petición de prioridad {PRIORITY_NAMES[ticket.priority]} descartada")
+                    self._cond.wait()
+            finally:
+                queue.remove(waiter)
+                self._cond.notify_all()  # El siguiente en la cola puede tener lugar también
+            priority = ticket.priority
+            self._active.setdefault(host, [0] * len(PRIORITY_NAMES))[priority] += 1
+        self.stats.record_wait(priority, time.monotonic() - started)
+        return priority
+
+    def _next(self, host: str) -> Optional[_Waiter]:
+        # El más urgente de los que caben ahora; si uno interactivo no cabe, tampoco cabe nada más
+        for waiter in sorted(self._queues.get(host, ()), key=lambda item: (item.ticket.priority, item.seq)):
+            if not waiter.ticket.cancelled and self._admissible(host, waiter.ticket.priority):
+                return waiter
+        return None
+
+    def _admissible(self, host: str, priority: int) -> bool:
+        active = self._active.get(host) or [0] * len(PRIORITY_NAMES)
+        in_flight = sum(active)
+        if priority == INTERACTIVE:
+            return in_flight < self.max_per_host
+        if in_flight >= self.max_per_host - self.reserved_interactive:
+            return False
+        return priority != BACKGROUND or active[BACKGROUND] < self.background_limit
+
+    def promote(self, ticket: Ticket, priority: int) -> None:
+        """Sube la prioridad de `ticket` (p. ej. una precarga cuyo resultado ya espera la interfaz)."""
+        with self._cond:
+            if priority < ticket.priority:
+                ticket.priority = priority
+                self._cond.notify_all()
+
+    def cancel(self, ticket: Ticket) -> bool:
+        """Descarta las peticiones de `ticket` que aún esperan turno; False si no había ninguna."""
+        with self._cond:
+            if not any(waiter.ticket is ticket for queue in self._queues.values() for waiter in queue):
+                return False
+            ticket.cancelled = True
+            self._cond.notify_all()
+            return True
+
+    def preempt(self, priority: int = BACKGROUND) -> int:
+        """Descarta todo lo que espera turno con prioridad `priority` o menor; devuelve cuántas."""
+        with self._cond:
+            dropped = [
+                waiter for queue in self._queues.values() for waiter in queue
+                if waiter.ticket.priority >= priority and not waiter.ticket.cancelled
+            ]
+            for waiter in dropped:
+                waiter.ticket.cancelled = True
+            self._cond.notify_all()
+            return len(dropped)
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        """Peticiones en vuelo y en espera por host."""
+        with self._cond:
+            hosts = set(self._active) | set(self._queues)
+            return {
+                host: {'in_flight': sum(self._active.get(host, ())), 'queued': len(self._queues.get(host, ()))}
+                for host in hosts
+            }
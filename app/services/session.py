@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.bootstrap import BootstrapBundle
 
 
 @dataclass
 class UserSession:
     token: Optional[str] = None
     user: Dict[str, str] = field(default_factory=dict)
+    # Lecturas iniciales del rol, lanzadas al iniciar sesión (ver app.services.bootstrap)
+    bootstrap: Optional['BootstrapBundle'] = None
 
     @property
     def is_authenticated(self) -> bool:
@@ -20,3 +25,6 @@ class UserSession:
     def clear(self) -> None:
         self.token = None
         self.user = {}
+        if self.bootstrap is not None:
+            self.bootstrap.cancel()
+            self.bootstrap = None
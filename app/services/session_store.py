@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.api_client import ApiClient, ApiError
+
+
+def token_expiry(token: Optional[str]) -> Optional[float]:
+    """Momento (epoch) en que caduca un JWT según su claim `exp`, o None si no se puede saber.
+
+    Solo se lee la carga útil para programar la renovación; la firma la valida el servidor.
+    """
+    if not token or token.count('.') != 2:
+        return None
+    payload = token.split('.')[1]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class SessionStore:
+    """Guarda el token y el usuario en un archivo local legible solo por el usuario del sistema."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+
+    def load(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(token, usuario) guardados, o None si no hay sesión o el token ya caducó."""
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                data = json.load(handle)
+            token, user = data['token'], data['user']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        expires_at = token_expiry(token)
+        if not token or not user or (expires_at is not None and expires_at <= time.time()):
+            self.clear()
+            return None
+        return token, user
+
+    def save(self, token: Optional[str], user: Dict[str, Any]) -> None:
+        if not token:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        # Se crea con permisos 0600 desde el principio para que el token nunca quede legible por otros
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump({'token': token, 'user': user, 'savedAt': time.time()}, handle)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def check_session(api: ApiClient, user: Dict[str, Any]) -> bool:
+    """Comprueba con una lectura ligera que el token guardado sigue siendo válido.
+
+    Devuelve False solo si el servidor lo rechaza (401/403); un error de red no invalida
+    la sesión, para poder seguir trabajando con lo que ya se tiene.
+    """
+    role = user.get('role')
+    if role == 'STUDENT':
+        path = '/students/me'
+    elif role == 'TEACHER':
+        path = '/teachers/me'
+    else:
+        path = f"/users/{user.get('id')}"
+    try:
+        api.request('GET', path, fields=('id',))
+    except ApiError as error:
+        return error.status_code not in (401, 403)
+    except Exception:  # noqa: BLE001 - sin conexión: se mantiene la sesión
+        return True
+    return True
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.services.latency import LatencyTracker, path_template
+
+# (conexión, lectura) en segundos, como lo recibe requests
+Timeout = Tuple[float, float]
+# Plazos fijados para un endpoint: (conexión o None para la general, lectura)
+Override = Tuple[Optional[float], float]
+
+
+def parse_overrides(text: str) -> Dict[str, Override]:
+    """Lee 'GET /students=30; POST /auth/login=2/8; /schedules=3' (lectura o conexión/lectura).
+
+    La llave puede llevar método o no; los IDs se escriben como {id} (/students/{id}).
+    """
+    overrides: Dict[str, Override] = {}
+    for entry in text.split(';'):
+        key, separator, value = entry.strip().rpartition('=')
+        if not separator or not key.strip():
+            continue
+        connect, _, read = value.strip().rpartition('/')
+        try:
+            overrides[_override_key(key)] = (float(connect) if connect else None, float(read))
+        except ValueError:
+            raise ValueError(f"Plazo no válido para '{key.strip()}': {value.strip()}") from None
+    return overrides
+
+
+def _override_key(key: str) -> str:
+    method, _, path = key.strip().rpartition(' ')
+    return f"{method.upper()} {path_template(path)}" if method else path_template(path)
+
+
+class TimeoutPolicy:
+    """Plazos de conexión y de lectura para cada petición.
+
+    La conexión falla rápido si el servidor no responde (`connect`); la lectura es el
+    tiempo máximo sin recibir datos (`read`), no el total, así que una respuesta grande
+    que sigue llegando no se corta. Un endpoint puede tener plazos propios
+    (`overrides`, por método y plantilla de ruta) y, con `adaptive`, la lectura se
+    calcula de lo que de verdad tarda ese endpoint: `factor` veces su percentil
+    `percentile`, entre `adaptive_min` y `read`. Tras agotarse un plazo adaptativo,
+    ese endpoint vuelve a `read` durante `relax_seconds` para no encadenar fallos.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyTracker,
+        connect: float = 3.05,
+        read: float = 10.0,
+        overrides: Optional[Dict[str, Override]] = None,
+        *,
+        adaptive: bool = False,
+        percentile: float = 0.99,
+        factor: float = 3.0,
+        adaptive_min: float = 1.0,
+        relax_seconds: float = 60.0,
+    ) -> None:
+        self.latency = latency
+        self.connect = connect
+        self.read = read
+        self.overrides = {_override_key(key): value for key, value in (overrides or {}).items()}
+        self.adaptive = adaptive
+        self.percentile = percentile
+        self.factor = factor
+        self.adaptive_min = adaptive_min
+        self.relax_seconds = relax_seconds
+        self._relaxed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def for_request(self, method: str, path: str) -> Timeout:
+        key = LatencyTracker.key(method, path)
+        override = self.overrides.get(key) or self.overrides.get(path_template(path))
+        if override is not None:
+            connect, read = override
+            return (connect if connect is not None else self.connect), read
+        if not self.adaptive or self._is_relaxed(key):
+            return self.connect, self.read
+        observed = self.latency.percentile(method, path, self.percentile)
+        if observed is None:
+            return self.connect, self.read
+        return self.connect, min(self.read, max(self.adaptive_min, observed * self.factor))
+
+    def note_timeout(self, method: str, path: str) -> None:
+        with self._lock:
+            self._relaxed[LatencyTracker.key(method, path)] = time.monotonic() + self.relax_seconds
+
+    def _is_relaxed(self, key: str) -> bool:
+        with self._lock:
+            until = self._relaxed.get(key)
+            if until is not None and until <= time.monotonic():
+                del self._relaxed[key]
+                return False
+            return until is not None
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Mapping
+
+from app.services.rules import Rule, RuleSet
+
+# Validaciones de negocio compartidas por las ventanas (Tk), la CLI y las importaciones.
+# Cada entidad declara sus reglas una vez; RuleSet las compila y valida un registro
+# (`validate_*`, que lanza ValueError con el mismo mensaje que ve el usuario en la UI)
+# o un lote completo con errores por campo (`RULES[entity].validate_many`).
+
+Record = Mapping[str, Any]
+
+PERSON_NAME_MESSAGE = "El nombre solo puede contener letras y espacios. Carácter no válido: '{detail}'"
+
+
+def ids_message(label: str) -> str:
+    return f"{label} debe ser una lista de IDs numéricos. Valor no válido: '{{detail}}'"
+
+
+GROUP_REFERENCES = (
+    ('careerId', 'Carrera'),
+    ('subjectId', 'Materia'),
+    ('teacherId', 'Maestro'),
+    ('classroomId', 'Salón'),
+    ('scheduleId', 'Horario'),
+)
+
+RULES: Dict[str, RuleSet] = {
+    'users': RuleSet('users', (
+        Rule('username', 'username', required='El nombre de usuario es requerido.',
+             message='El nombre de usuario no puede contener espacios.'),
+        Rule('email', 'email', required='El email es requerido.',
+             message='El formato del email no es válido (ej. usuario@dominio.com).', admin_only=True),
+        Rule('role', required='El rol es requerido.', admin_only=True),
+        Rule('password', required='La contraseña es requerida para crear un nuevo usuario.', required_on='create'),
+    )),
+    'students': RuleSet('students', (
+        Rule('userId', 'id', required='Debes seleccionar un correo de usuario disponible para crear un alumno.', required_on='create'),
+        *(
+            Rule(key, kind, required='Los campos Nombre, Estado, Fecha de Nacimiento y Carrera son requeridos.', message=message)
+            for key, kind, message in (
+                ('name', 'person', PERSON_NAME_MESSAGE),
+                ('status', 'text', ''),
+                ('dateOfBirth', 'date', "La fecha de nacimiento debe estar en formato YYYY-MM-DD (ej. 1995-01-30)."),
+                ('careerId', 'id', ''),
+            )
+        ),
+        Rule('subjects', 'ids', message=ids_message('Materias')),
+    )),
+    'teachers': RuleSet('teachers', (
+        Rule('name', 'person', required='El nombre es requerido.', message=PERSON_NAME_MESSAGE),
+        Rule('degree', required='El grado de estudios es requerido.'),
+        Rule('userId', 'id', required='Al crear un nuevo maestro, debes seleccionar un correo de usuario disponible.',
+             required_on='create', admin_only=True),
+        Rule('careerIds', 'ids', message=ids_message('Carreras'), admin_only=True),
+        Rule('subjectIds', 'ids', message=ids_message('Materias')),
+    )),
+    'careers': RuleSet('careers', (
+        Rule('name', required='Todos los campos son requeridos'),
+        Rule('semesters', 'int', required='Todos los campos son requeridos',
+             message='El número de semestres debe ser un número entero positivo', minimum=1),
+    )),
+    'subjects': RuleSet('subjects', (
+        Rule('name', required='Todos los campos son requeridos'),
+        *(
+            Rule(key, 'int', required='Todos los campos son requeridos',
+                 message='Créditos y semestre deben ser números enteros positivos', minimum=1)
+            for key in ('credits', 'semester')
+        ),
+        Rule('careerId', 'id', required='Todos los campos son requeridos'),
+    )),
+    'classrooms': RuleSet('classrooms', (
+        Rule('name', required='El Nombre y el Edificio son campos requeridos.'),
+        Rule('building', required='El Nombre y el Edificio son campos requeridos.'),
+    )),
+    'schedules': RuleSet('schedules', (
+        Rule('time', 'time', required='La hora y el turno son campos requeridos.',
+             message="El formato de la hora debe ser HH:MM (ej. 07:00 o 14:30)."),
+        Rule('shift', required='La hora y el turno son campos requeridos.'),
+    )),
+    'groups': RuleSet('groups', (
+        Rule('name', 'group_name', required='El Nombre de grupo es requerido.',
+             message="El nombre del grupo solo puede contener letras, números, espacios o guiones."),
+        *(Rule(key, 'id', required=f'Debes seleccionar una opción válida para {label}.') for key, label in GROUP_REFERENCES),
+        Rule('semester', 'int', required='Semestre y Máx. alumnos deben ser números enteros.',
+             message='Semestre y Máx. alumnos deben ser números enteros.', minimum=1,
+             range_message='El semestre debe ser un número positivo (ej. 1, 2, ...).'),
+        Rule('maxStudents', 'int', required='Semestre y Máx. alumnos deben ser números enteros.',
+             message='Semestre y Máx. alumnos deben ser números enteros.', minimum=1,
+             range_message='El Máx. de alumnos debe ser un número positivo.'),
+    )),
+}
+
+
+def validate_user(record: Record, *, creating: bool, is_admin: bool = True) -> Dict[str, Any]:
+    return RULES['users'].validate(record, creating=creating, is_admin=is_admin)
+
+
+def validate_student(record: Record, *, creating: bool) -> Dict[str, Any]:
+    return RULES['students'].validate(record, creating=creating)
+
+
+def validate_teacher(record: Record, *, creating: bool, is_admin: bool = True) -> Dict[str, Any]:
+    return RULES['teachers'].validate(record, creating=creating, is_admin=is_admin)
+
+
+def validate_career(record: Record, *, creating: bool = True) -> Dict[str, Any]:
+    return RULES['careers'].validate(record, creating=creating)
+
+
+def validate_subject(record: Record, *, creating: bool = True) -> Dict[str, Any]:
+    return RULES['subjects'].validate(record, creating=creating)
+
+
+def validate_classroom(record: Record, *, creating: bool = True) -> Dict[str, Any]:
+    return RULES['classrooms'].validate(record, creating=creating)
+
+
+def validate_schedule(record: Record, *, creating: bool = True) -> Dict[str, Any]:
+    return RULES['schedules'].validate(record, creating=creating)
+
+
+def validate_group(record: Record, *, creating: bool = True) -> Dict[str, Any]:
+    return RULES['groups'].validate(record, creating=creating)
+
+
+VALIDATORS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'users': validate_user,
+    'students': validate_student,
+    'teachers': validate_teacher,
+    'careers': validate_career,
+    'subjects': validate_subject,
+    'classrooms': validate_classroom,
+    'schedules': validate_schedule,
+    'groups': validate_group,
+}
+
+
+def normalize_detail(entity: str, record: Record) -> Dict[str, Any]:
+    """Convierte un registro de detalle (GET /{entity}/{id}) a las llaves que esperan los validadores."""
+    record = dict(record)
+    if entity == 'students' and record.get('subjects') and isinstance(record['subjects'][0], dict):
+        record['subjects'] = [item['subjectId'] for item in record['subjects']]
+    if entity == 'teachers':
+        if 'subjectIds' not in record:
+            record['subjectIds'] = [item['subjectId'] for item in record.get('subjects', [])]
+        if 'careerIds' not in record:
+            record['careerIds'] = [item['careerId'] for item in record.get('careers', [])]
+    return record
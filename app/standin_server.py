@@ -0,0 +1,261 @@
+"""Servidor local que imita la API de SIGUE para probar trabajos masivos sin tocar el real.
+
+Guarda todo en memoria y modela una capacidad limitada: atiende a lo más --capacity
+peticiones a la vez (cada una tarda --service-time, más --jitter al azar), deja otras
+--queue esperando turno y al resto les responde 429 (o 503 con --reject-status) con
+Retry-After. Así se puede ver cómo se comporta `python -m app.cli --adaptive`:
+
+    python -m app.standin_server --port 8765 --capacity 8 --queue 8 --seed 500
+    python -m app.cli --base-url http://127.0.0.1:8765 -u admin -p admin --adaptive export students --details -o /dev/null
+
+Cualquier usuario y contraseña inician sesión como administrador. Acepta cuerpos con
+Content-Encoding gzip o deflate y, con --compress-over, comprime las respuestas de ese
+tamaño en adelante según el Accept-Encoding de la petición (ver app.compressioncheck).
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.validation import VALIDATORS
+
+RECORD_PATH = re.compile(r'^/(?P<entity>[a-z]+)(?:/(?P<id>\d+))?$')
+
+# Codificaciones que entiende el servidor, en orden de preferencia al responder
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {'gzip': gzip.compress, 'deflate': zlib.compress}
+DECODERS: Dict[str, Callable[[bytes], bytes]] = {'gzip': gzip.decompress, 'deflate': zlib.decompress}
+
+
+@dataclass
+class CapacityModel:
+    capacity: int = 8
+    queue: int = 8
+    service_time: float = 0.05
+    jitter: float = 0.02
+    retry_after: float = 1.0
+    reject_status: int = 429
+    served: int = 0
+    rejected: int = 0
+    _waiting: int = 0
+    _slots: threading.Semaphore = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        self._slots = threading.Semaphore(self.capacity)
+
+    def admit(self) -> bool:
+        """Ocupa un lugar de servicio (esperando en la cola si hace falta); False si la cola está llena."""
+        with self._lock:
+            if self._waiting >= self.capacity + self.queue:
+                self.rejected += 1
+                return False
+            self._waiting += 1
+        self._slots.acquire()
+        return True
+
+    def serve(self) -> None:
+        time.sleep(max(0.0, self.service_time + random.uniform(-self.jitter, self.jitter)))
+
+    def leave(self) -> None:
+        self._slots.release()
+        with self._lock:
+            self._waiting -= 1
+            self.served += 1
+
+
+@dataclass
+class WireLog:
+    """Lo que se vio en el cable: codificación de cada cuerpo recibido y bytes por codificación enviada."""
+
+    request_encodings: Counter = field(default_factory=Counter)
+    accept_encodings: Counter = field(default_factory=Counter)
+    response_raw: Counter = field(default_factory=Counter)
+    response_wire: Counter = field(default_factory=Counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def received(self, encoding: str, accept: str) -> None:
+        with self._lock:
+            self.request_encodings[encoding] += 1
+            self.accept_encodings[accept] += 1
+
+    def sent(self, encoding: str, raw: int, wire: int) -> None:
+        with self._lock:
+            self.response_raw[encoding] += raw
+            self.response_wire[encoding] += wire
+
+
+def negotiate(accept: str) -> str:
+    """Primera codificación de `accept` que el servidor sabe producir ('identity' si ninguna)."""
+    for item in accept.split(','):
+        name, _, quality = item.strip().partition(';q=')
+        if name.lower() in ENCODERS and quality.strip() not in ('0', '0.0'):
+            return name.lower()
+    return 'identity'
+
+
+class StandInStore:
+    def __init__(self, seed: int = 0) -> None:
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.records: Dict[str, Dict[int, Dict[str, Any]]] = {entity: {} for entity in VALIDATORS}
+        for entity in self.records:
+            for index in range(seed):
+                self.create(entity, {'name': f'{entity} {index + 1}'})
+
+    def create(self, entity: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            record = {**data, 'id': next(self._ids), 'version': 1}
+            self.records[entity][record['id']] = record
+            return record
+
+    def update(self, entity: str, record_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = self.records[entity].get(record_id)
+            if current is None:
+                return None
+            current.update({key: value for key, value in data.items() if key not in ('id', 'version')})
+            current['version'] += 1
+            return current
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    model: CapacityModel
+    store: StandInStore
+    log: WireLog
+    # Tamaño desde el que se comprimen las respuestas (None = nunca)
+    compress_over: Optional[int] = None
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - firma de BaseHTTPRequestHandler
+        pass
+
+    def _handle(self) -> None:
+        if not self.model.admit():
+            self._reply(self.model.reject_status, {'message': 'Servidor saturado'},
+                        {'Retry-After': f'{self.model.retry_after:g}'})
+            return
+        try:
+            self.model.serve()
+            status, body = self._route()
+        finally:
+            self.model.leave()
+        self._reply(status, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def _route(self) -> Tuple[int, Any]:
+        path = self.path.split('?')[0]
+        length = int(self.headers.get('Content-Length') or 0)
+        encoding = self.headers.get('Content-Encoding', 'identity').lower()
+        self.log.received(encoding, self.headers.get('Accept-Encoding', ''))
+        body = self.rfile.read(length) if length else b''
+        if body and encoding != 'identity':
+            if encoding not in DECODERS:
+                return 415, {'message': f'Content-Encoding no soportado: {encoding}'}
+            body = DECODERS[encoding](body)
+        data = json.loads(body) if body else {}
+        if path == '/auth/login' and self.command == 'POST':
+            return 200, {'token': 'standin', 'user': {'id': 1, 'username': data.get('username'), 'role': 'ADMIN'}}
+        match = RECORD_PATH.match(path)
+        if not match or match.group('entity') not in self.store.records:
+            return 404, {'message': f'No existe {path}'}
+        entity, raw_id = match.group('entity'), match.group('id')
+        records = self.store.records[entity]
+        if raw_id is None:
+            if self.command == 'GET':
+                return 200, list(records.values())
+            if self.command == 'POST':
+                return 201, self.store.create(entity, data)
+            return 405, {'message': 'Método no permitido'}
+        record_id = int(raw_id)
+        if self.command == 'GET':
+            record = records.get(record_id)
+        elif self.command == 'PUT':
+            record = self.store.update(entity, record_id, data)
+        elif self.command == 'DELETE':
+            record = records.pop(record_id, None)
+            return (204, None) if record is not None else (404, {'message': 'No encontrado'})
+        else:
+            return 405, {'message': 'Método no permitido'}
+        return (200, record) if record is not None else (404, {'message': 'No encontrado'})
+
+    def _reply(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        content = json.dumps(body).encode() if body is not None else b''
+        raw = len(content)
+        encoding = 'identity'
+        if self.compress_over is not None and raw >= self.compress_over:
+            encoding = negotiate(self.headers.get('Accept-Encoding', ''))
+            if encoding != 'identity':
+                content = ENCODERS[encoding](content)
+        self.log.sent(encoding, raw, len(content))
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def build_server(
+    host: str,
+    port: int,
+    model: CapacityModel,
+    store: StandInStore,
+    *,
+    compress_over: Optional[int] = None,
+    log: Optional[WireLog] = None,
+) -> ThreadingHTTPServer:
+    handler = type('Handler', (StandInHandler,), {
+        'model': model, 'store': store, 'log': log or WireLog(), 'compress_over': compress_over,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m app.standin_server', description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--capacity', type=int, default=8, help='peticiones atendidas a la vez')
+    parser.add_argument('--queue', type=int, default=8, help='peticiones que pueden esperar turno')
+    parser.add_argument('--service-time', type=float, default=0.05, help='segundos por petición')
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--retry-after', type=float, default=1.0, help='segundos en la cabecera Retry-After')
+    parser.add_argument('--reject-status', type=int, choices=(429, 503), default=429)
+    parser.add_argument('--seed', type=int, default=0, help='registros iniciales por entidad')
+    parser.add_argument('--compress-over', type=int, default=None,
+                        help='comprime (gzip/deflate) las respuestas de al menos estos bytes')
+    args = parser.parse_args()
+
+    model = CapacityModel(
+        capacity=args.capacity, queue=args.queue, service_time=args.service_time, jitter=args.jitter,
+        retry_after=args.retry_after, reject_status=args.reject_status,
+    )
+    server = build_server(args.host, args.port, model, StandInStore(args.seed), compress_over=args.compress_over)
+    print(f"Escuchando en http://{args.host}:{server.server_port} (capacidad {args.capacity}, cola {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Atendidas {model.served}, rechazadas {model.rejected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Resultado del diálogo
+KEEP_MINE = 'mine'
+USE_SERVER = 'server'
+
+
+def field_diff(local: Mapping[str, Any], server: Mapping[str, Any]) -> List[Tuple[str, Any, Any]]:
+    """(campo, valor local, valor del servidor) de los campos del payload que no coinciden."""
+    differences = []
+    for key, value in local.items():
+        current = server.get(key)
+        if isinstance(value, list) and isinstance(current, list):
+            same = sorted(map(str, value)) == sorted(map(str, current))
+        else:
+            same = str(value) == str(current) if current is not None else value in (None, '')
+        if not same:
+            differences.append((key, value, current))
+    return differences
+
+
+class ConflictDialog(tk.Toplevel):
+    """Muestra campo por campo en qué difieren tus cambios de la copia actual del servidor.
+
+    `result` queda en KEEP_MINE (guardar de nuevo sobre la versión nueva), USE_SERVER
+    (descartar lo local y mostrar la copia del servidor) o None (cancelar).
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        title: str,
+        local: Mapping[str, Any],
+        server: Mapping[str, Any],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        super().__init__(master)
+        self.title(title)
+        self.transient(master.winfo_toplevel())
+        self.resizable(True, False)
+        self.result: Optional[str] = None
+        labels = labels or {}
+
+        frame = ttk.Frame(self, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(
+            frame, wraplength=520, justify=tk.LEFT,
+            text="Otra persona modificó este registro mientras lo editabas. Estos son los campos que no coinciden:",
+        ).pack(anchor='w', pady=(0, 10))
+
+        diff = field_diff(local, server)
+        tree = ttk.Treeview(frame, columns=('field', 'mine', 'server'), show='headings', height=min(8, max(1, len(diff))))
+        tree.heading('field', text='Campo'); tree.column('field', width=140)
+        tree.heading('mine', text='Tus cambios'); tree.column('mine', width=190)
+        tree.heading('server', text='Servidor'); tree.column('server', width=190)
+        for key, mine, theirs in diff:
+            tree.insert('', tk.END, values=(labels.get(key, key), _display(mine), _display(theirs)))
+        if not diff:
+            tree.insert('', tk.END, values=('(ninguno)', 'Solo cambió la versión', ''))
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(15, 0))
+        ttk.Button(buttons, text="Conservar mis cambios", command=lambda: self._close(KEEP_MINE)).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Usar la versión del servidor", command=lambda: self._close(USE_SERVER)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Cancelar", command=lambda: self._close(None)).pack(side=tk.RIGHT)
+        self.protocol("WM_DELETE_WINDOW", lambda: self._close(None))
+
+        self.grab_set()
+        self.wait_window(self)
+
+    def _close(self, result: Optional[str]) -> None:
+        self.result = result
+        self.destroy()
+
+
+def _display(value: Any) -> str:
+    if isinstance(value, list):
+        return ', '.join(map(str, value)) or '—'
+    return '—' if value in (None, '') else str(value)
+
+
+def ask_merge(
+    master: tk.Misc,
+    title: str,
+    local: Mapping[str, Any],
+    server: Mapping[str, Any],
+    labels: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    return ConflictDialog(master, title, local, server, labels).result
@@ -0,0 +1,517 @@
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import messagebox, ttk
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.services.api_client import ApiClient, ApiError
+from app.services.session import UserSession
+from app.services.validation import normalize_detail
+from app.ui.conflict_dialog import KEEP_MINE, USE_SERVER, ask_merge
+from app.ui.forms import Field, FormBinding, Formatter, resolve
+from app.ui.pending import PLACEHOLDER_PREFIX, PendingRows
+from app.ui.reconcile import TreeReconciler
+from app.ui.search_combo import SearchCombobox
+from app.ui.sorting import TreeSorter
+from app.ui.timeslice import TimeSlicer
+
+# Campo ID común a todos los formularios: se muestra pero nunca se envía
+ID_FIELD = Field('id', label='ID', editable_by=(), locked='readonly', payload=False)
+
+
+@dataclass(frozen=True)
+class Column:
+    """Una columna de la tabla: de qué llave del registro sale (o con qué función) y cómo se ve."""
+
+    key: str
+    heading: str
+    width: int = 100
+    source: str = ''  # Llave del registro si no es igual a `key`
+    value: Formatter = None
+    default: Any = ''
+    anchor: str = tk.W
+    stretch: bool = True
+
+
+@dataclass(frozen=True)
+class EntitySchema:
+    """Lo que distingue a un módulo CRUD de otro; los flujos los implementa CrudFrame."""
+
+    entity: str  # Recurso de la API: /{entity} y /{entity}/{id}
+    title: str
+    form_title: str
+    singular: str  # Con artículo: 'la carrera', 'el alumno'
+    plural: str  # 'las carreras', 'los alumnos'
+    saved: str
+    deleted: str
+    confirm_delete: str  # Plantilla con los textos del formulario, p. ej. "...'{name}'?"
+    columns: Tuple[Column, ...]
+    fields: Tuple[Field, ...]
+    validator: Callable[..., Dict[str, Any]]
+    list_fields: Optional[Tuple[str, ...]] = None
+    # Campos del payload que no se pueden repetir entre registros (sin distinguir mayúsculas)
+    unique: Tuple[str, ...] = ()
+    duplicate: str = ''
+    # Con `detail` al seleccionar se lee GET /{entity}/{id} (y su versión para If-Match);
+    # sin él basta la fila que ya trajo la lista
+    detail: bool = False
+    # Roles que ven la tabla y pueden crear y eliminar (None: todos); el resto edita su propio registro
+    manage_roles: Optional[Tuple[str, ...]] = None
+    self_title: str = ''
+    search: bool = False
+    tree_height: int = 10
+
+
+class CrudFrame(ttk.Frame):
+    """Módulo CRUD genérico: tabla, formulario y los flujos de cargar, elegir, guardar y eliminar.
+
+    Cada ventana declara su SCHEMA y sobreescribe solo los ganchos que necesita
+    (`_build_fields`, `_load_options`, `_show`, `_collect_payload`, `_pending_record`...).
+    Los flujos comunes usan siempre los caminos rápidos: lecturas por api.get (precarga
+    y caché de registros), filas reconciliadas por ID, escrituras por la cola en segundo
+    plano cuando está activa y duplicados buscados en un índice en Python en lugar de
+    recorrer las filas del Treeview.
+    """
+
+    SCHEMA: EntitySchema
+    # Nombres de los campos del payload en el diálogo de conflicto
+    FIELD_LABELS: Dict[str, str] = {}
+    # Columnas de la rejilla del formulario (los botones ocupan todas)
+    FORM_COLUMNS = 2
+    # Cada cuánto se revisa si ya llegaron las lecturas del paquete inicial (ms)
+    BOOTSTRAP_POLL_MS = 50
+
+    COLOR_BG = "#ecf0f1"
+    COLOR_PRIMARY = "#3498db"
+    COLOR_DANGER = "#e74c3c"
+    COLOR_TEXT_DARK = "#2c3e50"
+    COLOR_WHITE = "#ffffff"
+    COLOR_GRAY_BORDER = "#bdc3c7"
+
+    def __init__(self, master: tk.Misc, api: ApiClient, session: UserSession) -> None:
+        super().__init__(master, padding=20)
+        self.api = api
+        self.session = session
+        self.schema = self.SCHEMA
+        self.is_admin = session.role == 'ADMIN'
+        self.can_manage = self.schema.manage_roles is None or session.role in self.schema.manage_roles
+        self.current_id: Optional[int] = None
+        # Versión (ETag) del registro cargado; el PUT/DELETE solo se aplica si sigue siendo esa
+        self.loaded_version: Optional[str] = None
+        # Registros de la tabla por ID (copia en Python: elegir una fila no consulta a Tcl)
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self._unique_index: Dict[Tuple[str, ...], Any] = {}
+        self._column_getters = [resolve(self, column.value) for column in self.schema.columns]
+        self.tree_sync: Optional[TreeReconciler] = None
+        # Filas de la tabla (ID, valores) en el orden del servidor, para volver a ordenarlas
+        self._table_rows: List[Tuple[Any, Tuple[Any, ...]]] = []
+        # Llenar la tabla por tramos para que la ventana siga respondiendo con miles de filas
+        self.slicer = TimeSlicer(self)
+        self.form = FormBinding(self, self.schema.fields, session.role)
+
+        self._apply_styles()
+        self.pack(fill=tk.BOTH, expand=True)
+        self.columnconfigure(0, weight=1)
+        title = self.schema.title if self.can_manage or not self.schema.self_title else self.schema.self_title
+        ttk.Label(self, text=title, font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
+
+        row = 1
+        if self.can_manage:
+            if self.schema.search:
+                self._build_search(self, row)
+                row += 1
+            self.rowconfigure(row, weight=1)  # La tabla se expande
+            self._build_tree(self, row)
+            row += 1
+        else:
+            self.rowconfigure(row, weight=1)  # Sin tabla se expande el formulario
+        self._build_form(self, row)
+
+        # Guardar/eliminar por la cola en segundo plano si está activa (SIGUE_WRITE_BEHIND)
+        self.pending = PendingRows(self, self.api, self.schema.entity, self.tree_sync, on_settled=self._writes_settled)
+        self.form.reset(**self._form_defaults())
+        self._bootstrap_after: Optional[str] = None
+        self.bind('<Destroy>', self._on_destroy, add='+')
+        self._load_initial()
+
+    # --- Construcción ---
+
+    def _apply_styles(self) -> None:
+        self.style = ttk.Style(self)
+        self.style.configure('Content.TFrame', background=self.COLOR_BG)
+        self.configure(style='Content.TFrame')
+        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
+        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
+        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
+        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
+        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
+        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
+        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
+        self.style.configure('TListbox', background=self.COLOR_WHITE, foreground=self.COLOR_TEXT_DARK, borderwidth=1, relief='solid', fieldbackground=self.COLOR_WHITE)
+
+    def _build_search(self, container: ttk.Frame, row: int) -> None:
+        search_frame = ttk.Frame(container, style='Content.TFrame')
+        search_frame.grid(row=row, column=0, sticky="ew", pady=(0, 10))
+        ttk.Label(search_frame, text="Buscar por ID:", style='Content.TLabel').pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Buscar", command=self._search, style='Primary.TButton').pack(side=tk.LEFT)
+
+    def _build_tree(self, container: ttk.Frame, row: int) -> None:
+        tree_container = ttk.Frame(container, style='Content.TFrame')
+        tree_container.grid(row=row, column=0, sticky="nsew", pady=(0, 10))
+        tree_container.rowconfigure(0, weight=1)
+        tree_container.columnconfigure(0, weight=1)
+
+        columns = tuple(column.key for column in self.schema.columns)
+        self.tree = ttk.Treeview(tree_container, columns=columns, show='headings', height=self.schema.tree_height)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.tree_sync = TreeReconciler(self.tree)
+
+        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        for column in self.schema.columns:
+            self.tree.heading(column.key, text=column.heading)
+            self.tree.column(column.key, width=column.width, anchor=column.anchor, stretch=column.stretch)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.sorter = TreeSorter(self.tree_sync, on_change=self._sort_rows)
+
+        # Avance mientras la tabla se llena por tramos (oculto el resto del tiempo)
+        self.progress_var = tk.StringVar(self)
+        self.progress_label = ttk.Label(tree_container, textvariable=self.progress_var, style='Content.TLabel')
+        self.progress_label.grid(row=1, column=0, sticky="w")
+        self.progress_label.grid_remove()
+
+    def _build_form(self, container: ttk.Frame, row: int) -> None:
+        form = ttk.LabelFrame(container, text=self.schema.form_title, style='Form.TLabelframe', padding=15)
+        form.grid(row=row, column=0, sticky="nsew")
+        form.columnconfigure(1, weight=1)
+        self._build_buttons(form, self._build_fields(form))
+
+    def _build_fields(self, form: ttk.LabelFrame) -> int:
+        """Una fila por campo (etiqueta y Entry/Combobox); devuelve la siguiente fila libre."""
+        for row, field in enumerate(self.schema.fields):
+            ttk.Label(form, text=field.label or field.key, style='Content.TLabel').grid(row=row, column=0, sticky="w", pady=5, padx=5)
+            self._field_widget(form, field).grid(row=row, column=1, sticky="ew", pady=5, padx=5)
+        return len(self.schema.fields)
+
+    def _field_widget(self, parent: tk.Misc, field: Field, **options: Any) -> tk.Misc:
+        # El estado (editable o no según el rol) lo pone self.form.attach
+        if field.widget == 'combo':
+            widget = ttk.Combobox(parent, textvariable=self.form.var(field.key), values=list(field.choices), **options)
+        elif field.widget == 'search':
+            widget = SearchCombobox(parent, textvariable=self.form.var(field.key), **options)
+        else:
+            widget = ttk.Entry(parent, textvariable=self.form.var(field.key), **options)
+        return self.form.attach(field.key, widget)
+
+    def _build_buttons(self, form: ttk.LabelFrame, row: int) -> None:
+        buttons = ttk.Frame(form, style='Content.TFrame')
+        buttons.grid(row=row, column=0, columnspan=self.FORM_COLUMNS, pady=15)
+        if self.can_manage:
+            ttk.Button(buttons, text="Nuevo", command=self._reset, style='Primary.TButton').grid(row=0, column=0, padx=5)
+            ttk.Button(buttons, text="Eliminar", command=self._delete, style='Danger.TButton').grid(row=0, column=2, padx=5)
+        ttk.Button(buttons, text="Guardar", command=self._save, style='Primary.TButton').grid(row=0, column=1, padx=5)
+
+    # --- Carga ---
+
+    def _load_initial(self) -> None:
+        # Si el paquete inicial aún trae lecturas de esta ventana, se revisa con after en vez de
+        # esperarlas con result(): el hilo de Tk sigue atendiendo la interfaz mientras llegan
+        self._bootstrap_after = None
+        bundle = self.session.bootstrap
+        if bundle is not None and not bundle.ready(type(self).__name__):
+            self._bootstrap_after = self.after(self.BOOTSTRAP_POLL_MS, self._load_initial)
+            return
+        self._load_options()
+        if self.can_manage:
+            self._load_rows()
+        else:
+            self._load_self()
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self and self._bootstrap_after is not None:
+            self.after_cancel(self._bootstrap_after)
+            self._bootstrap_after = None
+
+    def _load_options(self) -> None:
+        """Listas de apoyo de los combobox; se llama al abrir el módulo."""
+
+    def _refresh_options(self) -> None:
+        """Lo que hay que volver a pedir después de guardar o eliminar (p. ej. usuarios libres)."""
+
+    def _load_self(self) -> None:
+        """Carga el registro propio cuando el rol no administra el módulo."""
+
+    def _list_params(self) -> Optional[Dict[str, Any]]:
+        """Filtro de la lista ({} para todo); None deja la tabla vacía (p. ej. sin carrera elegida)."""
+        return {}
+
+    def _load_rows(self) -> None:
+        params = self._list_params()
+        if params is None:
+            self._set_rows([])
+            return
+        try:
+            records = self.api.get(f'/{self.schema.entity}', params=params or None, fields=self.schema.list_fields)
+        except ApiError as error:
+            messagebox.showerror("Error de Carga", f"No se pudieron cargar {self.schema.plural}: {error.message}")
+            return
+        except Exception as error:
+            messagebox.showerror("Error de Carga", f"No se pudieron cargar {self.schema.plural}: {error}")
+            return
+        if params:
+            # Todas las filas comparten el valor del filtro aunque el servidor no lo repita
+            records = [{**params, **record} for record in records]
+        self._set_rows(records)
+
+    def _set_rows(self, records: Sequence[Dict[str, Any]]) -> None:
+        self.rows = {record['id']: record for record in records}
+        self._index_rows()
+        if self.tree_sync is not None:
+            self._table_rows = [(record['id'], self._row_values(record)) for record in records]
+            self._fill_tree(self.sorter.order(self._table_rows))
+
+    def _fill_tree(self, rows: List[Tuple[Any, Tuple[Any, ...]]]) -> None:
+        # Una recarga a medio llenar cancela la anterior; la tabla sigue desde lo ya insertado
+        self.slicer.run('rows', self.tree_sync.steps(rows), total=len(rows), on_progress=self._rows_progress)
+
+    def _sort_rows(self) -> None:
+        if self.slicer.busy('rows'):
+            # Aún se está llenando: se sigue llenando ya en el nuevo orden
+            self._fill_tree(self.sorter.order(self._table_rows))
+        else:
+            self.sorter.apply()
+
+    def _rows_progress(self, done: int, total: Optional[int]) -> None:
+        if total is not None and done < total:
+            self.progress_var.set(f"Cargando {self.schema.plural}… {done} de {total}")
+            self.progress_label.grid()
+        else:
+            self.progress_label.grid_remove()
+
+    def _row_values(self, record: Mapping[str, Any]) -> Tuple[Any, ...]:
+        values: List[Any] = []
+        for column, getter in zip(self.schema.columns, self._column_getters):
+            if getter is not None:
+                values.append(getter(record))
+                continue
+            value = record.get(column.source or column.key)
+            values.append(column.default if value is None else value)
+        return tuple(values)
+
+    def _writes_settled(self) -> None:
+        # Lo guardado en segundo plano cambió la versión del registro abierto: el próximo
+        # guardado debe condicionarse a esa, no a la que se leyó al seleccionarlo
+        if self.current_id is not None:
+            self.loaded_version = self.api.version_of(f'/{self.schema.entity}/{self.current_id}') or self.loaded_version
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self._refresh_options()
+        if self.can_manage:
+            self._load_rows()
+        else:
+            self._load_self()
+
+    # --- Duplicados ---
+
+    def _unique_key(self, record: Mapping[str, Any]) -> Tuple[str, ...]:
+        return tuple('' if record.get(key) is None else str(record.get(key)).strip().casefold() for key in self.schema.unique)
+
+    def _index_rows(self) -> None:
+        if self.schema.unique:
+            self._unique_index = {self._unique_key(record): record_id for record_id, record in self.rows.items()}
+
+    def _duplicate_of(self, payload: Mapping[str, Any]) -> Optional[Any]:
+        """ID (o iid pendiente) de otro registro con los mismos valores únicos, en O(1)."""
+        if not self.schema.unique:
+            return None
+        owner = self._unique_index.get(self._unique_key(payload))
+        return owner if owner is not None and owner != self.current_id else None
+
+    # --- Selección ---
+
+    def _on_select(self, _event: tk.Event) -> None:
+        selection = self.tree.selection()
+        if not selection:
+            return
+        if self.pending.is_placeholder(selection[0]):
+            return # Alta aún en cola: todavía no tiene ID
+        record_id = int(selection[0]) # El iid de cada fila es el ID
+        if self.schema.detail:
+            self._load_record(record_id)
+            self._prefetch_neighbors(selection[0])
+        elif record_id in self.rows:
+            self._show(self.rows[record_id])
+
+    def _prefetch_neighbors(self, iid: str) -> None:
+        # Precargar las filas de arriba y abajo para que moverse con las flechas sea inmediato
+        if self.api.records is not None and self.tree_sync is not None:
+            # Las altas aún en cola no tienen ID que pedir
+            neighbors = [neighbor for neighbor in self.tree_sync.neighbors(iid) if not self.pending.is_placeholder(neighbor)]
+            self.api.records.prefetch(self.schema.entity, neighbors)
+
+    def _search(self) -> None:
+        value = self.search_var.get().strip()
+        if not value.isdecimal():
+            messagebox.showinfo("Buscar", "Ingresa un ID numérico válido.")
+            return
+        self._load_record(int(value))
+
+    def _load_record(self, record_id: int) -> None:
+        path = f'/{self.schema.entity}/{record_id}'
+        try:
+            data = self.api.get(path)
+        except ApiError as error:
+            messagebox.showerror("Error", f"No se pudo cargar {self.schema.singular}: {error.message}")
+            return
+        self._show(data, self.api.version_of(path))
+
+    def _show(self, data: Dict[str, Any], version: Optional[str] = None) -> None:
+        self.current_id = data['id']
+        self.loaded_version = version
+        self.form.apply(data)
+
+    def _form_defaults(self) -> Dict[str, str]:
+        """Valores del formulario vacío que no son los de cada Field (p. ej. conservar un filtro)."""
+        return {}
+
+    def _reset(self) -> None:
+        self.current_id = None
+        self.loaded_version = None
+        self.form.reset(**self._form_defaults())
+        if self.tree_sync is not None:
+            self.tree.selection_remove(self.tree.selection())
+
+    # --- Guardar ---
+
+    def _validate(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return self.schema.validator(record, creating=self.current_id is None)
+
+    def _collect_payload(self) -> Dict[str, Any]:
+        return self._validate(self.form.record())
+
+    def _pending_record(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Registro a mostrar en la tabla mientras el cambio está en cola."""
+        return {**self.rows.get(self.current_id, {}), **payload, 'id': self.current_id or '…'}
+
+    def _save(self) -> None:
+        try:
+            payload = self._collect_payload()
+        except ValueError as error:
+            messagebox.showwarning("Validación", str(error))
+            return
+
+        if self._duplicate_of(payload) is not None:
+            messagebox.showwarning("Registro Duplicado", self.schema.duplicate.format(**payload))
+            return
+
+        row = self._row_values(self._pending_record(payload))
+        mutation = self.pending.save(self.current_id, payload, row, if_match=self.loaded_version)
+        if mutation is not None:
+            # Se envía en segundo plano; la fila queda marcada hasta que el servidor confirme
+            if self.current_id is None:
+                if self.schema.unique:
+                    self._unique_index[self._unique_key(payload)] = f'{PLACEHOLDER_PREFIX}{mutation.id}'
+                self._reset()
+            else:
+                self.rows[self.current_id] = {**self.rows.get(self.current_id, {}), **payload}
+                self._index_rows()
+            return
+
+        path = f'/{self.schema.entity}'
+        try:
+            if self.current_id is None:
+                saved = self.api.post(path, payload)
+            else:
+                saved = self.api.put(f"{path}/{self.current_id}", payload, if_match=self.loaded_version)
+        except ApiError as error:
+            if error.status_code == 412:
+                self._resolve_conflict(payload)
+            else:
+                messagebox.showerror("Error de API", error.message)
+            return
+        except Exception as error:
+            messagebox.showerror("Error", str(error))
+            return
+
+        messagebox.showinfo("Éxito", self.schema.saved)
+        self._after_save(saved)
+
+    def _after_save(self, saved: Dict[str, Any]) -> None:
+        self._refresh_options()
+        if self.schema.detail:
+            self._load_record(saved['id']) # Recargar el formulario (y su versión)
+        else:
+            self.current_id = saved['id']
+            self.form.set('id', str(saved['id']))
+        if self.can_manage:
+            self._load_rows()
+
+    def _resolve_conflict(self, payload: Dict[str, Any]) -> None:
+        # Alguien más guardó el registro después de que lo cargamos: se compara campo por campo
+        path = f"/{self.schema.entity}/{self.current_id}"
+        try:
+            server = self.api.get(path)
+        except ApiError as error:
+            messagebox.showerror("Error de API", error.message)
+            return
+        choice = ask_merge(
+            self, f"Conflicto al guardar {self.schema.singular}", payload,
+            normalize_detail(self.schema.entity, server), self.FIELD_LABELS,
+        )
+        if choice == KEEP_MINE:
+            # El formulario sigue con los cambios locales; se guardan sobre la versión nueva
+            self.loaded_version = self.api.version_of(path)
+            self._save()
+        elif choice == USE_SERVER:
+            self._show(server, self.api.version_of(path))
+
+    # --- Eliminar ---
+
+    def _confirm_delete(self) -> bool:
+        texts = {key: self.form.get(key) for key in self.form.fields}
+        return messagebox.askyesno("Confirmar Eliminación", self.schema.confirm_delete.format(**texts))
+
+    def _delete(self) -> None:
+        article, noun = self.schema.singular.split(' ', 1)
+        if not self.can_manage:
+            messagebox.showwarning("Permiso", f"Solo el administrador puede eliminar {self.schema.plural.split(' ', 1)[1]}")
+            return
+        if self.current_id is None:
+            messagebox.showwarning("Operación", f"Por favor, selecciona {'un' if article == 'el' else 'una'} {noun} de la tabla para eliminar.")
+            return
+        if not self._confirm_delete():
+            return
+
+        deleted_id = self.current_id
+        if self.pending.delete(deleted_id, if_match=self.loaded_version) is not None:
+            self.rows.pop(deleted_id, None)
+            self._index_rows()
+            self._reset()
+            return
+
+        try:
+            self.api.delete(f"/{self.schema.entity}/{deleted_id}", if_match=self.loaded_version)
+        except ApiError as error:
+            if error.status_code == 412:
+                pronoun = 'lo' if article == 'el' else 'la'
+                messagebox.showwarning(
+                    "Conflicto",
+                    f"{self.schema.singular.capitalize()} cambió desde que {pronoun} abriste; revisa los datos actuales antes de eliminar{pronoun}.",
+                )
+                self._load_record(deleted_id)
+            else:
+                messagebox.showerror("Error de API", error.message)
+            return
+        except Exception as error:
+            messagebox.showerror("Error", str(error))
+            return
+
+        messagebox.showinfo("Éxito", self.schema.deleted)
+        self._reset()
+        self._refresh()
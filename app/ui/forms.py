@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+# Un formateador/parser puede ser una función o el nombre de un método de la ventana
+# (para los que necesitan datos de la instancia, como las opciones de un combobox)
+Formatter = Union[Callable[[Mapping[str, Any]], str], str, None]
+Parser = Union[Callable[[str], Any], str, None]
+Check = Union[Callable[[Any], None], str, None]
+
+
+def resolve(owner: Any, function: Union[Callable[..., Any], str, None]) -> Optional[Callable[..., Any]]:
+    """La función tal cual, o el método `function` de `owner` si se dio por nombre."""
+    return getattr(owner, function) if isinstance(function, str) else function
+
+
+def option_id(text: str) -> str:
+    """ID de una opción de combobox con formato 'ID - Nombre' ('' si no hay selección)."""
+    return text.split(' - ')[0].strip()
+
+
+@dataclass(frozen=True)
+class Field:
+    """Un campo del formulario declarado una sola vez.
+
+    `key` es la llave del registro de la API y del payload. `format` convierte el
+    registro en el texto del widget (por defecto `str(record[key])`), `parse` convierte
+    el texto de vuelta al valor del payload y `validate` revisa ese valor (lanza
+    ValueError con el mensaje para el usuario). Los roles fuera de `editable_by` ven el
+    widget en estado `locked`; los demás, en `state` ('readonly' en los combobox de
+    solo selección). `label`, `widget` ('entry', 'combo' o 'search', un combobox con
+    búsqueda para listas largas) y `choices` solo los usa el formulario genérico de
+    CrudFrame; las ventanas con diseño propio los ignoran.
+    """
+
+    key: str
+    format: Formatter = None
+    parse: Parser = None
+    validate: Check = None
+    editable_by: Optional[Tuple[str, ...]] = None
+    state: str = 'normal'
+    locked: str = 'disabled'
+    default: str = ''
+    payload: bool = True
+    label: str = ''
+    widget: str = 'entry'
+    choices: Tuple[str, ...] = ()
+
+
+class FormBinding:
+    """Variables, estados y payload de un formulario a partir de su lista de campos.
+
+    `apply(record)` no toca los widgets de inmediato: junta los textos y los escribe en
+    una sola pasada cuando Tk queda ocioso, saltándose los que ya muestran ese valor.
+    Si se cargan varios registros seguidos (p. ej. al recorrer la tabla con las flechas)
+    solo se pinta el último. `get` y `record` leen lo pendiente, así que el resto de la
+    ventana ve el formulario como si ya se hubiera escrito.
+    """
+
+    def __init__(self, owner: tk.Misc, fields: Sequence[Field], role: Optional[str]) -> None:
+        self.owner = owner
+        self.fields: Dict[str, Field] = {field.key: field for field in fields}
+        self.role = role
+        self.vars: Dict[str, tk.StringVar] = {}
+        self.widgets: Dict[str, tk.Misc] = {}
+        # Texto que escribimos por última vez en cada variable; la traza lo olvida si el usuario la edita
+        self._shown: Dict[str, str] = {}
+        self._states: Dict[str, str] = {}
+        self._pending: Dict[str, str] = {}
+        self._after: Optional[str] = None
+        self.writes = 0
+        self.skipped = 0
+        for key, field in self.fields.items():
+            var = self.vars[key] = tk.StringVar(owner, value=field.default)
+            self._shown[key] = field.default
+            var.trace_add('write', lambda *_args, key=key: self._shown.pop(key, None))
+        owner.bind('<Destroy>', self._on_destroy, add='+')
+
+    def var(self, key: str) -> tk.StringVar:
+        return self.vars[key]
+
+    def attach(self, key: str, widget: tk.Misc) -> tk.Misc:
+        """Registra el widget del campo y le da el estado que corresponde al rol."""
+        self.widgets[key] = widget
+        self._set_state(key, self.state_of(key))
+        return widget
+
+    def editable(self, key: str) -> bool:
+        allowed = self.fields[key].editable_by
+        return allowed is None or self.role in allowed
+
+    def state_of(self, key: str) -> str:
+        field = self.fields[key]
+        return field.state if self.editable(key) else field.locked
+
+    def _set_state(self, key: str, state: str) -> None:
+        widget = self.widgets.get(key)
+        if widget is not None and self._states.get(key) != state:
+            widget.configure(state=state)
+            self._states[key] = state
+
+    # --- Registro -> formulario ---
+
+    def apply(self, record: Mapping[str, Any]) -> None:
+        """Programa mostrar `record` en todos los campos (los que falten quedan vacíos)."""
+        for key, field in self.fields.items():
+            formatter = resolve(self.owner, field.format)
+            if formatter is not None:
+                text = formatter(record)
+            else:
+                value = record.get(key)
+                text = '' if value is None else str(value)
+            self._pending[key] = text
+        self._schedule()
+
+    def set(self, key: str, text: str) -> None:
+        self._pending[key] = text
+        self._schedule()
+
+    def reset(self, **overrides: str) -> None:
+        """Vuelve todos los campos a su valor por omisión (o al de `overrides`)."""
+        for key, field in self.fields.items():
+            self._pending[key] = overrides.get(key, field.default)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._after is None:
+            self._after = self.owner.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """Escribe ya lo pendiente; se llama solo en la siguiente pasada ociosa de Tk."""
+        if self._after is not None:
+            self.owner.after_cancel(self._after)
+            self._after = None
+        pending, self._pending = self._pending, {}
+        for key, text in pending.items():
+            if self._shown.get(key) == text:
+                self.skipped += 1
+                continue
+            self.vars[key].set(text)
+            self._shown[key] = text
+            self.writes += 1
+
+    # --- Formulario -> payload ---
+
+    def get(self, key: str) -> str:
+        """Texto actual del campo, contando lo que aún no se escribe en el widget."""
+        if key in self._pending:
+            return self._pending[key]
+        return self.vars[key].get()
+
+    def record(self) -> Dict[str, Any]:
+        """Valores del formulario con las llaves de la API, listos para el validador de la entidad."""
+        record: Dict[str, Any] = {}
+        for key, field in self.fields.items():
+            if not field.payload:
+                continue
+            parser = resolve(self.owner, field.parse)
+            value = parser(self.get(key)) if parser is not None else self.get(key)
+            check = resolve(self.owner, field.validate)
+            if check is not None:
+                check(value)
+            record[key] = value
+        return record
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.owner and self._after is not None:
+            self.owner.after_cancel(self._after)
+            self._after = None
@@ -2,142 +2,136 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, Dict, List, Optional
-
-from app.services.api_client import ApiClient, ApiError
-from app.services.session import UserSession
-# from app.ui.base_window import ModuleWindow # Ya no se usa
-
-# CAMBIO 1: Heredar de ttk.Frame
-class GroupsWindow(ttk.Frame):
-    def __init__(self, master: tk.Misc, api: ApiClient, session: UserSession) -> None:
-        super().__init__(master, padding=20) # CAMBIO 2: Aplicar padding aquí
-        self.api = api
-        self.session = session
-        self.current_id: Optional[int] = None
-        
-        # Listas de datos para los combobox
-        self.careers: List[Dict[str, Any]] = []
-        self.teachers: List[Dict[str, Any]] = []
-        self.classrooms: List[Dict[str, Any]] = []
-        self.schedules: List[Dict[str, Any]] = []
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.api_client import ApiError
+from app.services.options import OptionIndex
+from app.services.validation import validate_group
+from app.ui.crud import ID_FIELD, Column, CrudFrame, EntitySchema
+from app.ui.forms import Field, option_id
+from app.ui.reconcile import TreeReconciler
+from app.ui.search_combo import SearchCombobox
+from app.ui.sorting import TreeSorter
+
+
+class GroupsWindow(CrudFrame):
+    # Campos que se piden al servidor para la tabla (el resto del registro se lee al seleccionar)
+    LIST_FIELDS = ('id', 'name', 'careerName', 'subjectName', 'teacherName', 'scheduleTime')
+    # Campos de las listas de apoyo de los combobox
+    OPTION_FIELDS = {
+        '/careers': ('id', 'name'),
+        '/teachers': ('id', 'name'),
+        '/classrooms': ('id', 'name', 'building'),
+        '/schedules': ('id', 'time', 'shift'),
+        '/subjects': ('id', 'name'),
+    }
+    # Texto de cada opción en los combobox (se reconstruye igual al mostrar un grupo)
+    OPTION_LABELS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+        '/careers': lambda item: f"{item['id']} - {item['name']}",
+        '/teachers': lambda item: f"{item['id']} - {item['name']}",
+        '/classrooms': lambda item: f"{item['id']} - {item['name']} ({item['building']})",
+        '/schedules': lambda item: f"{item['id']} - {item['time']} ({item['shift']})",
+        '/subjects': lambda item: f"{item['id']} - {item['name']}",
+    }
+    # Campos del formulario; los combobox muestran "ID - Nombre" y se envía el ID de la opción
+    # elegida (lo escrito que no sea una opción de la lista no se acepta)
+    FORM = (
+        ID_FIELD,
+        Field('name'),
+        Field('careerId', format='_career_label', parse='_career_id'),
+        Field('subjectId', format='_subject_label', parse='_subject_id'),
+        Field('teacherId', format='_teacher_label', parse='_teacher_id'),
+        Field('classroomId', format='_classroom_label', parse='_classroom_id'),
+        Field('scheduleId', format='_schedule_label', parse='_schedule_id'),
+        Field('semester'),
+        Field('maxStudents'),
+    )
+    # Nombres de los campos del payload en el diálogo de conflicto
+    FIELD_LABELS = {
+        'name': 'Nombre', 'careerId': 'Carrera', 'subjectId': 'Materia', 'teacherId': 'Maestro',
+        'classroomId': 'Aula', 'scheduleId': 'Horario', 'semester': 'Semestre', 'maxStudents': 'Cupo máximo',
+    }
+    # Lecturas que necesita el módulo al abrirse, por rol (las precarga MainMenu al pasar el puntero)
+    PREFETCH = {'ADMIN': (
+        ('/careers', None, OPTION_FIELDS['/careers']),
+        ('/teachers', None, OPTION_FIELDS['/teachers']),
+        ('/classrooms', None, OPTION_FIELDS['/classrooms']),
+        ('/schedules', None, OPTION_FIELDS['/schedules']),
+        ('/groups', None, LIST_FIELDS),
+    )}
+
+    SCHEMA = EntitySchema(
+        entity='groups',
+        title="Gestión de Grupos",
+        form_title="Datos del grupo",
+        singular='el grupo',
+        plural='los grupos',
+        saved="Grupo guardado",
+        deleted="Grupo eliminado",
+        confirm_delete="¿Deseas eliminar el grupo '{name}'?",
+        columns=(
+            Column('id', 'ID', 40),
+            Column('name', 'Grupo', 100),
+            Column('career', 'Carrera', 150, source='careerName', default='N/A'),
+            Column('subject', 'Materia', 150, source='subjectName', default='N/A'),
+            Column('teacher', 'Maestro', 150, source='teacherName', default='N/A'),
+            Column('schedule', 'Horario', 100, source='scheduleTime', default='N/A'),
+        ),
+        fields=FORM,
+        validator=validate_group,
+        list_fields=LIST_FIELDS,
+        detail=True,
+        tree_height=7,
+    )
+    # Dos columnas de etiqueta + widget
+    FORM_COLUMNS = 4
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Opciones de cada combobox por ruta (ID <-> texto)
+        self.options: Dict[str, OptionIndex] = {path: OptionIndex() for path in self.OPTION_FIELDS}
         # MEJORA: Caché para materias, en lugar de cargar todo
         self.subjects_cache: Dict[int, List[Dict[str, Any]]] = {}
+        super().__init__(*args, **kwargs)
 
-        # --- MEJORA ESTÉTICA: Paleta de Colores ---
-        self.COLOR_BG = "#ecf0f1"
-        self.COLOR_PRIMARY = "#3498db"
-        self.COLOR_DANGER = "#e74c3c"
-        self.COLOR_TEXT_DARK = "#2c3e50"
-        self.COLOR_WHITE = "#ffffff"
-        self.COLOR_GRAY_BORDER = "#bdc3c7"
-
-        # --- MEJORA ESTÉTICA: Aplicar Estilos ---
-        self.style = ttk.Style(self)
-        self.style.configure('Content.TFrame', background=self.COLOR_BG)
-        self.configure(style='Content.TFrame')
-        self.style.configure('Content.TLabel', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 10))
-        self.style.configure('Form.TLabelframe', background=self.COLOR_BG, relief="solid", borderwidth=1, bordercolor=self.COLOR_GRAY_BORDER)
-        self.style.configure('Form.TLabelframe.Label', background=self.COLOR_BG, foreground=self.COLOR_TEXT_DARK, font=('Segoe UI', 12, 'bold'))
-        self.style.configure('Primary.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_PRIMARY, foreground=self.COLOR_WHITE)
-        self.style.map('Primary.TButton', background=[('active', '#2980b9'), ('pressed', '#2980b9')])
-        self.style.configure('Danger.TButton', font=('Segoe UI', 10, 'bold'), background=self.COLOR_DANGER, foreground=self.COLOR_WHITE)
-        self.style.map('Danger.TButton', background=[('active', '#c0392b'), ('pressed', '#c0392b')])
-        self.style.configure('TListbox', background=self.COLOR_WHITE, foreground=self.COLOR_TEXT_DARK, borderwidth=1, relief='solid', fieldbackground=self.COLOR_WHITE)
-
-        # CAMBIO 3: Layout directo en el frame
-        self.pack(fill=tk.BOTH, expand=True)
-        self.columnconfigure(0, weight=1)
-        self.rowconfigure(1, weight=1) # Fila 1 (tabla) se expandirá
-
-        ttk.Label(self, text="Gestión de Grupos", font=("Segoe UI", 16, "bold"), background=self.COLOR_BG).grid(row=0, column=0, sticky="w", pady=(0, 15))
-
-        self._build_tree(self)
-        self._build_form(self)
-        self._fetch_support_data()
-        self._load_groups()
-
-    def _build_tree(self, container: ttk.Frame) -> None:
-        tree_container = ttk.Frame(container, style='Content.TFrame')
-        tree_container.grid(row=1, column=0, sticky="nsew", pady=(0, 10))
-        tree_container.rowconfigure(0, weight=1)
-        tree_container.columnconfigure(0, weight=1)
-
-        columns = ('id', 'name', 'career', 'subject', 'teacher', 'schedule')
-        self.tree = ttk.Treeview(tree_container, columns=columns, show='headings', height=7)
-        self.tree.grid(row=0, column=0, sticky="nsew")
-
-        # MEJORA: Scrollbar
-        scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        
-        headers = {'id': 'ID', 'name': 'Grupo', 'career': 'Carrera', 'subject': 'Materia', 'teacher': 'Maestro', 'schedule': 'Horario'}
-        col_widths = {'id': 40, 'name': 100, 'career': 150, 'subject': 150, 'teacher': 150, 'schedule': 100}
-
-        for col in columns:
-            self.tree.heading(col, text=headers[col])
-            self.tree.column(col, width=col_widths[col], stretch=True)
-            
-        self.tree.bind('<<TreeviewSelect>>', self._on_select)
-
-    def _build_form(self, container: ttk.Frame) -> None:
-        form = ttk.LabelFrame(container, text="Datos del grupo", style='Form.TLabelframe', padding=15)
-        form.grid(row=2, column=0, sticky="nsew")
+    def _build_fields(self, form: ttk.LabelFrame) -> int:
         form.columnconfigure(1, weight=3) # Dar más peso a la columna de widgets
         form.columnconfigure(3, weight=3)
         form.rowconfigure(10, weight=1) # Fila de la tabla de estudiantes
 
         # --- Columna 0 (Izquierda) ---
-        self.id_var = tk.StringVar()
         ttk.Label(form, text="ID", style='Content.TLabel').grid(row=0, column=0, sticky="w", pady=5, padx=5)
-        ttk.Entry(form, textvariable=self.id_var, state='readonly').grid(row=0, column=1, sticky="ew", pady=5, padx=5)
+        self.form.attach('id', ttk.Entry(form, textvariable=self.form.var('id'))).grid(row=0, column=1, sticky="ew", pady=5, padx=5)
 
-        self.name_var = tk.StringVar()
         ttk.Label(form, text="Nombre de grupo", style='Content.TLabel').grid(row=1, column=0, sticky="w", pady=5, padx=5)
-        ttk.Entry(form, textvariable=self.name_var).grid(row=1, column=1, sticky="ew", pady=5, padx=5)
+        self.form.attach('name', ttk.Entry(form, textvariable=self.form.var('name'))).grid(row=1, column=1, sticky="ew", pady=5, padx=5)
 
-        self.career_var = tk.StringVar()
         ttk.Label(form, text="Carrera", style='Content.TLabel').grid(row=2, column=0, sticky="w", pady=5, padx=5)
-        self.career_combo = ttk.Combobox(form, textvariable=self.career_var, state='readonly')
+        self.career_combo = self.form.attach('careerId', SearchCombobox(form, textvariable=self.form.var('careerId')))
         self.career_combo.grid(row=2, column=1, sticky="ew", pady=5, padx=5)
         self.career_combo.bind('<<ComboboxSelected>>', self._refresh_subject_combo)
 
-        self.subject_var = tk.StringVar()
         ttk.Label(form, text="Materia", style='Content.TLabel').grid(row=3, column=0, sticky="w", pady=5, padx=5)
-        self.subject_combo = ttk.Combobox(form, textvariable=self.subject_var, state='readonly')
+        self.subject_combo = self.form.attach('subjectId', SearchCombobox(form, textvariable=self.form.var('subjectId')))
         self.subject_combo.grid(row=3, column=1, sticky="ew", pady=5, padx=5)
 
         # --- Columna 2 (Derecha) ---
-        self.teacher_var = tk.StringVar()
         ttk.Label(form, text="Maestro", style='Content.TLabel').grid(row=0, column=2, sticky="w", pady=5, padx=5)
-        self.teacher_combo = ttk.Combobox(form, textvariable=self.teacher_var, state='readonly')
+        self.teacher_combo = self.form.attach('teacherId', SearchCombobox(form, textvariable=self.form.var('teacherId')))
         self.teacher_combo.grid(row=0, column=3, sticky="ew", pady=5, padx=5)
 
-        self.classroom_var = tk.StringVar()
         ttk.Label(form, text="Salón", style='Content.TLabel').grid(row=1, column=2, sticky="w", pady=5, padx=5)
-        self.classroom_combo = ttk.Combobox(form, textvariable=self.classroom_var, state='readonly')
+        self.classroom_combo = self.form.attach('classroomId', SearchCombobox(form, textvariable=self.form.var('classroomId')))
         self.classroom_combo.grid(row=1, column=3, sticky="ew", pady=5, padx=5)
 
-        self.schedule_var = tk.StringVar()
         ttk.Label(form, text="Horario", style='Content.TLabel').grid(row=2, column=2, sticky="w", pady=5, padx=5)
-        self.schedule_combo = ttk.Combobox(form, textvariable=self.schedule_var, state='readonly')
+        self.schedule_combo = self.form.attach('scheduleId', SearchCombobox(form, textvariable=self.form.var('scheduleId')))
         self.schedule_combo.grid(row=2, column=3, sticky="ew", pady=5, padx=5)
 
-        self.semester_var = tk.StringVar()
         ttk.Label(form, text="Semestre", style='Content.TLabel').grid(row=3, column=2, sticky="w", pady=5, padx=5)
-        ttk.Entry(form, textvariable=self.semester_var).grid(row=3, column=3, sticky="ew", pady=5, padx=5)
+        self.form.attach('semester', ttk.Entry(form, textvariable=self.form.var('semester'))).grid(row=3, column=3, sticky="ew", pady=5, padx=5)
 
-        self.max_students_var = tk.StringVar()
         ttk.Label(form, text="Máx. alumnos", style='Content.TLabel').grid(row=4, column=2, sticky="w", pady=5, padx=5)
-        ttk.Entry(form, textvariable=self.max_students_var).grid(row=4, column=3, sticky="ew", pady=5, padx=5)
-
-        # --- Botones ---
-        buttons = ttk.Frame(form, style='Content.TFrame')
-        buttons.grid(row=5, column=0, columnspan=4, pady=15)
-        ttk.Button(buttons, text="Nuevo", command=self._reset, style='Primary.TButton').grid(row=0, column=0, padx=5)
-        ttk.Button(buttons, text="Guardar", command=self._save, style='Primary.TButton').grid(row=0, column=1, padx=5)
-        ttk.Button(buttons, text="Eliminar", command=self._delete, style='Danger.TButton').grid(row=0, column=2, padx=5)
+        self.form.attach('maxStudents', ttk.Entry(form, textvariable=self.form.var('maxStudents'))).grid(row=4, column=3, sticky="ew", pady=5, padx=5)
 
         # --- Tabla de Alumnos ---
         ttk.Label(form, text="Alumnos inscritos", style='Content.TLabel').grid(row=10, column=0, sticky="nw", pady=(15, 5), padx=5)
@@ -150,6 +144,7 @@ class GroupsWindow(ttk.Frame):
         students_columns = ('studentId', 'name', 'email', 'status')
         self.students_tree = ttk.Treeview(student_tree_container, columns=students_columns, show='headings', height=5)
         self.students_tree.grid(row=0, column=0, sticky="nsew")
+        self.students_sync = TreeReconciler(self.students_tree)
         
         student_scrollbar = ttk.Scrollbar(student_tree_container, orient="vertical", command=self.students_tree.yview)
         self.students_tree.configure(yscrollcommand=student_scrollbar.set)
@@ -159,29 +154,30 @@ class GroupsWindow(ttk.Frame):
         for col in students_columns:
             self.students_tree.heading(col, text=headers_students[col])
             self.students_tree.column(col, width=100, stretch=True)
-
-    def _fetch_support_data(self) -> None:
+        self.students_sorter = TreeSorter(self.students_sync)
+        return 5 # Los botones van debajo de los campos, antes de la tabla de alumnos
+
+    def _load_options(self) -> None:
+        combos = (
+            ('/careers', self.career_combo),
+            ('/teachers', self.teacher_combo),
+            ('/classrooms', self.classroom_combo),
+            ('/schedules', self.schedule_combo),
+        )
         try:
-            self.careers = self.api.get('/careers')
-            self.career_combo.configure(values=[f"{item['id']} - {item['name']}" for item in self.careers])
-
-            self.teachers = self.api.get('/teachers')
-            self.teacher_combo.configure(values=[f"{item['id']} - {item['name']}" for item in self.teachers])
-
-            self.classrooms = self.api.get('/classrooms')
-            self.classroom_combo.configure(values=[f"{item['id']} - {item['name']} ({item['building']})" for item in self.classrooms])
-
-            self.schedules = self.api.get('/schedules')
-            self.schedule_combo.configure(values=[f"{item['id']} - {item['time']} ({item['shift']})" for item in self.schedules])
+            for path, combo in combos:
+                items = self.api.get(path, fields=self.OPTION_FIELDS[path])
+                self.options[path] = OptionIndex((item['id'], self.OPTION_LABELS[path](item)) for item in items)
+                combo.set_options(self.options[path])
         except ApiError as e:
             messagebox.showerror("Error de Carga", f"No se pudieron cargar los datos de soporte (carreras, maestros, etc.): {e.message}")
 
-    def _refresh_subject_combo(self, _event: Optional[tk.Event] = None) -> None:
+    def _refresh_subject_combo(self, _event: Optional[tk.Event] = None, keep_subject: bool = False) -> None:
         """Carga dinámicamente las materias de la carrera seleccionada."""
-        career_id_str = self.career_var.get().split(' - ')[0]
-        if not career_id_str.isdigit():
-            self.subject_combo.configure(values=[])
-            self.subject_var.set('')
+        career_id_str = option_id(self.form.get('careerId'))
+        if not career_id_str.isdecimal():
+            self.subject_combo.set_options(OptionIndex())
+            self.form.set('subjectId', '')
             return
             
         career_id = int(career_id_str)
@@ -190,183 +186,99 @@ class GroupsWindow(ttk.Frame):
             if career_id in self.subjects_cache:
                 subjects = self.subjects_cache[career_id]
             else:
-                subjects = self.api.get('/subjects', params={'careerId': career_id})
+                subjects = self.api.get('/subjects', params={'careerId': career_id}, fields=self.OPTION_FIELDS['/subjects'])
                 self.subjects_cache[career_id] = subjects
         except ApiError as e:
             messagebox.showerror("Error de API", f"No se pudieron cargar las materias para esa carrera: {e.message}")
             
-        values = [f"{item['id']} - {item['name']}" for item in subjects]
-        current = self.subject_var.get()
-        self.subject_combo.configure(values=values)
-        
-        if current not in values:
-            self.subject_var.set('') # Limpiar si la materia ya no es válida
+        self.options['/subjects'] = OptionIndex((item['id'], self.OPTION_LABELS['/subjects'](item)) for item in subjects)
+        self.subject_combo.set_options(self.options['/subjects'])
+
+        current = self.form.get('subjectId')
+        if self.options['/subjects'].id_of(current) is None:
+            subject_id = option_id(current)
+            if keep_subject and subject_id.isdecimal():
+                self.options['/subjects'].add(int(subject_id), current)  # La del grupo, aunque ya no esté en la lista
+            else:
+                self.form.set('subjectId', '') # Limpiar si la materia ya no es válida
 
-    def _load_groups(self) -> None:
-        try:
-            groups = self.api.get('/groups')
-            self.tree.delete(*self.tree.get_children())
-            for group in groups:
-                self.tree.insert('', tk.END, values=(
-                    group['id'],
-                    group['name'],
-                    group.get('careerName', 'N/A'),
-                    group.get('subjectName', 'N/A'),
-                    group.get('teacherName', 'N/A'),
-                    f"{group.get('scheduleTime', 'N/A')}"
-                ))
-        except ApiError as e:
-            messagebox.showerror("Error de Carga", f"No se pudieron cargar los grupos: {e.message}")
+    def _show(self, data: Dict[str, Any], version: Optional[str] = None) -> None:
+        super()._show(data, version)
+        # Las materias dependen de la carrera; la del grupo se conserva aunque no esté en la lista
+        self._refresh_subject_combo(keep_subject=True)
+        self._load_students(data.get('students', []))
 
-    def _on_select(self, _event: tk.Event) -> None:
-        selection = self.tree.selection()
-        if not selection: return
-        item = self.tree.item(selection[0])
-        try:
-            self._load_group(int(item['values'][0]))
-        except ApiError as e:
-            messagebox.showerror("Error", f"No se pudo cargar el grupo: {e.message}")
+    def _option_label(self, path: str, data: Dict[str, Any], key: str, name_key: str) -> str:
+        """Texto del combobox para la opción `data[key]`, o "ID - nombre del registro" si no está en la lista."""
+        option = data.get(key)
+        if not option:
+            return ''
+        label = self.options[path].label_of(option)
+        if not label:
+            # La opción actual del grupo se puede conservar al guardar aunque ya no esté en la lista
+            label = f"{option} - {data.get(name_key, 'N/A')}"
+            self.options[path].add(option, label)
+        return label
 
-    def _load_group(self, group_id: int) -> None:
-        # Esta función asume que _load_group(id) levanta ApiError si falla
-        data = self.api.get(f'/groups/{group_id}')
-        
-        self.current_id = data['id']
-        self.id_var.set(str(data['id']))
-        self.name_var.set(data['name'])
-        self.semester_var.set(str(data['semester']))
-        self.max_students_var.set(str(data['maxStudents']))
-
-        # Helper para encontrar el string correcto en la lista de combobox
-        def find_in_list(data_list: List[Dict], key: str, data_id: int, name_key: str) -> str:
-            for item in data_list:
-                if item['id'] == data_id:
-                    # Reconstruir el string exacto del combobox
-                    if key == 'classrooms':
-                        return f"{item['id']} - {item['name']} ({item['building']})"
-                    if key == 'schedules':
-                        return f"{item['id']} - {item['time']} ({item['shift']})"
-                    return f"{item['id']} - {item[name_key]}"
-            return f"{data_id} - {data.get(name_key, 'N/A')}"
-
-        if data.get('careerId'):
-            self.career_var.set(find_in_list(self.careers, 'careers', data['careerId'], 'careerName'))
-        
-        # Cargar materias ANTES de setear la materia
-        self._refresh_subject_combo()
-        if data.get('subjectId'):
-            # No podemos usar find_in_list para materias, ya que se cargan dinámicamente
-            self.subject_var.set(f"{data['subjectId']} - {data.get('subjectName', 'N/A')}")
-            
-        if data.get('teacherId'):
-            self.teacher_var.set(find_in_list(self.teachers, 'teachers', data['teacherId'], 'teacherName'))
-        if data.get('classroomId'):
-            self.classroom_var.set(find_in_list(self.classrooms, 'classrooms', data['classroomId'], 'classroomName'))
-        if data.get('scheduleId'):
-            self.schedule_var.set(find_in_list(self.schedules, 'schedules', data['scheduleId'], 'scheduleTime'))
+    def _option_value(self, path: str, key: str, text: str) -> Any:
+        """ID de la opción con el texto `text` ('' si está vacío); lo que no sea una opción es un error."""
+        text = text.strip()
+        if not text:
+            return ''
+        option = self.options[path].id_of(text)
+        if option is None:
+            raise ValueError(f"{self.FIELD_LABELS[key]}: '{text}' no es una de las opciones de la lista.")
+        return option
 
-        self._load_students(data.get('students', []))
+    def _career_label(self, data: Dict[str, Any]) -> str:
+        return self._option_label('/careers', data, 'careerId', 'careerName')
 
-    def _load_students(self, students: List[Dict[str, Any]]) -> None:
-        self.students_tree.delete(*self.students_tree.get_children())
-        for student in students:
-            self.students_tree.insert('', tk.END, values=(
-                student['studentId'], student['name'], student.get('email', 'N/A'), student['status']
-            ))
-
-    def _collect_payload(self) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {}
-        
-        # --- VALIDACIÓN ROBUSTA (AÑADIDA) ---
-        name = self.name_var.get().strip()
-        if not name:
-            raise ValueError('El Nombre de grupo es requerido.')
-        if not all(c.isalnum() or c.isspace() or c == '-' for c in name):
-             raise ValueError("El nombre del grupo solo puede contener letras, números, espacios o guiones.")
-        payload['name'] = name
-
-        required_combos = [
-            (self.career_var.get(), 'careerId', 'Carrera'),
-            (self.subject_var.get(), 'subjectId', 'Materia'),
-            (self.teacher_var.get(), 'teacherId', 'Maestro'),
-            (self.classroom_var.get(), 'classroomId', 'Salón'),
-            (self.schedule_var.get(), 'scheduleId', 'Horario'),
-        ]
-        for value, key, label in required_combos:
-            if not value or not value.split(' - ')[0].isdigit():
-                raise ValueError(f'Debes seleccionar una opción válida para {label}.')
-            payload[key] = int(value.split(' - ')[0])
+    def _subject_label(self, data: Dict[str, Any]) -> str:
+        return self._option_label('/subjects', data, 'subjectId', 'subjectName')
 
-        try:
-            semester = int(self.semester_var.get().strip())
-            max_students = int(self.max_students_var.get().strip())
-        except ValueError:
-            raise ValueError('Semestre y Máx. alumnos deben ser números enteros.')
-
-        if semester <= 0:
-            raise ValueError('El semestre debe ser un número positivo (ej. 1, 2, ...).')
-        if max_students <= 0:
-            raise ValueError('El Máx. de alumnos debe ser un número positivo.')
-        
-        payload['semester'] = semester
-        payload['maxStudents'] = max_students
-        # --- FIN VALIDACIÓN ---
+    def _teacher_label(self, data: Dict[str, Any]) -> str:
+        return self._option_label('/teachers', data, 'teacherId', 'teacherName')
 
-        return payload
+    def _classroom_label(self, data: Dict[str, Any]) -> str:
+        return self._option_label('/classrooms', data, 'classroomId', 'classroomName')
 
-    def _save(self) -> None:
-        try:
-            payload = self._collect_payload()
-        except ValueError as error:
-            messagebox.showwarning("Validación", str(error))
-            return
-            
-        try:
-            if self.current_id is None:
-                group = self.api.post('/groups', payload)
-            else:
-                group = self.api.put(f"/groups/{self.current_id}", payload)
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:
-            messagebox.showerror("Error", str(error))
-            return
-            
-        messagebox.showinfo("Éxito", "Grupo guardado")
-        self._load_group(group['id']) # Recargar el formulario
-        self._load_groups() # Recargar la tabla
+    def _schedule_label(self, data: Dict[str, Any]) -> str:
+        return self._option_label('/schedules', data, 'scheduleId', 'scheduleTime')
 
-    def _delete(self) -> None:
-        if self.current_id is None:
-            messagebox.showinfo("Operación", "Selecciona un grupo de la tabla para eliminar.")
-            return
-        if not messagebox.askyesno("Eliminar", f"¿Deseas eliminar el grupo '{self.name_var.get()}'?"):
-            return
-            
-        try:
-            self.api.delete(f"/groups/{self.current_id}")
-        except ApiError as error:
-            messagebox.showerror("Error de API", error.message)
-            return
-        except Exception as error:
-            messagebox.showerror("Error", str(error))
-            return
-            
-        messagebox.showinfo("Éxito", "Grupo eliminado")
-        self._reset()
-        self._load_groups()
+    def _career_id(self, text: str) -> Any:
+        return self._option_value('/careers', 'careerId', text)
+
+    def _subject_id(self, text: str) -> Any:
+        return self._option_value('/subjects', 'subjectId', text)
+
+    def _teacher_id(self, text: str) -> Any:
+        return self._option_value('/teachers', 'teacherId', text)
+
+    def _classroom_id(self, text: str) -> Any:
+        return self._option_value('/classrooms', 'classroomId', text)
+
+    def _schedule_id(self, text: str) -> Any:
+        return self._option_value('/schedules', 'scheduleId', text)
+
+    def _load_students(self, students: List[Dict[str, Any]]) -> None:
+        self.students_sync.sync(self.students_sorter.order([
+            (student['studentId'], (student['studentId'], student['name'], student.get('email', 'N/A'), student['status']))
+            for student in students
+        ]))
+
+    def _pending_record(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Nombres de la fila mientras el cambio está en cola (los combobox son "ID - Nombre")
+        def label(value: str) -> str:
+            return value.partition(' - ')[2] or 'N/A'
+
+        return {
+            **super()._pending_record(payload),
+            'careerName': label(self.form.get('careerId')),
+            'subjectName': label(self.form.get('subjectId')),
+            'teacherName': label(self.form.get('teacherId')),
+            'scheduleTime': label(self.form.get('scheduleId')).rsplit(' (', 1)[0],
+        }
 
     def _reset(self) -> None:
-        self.current_id = None
-        self.id_var.set('')
-        self.name_var.set('')
-        self.semester_var.set('')
-        self.max_students_var.set('')
-        self.career_var.set('')
-        self.subject_var.set('')
-        self.teacher_var.set('')
-        self.classroom_var.set('')
-        self.schedule_var.set('')
-        self.students_tree.delete(*self.students_tree.get_children())
-        self.tree.selection_remove(self.tree.selection()) # Deseleccionar tabla
\ No newline at end of file
+        super()._reset()
+        self.students_sync.clear()
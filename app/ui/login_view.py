@@ -5,7 +5,9 @@ from tkinter import ttk, messagebox
 from typing import Callable
 
 from app.services.api_client import ApiClient, ApiError
+from app.services.bootstrap import start_bootstrap
 from app.services.session import UserSession
+from app.ui.main_menu import MODULE_WINDOWS
 
 
 class LoginFrame(tk.Frame): # Cambiado de ttk.Frame a tk.Frame para control total del fondo
@@ -155,4 +157,7 @@ class LoginFrame(tk.Frame): # Cambiado de ttk.Frame a tk.Frame para control tota
 
         self.session.token = result.get("token")
         self.session.user = result.get("user", {})
+        # Con el token en mano se lanza ya lo que el rol necesita para su perfil, en paralelo
+        # con la construcción del menú; las ventanas lo toman cuando llega
+        self.session.bootstrap = start_bootstrap(self.api, self.session.role, MODULE_WINDOWS)
         self.on_success(result.get("user", {}))
\ No newline at end of file
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import time
 import tkinter as tk
 from tkinter import ttk, TclError
-from typing import Dict, Type
+from typing import Dict, List, Optional, Type
 
 from app.services.api_client import ApiClient
 from app.services.session import UserSession
@@ -20,6 +21,12 @@ from app.ui.groups_window import GroupsWindow
 # CAMBIO IMPORTANTE: Ahora esperamos que las "ventanas" sean Frames
 WindowType = Type[ttk.Frame] 
 
+# Todos los módulos que puede abrir el menú (según el rol se muestran unos u otros)
+MODULE_WINDOWS = (
+    UsersWindow, StudentsWindow, CareersWindow, SubjectsWindow,
+    TeachersWindow, SchedulesWindow, ClassroomsWindow, GroupsWindow,
+)
+
 
 class MainMenu(ttk.Frame):
     def __init__(self, master: tk.Misc, api: ApiClient, session: UserSession) -> None:
@@ -68,16 +75,93 @@ class MainMenu(ttk.Frame):
         # --- Variable para guardar el frame actual ---
         self.current_content_frame: tk.Widget | None = None
 
+        # --- Precarga al pasar el puntero ---
+        self.PREFETCH_DELAY_MS = 120 # Evita precargar cuando el puntero solo cruza el menú
+        self._prefetch_after: Dict[str, str] = {}
+        # Tiempo (s) hasta que cada módulo quedó construido e interactivo, por módulo
+        self.module_load_times: Dict[str, List[float]] = {}
+
         self._build_sidenav()
         self._show_welcome_screen() # Mostrar la bienvenida al inicio
 
-    # --- Funciones de Hover (sin cambios) ---
-    def on_enter(self, button: tk.Button) -> None:
+    # --- Funciones de Hover ---
+    def on_enter(self, button: tk.Button, name: Optional[str] = None, window_class: Optional[WindowType] = None) -> None:
         button.config(bg=self.COLOR_BTN_HOVER)
-    def on_leave(self, button: tk.Button) -> None:
+        if name and window_class:
+            self._schedule_prefetch(name, window_class)
+    def on_leave(self, button: tk.Button, name: Optional[str] = None) -> None:
         button.config(bg=self.COLOR_SIDENAV)
+        if name:
+            self._cancel_prefetch(name)
     # ---
 
+    def _schedule_prefetch(self, name: str, window_class: WindowType) -> None:
+        prefetcher = self.api.prefetcher
+        requests = getattr(window_class, 'PREFETCH', {}).get(self.session.role or '', ())
+        if prefetcher is None or not requests or name in self._prefetch_after:
+            return
+        if self.session.bootstrap is not None and self.session.bootstrap.pending(window_class.__name__):
+            return  # Sus datos ya vienen en camino con el paquete inicial
+
+        def start() -> None:
+            self._prefetch_after.pop(name, None)
+            prefetcher.warm(requests, owner=name)
+
+        self._prefetch_after[name] = self.after(self.PREFETCH_DELAY_MS, start)
+
+    def _cancel_prefetch(self, name: str) -> None:
+        after_id = self._prefetch_after.pop(name, None)
+        if after_id:
+            self.after_cancel(after_id)
+        if self.api.prefetcher is not None:
+            self.api.prefetcher.cancel(name)
+
+    def prefetch_report(self) -> Dict[str, object]:
+        """Aciertos de la precarga, tiempo ahorrado, tiempo medio hasta que cada módulo quedó listo, espera en cola y reintentos."""
+        report: Dict[str, object] = dict(self.api.prefetcher.stats.snapshot()) if self.api.prefetcher else {}
+        report['module_load_ms'] = {
+            name: round(sum(times) * 1000 / len(times), 1) for name, times in self.module_load_times.items()
+        }
+        if self.api.scheduler is not None:
+            report['queue_wait'] = self.api.scheduler.stats.snapshot()
+        if self.api.retrier is not None:
+            report['retries'] = self.api.retrier.stats.snapshot()
+        return report
+
+    def format_report(self) -> str:
+        """El reporte de `prefetch_report` en texto para mostrarlo al usuario."""
+        report = self.prefetch_report()
+        lines = []
+        if 'hit_rate' in report:
+            lines.append(
+                f"Precarga: {report['hit_rate']:.0%} de aciertos ({report['hits']} de {report['hits'] + report['misses']}), "
+                f"{report['wasted']} sin usar, {report['cancelled']} canceladas"
+            )
+            lines.append(f"Tiempo ahorrado: {report['saved_ms']:.0f} ms ({report['avg_saved_ms_per_hit']:.0f} ms por acierto)")
+        else:
+            lines.append("Precarga: desactivada")
+        lines.append("\nTiempo hasta que el módulo quedó listo (media):")
+        load_ms = sorted(report['module_load_ms'].items())
+        lines.extend(f"  {name}: {ms:.0f} ms" for name, ms in load_ms)
+        if not load_ms:
+            lines.append("  (aún no se ha abierto ningún módulo)")
+        lines.append("")
+        for level, wait in report.get('queue_wait', {}).items():
+            if wait['requests']:
+                lines.append(
+                    f"Espera en cola ({level}): media {wait['avg_wait_ms']:.0f} ms, p95 {wait['p95_wait_ms']:.0f} ms, "
+                    f"máx {wait['max_wait_ms']:.0f} ms, {wait['preempted']} descartadas"
+                )
+        retries = report.get('retries')
+        if retries:
+            lines.append(
+                f"Reintentos: {retries['retries']} en {retries['requests']} peticiones "
+                f"({retries['recovered']} recuperadas, {retries['gave_up']} fallidas)"
+            )
+            if retries['hedged']:
+                lines.append(f"Peticiones de respaldo: {retries['hedged']} ({retries['hedge_wins']} ganaron)")
+        return '\n'.join(lines).rstrip()
+
     def _build_sidenav(self) -> None:
         tk.Label(
             self.sidenav_frame, text="SIGUE", font=('Segoe UI', 20, 'bold'),
@@ -129,8 +213,10 @@ class MainMenu(ttk.Frame):
             )
             button.pack(fill=tk.X, pady=4, padx=15)
             
-            button.bind("<Enter>", lambda e, b=button: self.on_enter(b))
-            button.bind("<Leave>", lambda e, b=button: self.on_leave(b))
+            # Al pasar el puntero (o llegar con el teclado) se empiezan a precargar los datos del módulo
+            button.bind("<Enter>", lambda e, b=button, key=label, wc=window_class: self.on_enter(b, key, wc))
+            button.bind("<Leave>", lambda e, b=button, key=label: self.on_leave(b, key))
+            button.bind("<FocusIn>", lambda e, key=label, wc=window_class: self._schedule_prefetch(key, wc))
 
     def _clear_content_area(self) -> None:
         """Destruye el frame de contenido actual."""
@@ -166,10 +252,19 @@ class MainMenu(ttk.Frame):
         """Carga un módulo (Frame) en el área de contenido."""
         self._clear_content_area()
         
+        # El clic llega antes que el retardo de la precarga: arrancarla ya para no perder la ventaja
+        after_id = self._prefetch_after.pop(name, None)
+        if after_id:
+            self.after_cancel(after_id)
+            if self.api.prefetcher is not None:
+                self.api.prefetcher.warm(getattr(module_class, 'PREFETCH', {}).get(self.session.role or '', ()), owner=name)
+
         # Crea una instancia del frame del módulo (ej. ClassroomsWindow)
         # y lo coloca dentro de self.content_frame
+        started = time.perf_counter()
         frame = module_class(self.content_frame, self.api, self.session)
         frame.pack(fill=tk.BOTH, expand=True)
+        self.module_load_times.setdefault(name, []).append(time.perf_counter() - started)
         
         # Guarda una referencia al nuevo frame para poder destruirlo después
         self.current_content_frame = frame
\ No newline at end of file
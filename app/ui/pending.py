@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import messagebox
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.services.api_client import ApiClient
+from app.services.outbox import DONE, PENDING, Mutation
+from app.ui.reconcile import TreeReconciler
+
+# Prefijo de los iid de filas creadas que aún no tienen ID del servidor
+PLACEHOLDER_PREFIX = 'pending-'
+
+
+class PendingRows:
+    """Escrituras de una ventana a través de la cola en segundo plano (api.outbox).
+
+    Guardar o eliminar regresa de inmediato: la fila se actualiza (o se agrega) y queda
+    marcada en gris hasta que el servidor confirma. Cuando ya no queda nada pendiente
+    se llama a `on_settled` (normalmente recargar la tabla) y se avisan los conflictos.
+    Si la cola no está activa, `save`/`delete` devuelven None y la ventana hace la
+    petición síncrona de siempre.
+    """
+
+    POLL_MS = 250
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        api: ApiClient,
+        entity: str,
+        tree_sync: Optional[TreeReconciler] = None,
+        on_settled: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.widget = widget
+        self.api = api
+        self.entity = entity
+        self.tree_sync = tree_sync
+        self.on_settled = on_settled
+        self._tracked: Dict[str, Mutation] = {}
+        self._rows: Dict[str, str] = {}  # id de mutación -> iid marcado
+        self._after: Optional[str] = None
+        if tree_sync is not None:
+            tree_sync.tree.tag_configure('pending', foreground='#95a5a6')
+            tree_sync.tree.tag_configure('conflict', foreground='#e74c3c')
+        widget.bind('<Destroy>', self._on_destroy, add='+')
+
+    @property
+    def enabled(self) -> bool:
+        return self.api.outbox is not None
+
+    def is_placeholder(self, iid: str) -> bool:
+        return str(iid).startswith(PLACEHOLDER_PREFIX)
+
+    def save(
+        self,
+        record_id: Optional[int],
+        payload: Dict[str, Any],
+        row: Optional[Sequence[Any]] = None,
+        if_match: Optional[str] = None,
+    ) -> Optional[Mutation]:
+        """Encola el POST (record_id None) o PUT; `row` son los valores a mostrar mientras tanto.
+
+        Con `if_match` el PUT solo se aplica si el registro sigue en esa versión; si no,
+        queda como conflicto igual que cualquier otro rechazo del servidor.
+        """
+        if self.api.outbox is None:
+            return None
+        if record_id is None:
+            mutation = self.api.outbox.submit('POST', f'/{self.entity}', payload)
+            iid = f'{PLACEHOLDER_PREFIX}{mutation.id}' if row is not None else None
+        else:
+            mutation = self.api.outbox.submit('PUT', f'/{self.entity}/{record_id}', payload, _precondition(if_match))
+            iid = str(record_id)
+        if iid is not None and self.tree_sync is not None and row is not None:
+            self.tree_sync.patch(iid, row)
+        self._track(mutation, iid)
+        return mutation
+
+    def delete(self, record_id: int, if_match: Optional[str] = None) -> Optional[Mutation]:
+        if self.api.outbox is None:
+            return None
+        mutation = self.api.outbox.submit('DELETE', f'/{self.entity}/{record_id}', headers=_precondition(if_match))
+        self._track(mutation, str(record_id))
+        return mutation
+
+    def _track(self, mutation: Mutation, iid: Optional[str]) -> None:
+        self._tracked[mutation.id] = mutation
+        if iid is not None and self.tree_sync is not None and iid in self.tree_sync:
+            self._rows[mutation.id] = iid
+            self.tree_sync.tree.item(iid, tags=('pending',))
+        if self._after is None:
+            self._after = self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        self._after = None
+        finished: List[Mutation] = [mutation for mutation in self._tracked.values() if mutation.status != PENDING]
+        for mutation in finished:
+            del self._tracked[mutation.id]
+            iid = self._rows.pop(mutation.id, None)
+            if iid is not None and self.tree_sync is not None and iid in self.tree_sync:
+                self.tree_sync.tree.item(iid, tags=('conflict',) if mutation.status != DONE else ())
+
+        conflicts = self.api.outbox.take_conflicts(self.entity) if self.api.outbox is not None else []
+        if conflicts:
+            details = '\n'.join(f"• {mutation.method} {mutation.path}: {mutation.error}" for mutation in conflicts)
+            messagebox.showerror("Cambios no aplicados", f"El servidor rechazó algunos cambios guardados:\n\n{details}")
+
+        if self._tracked:
+            self._after = self.widget.after(self.POLL_MS, self._poll)
+        elif finished and self.on_settled is not None:
+            self.on_settled()
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        # La cola sigue enviando aunque se cierre la ventana; solo se deja de observar
+        if event.widget is self.widget and self._after is not None:
+            self.widget.after_cancel(self._after)
+            self._after = None
+
+
+def _precondition(if_match: Optional[str]) -> Optional[Dict[str, str]]:
+    return {'If-Match': if_match} if if_match else None
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import tkinter as tk
+from collections import deque
+from dataclasses import dataclass
+from tkinter import ttk
+from typing import Any, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+@dataclass
+class ReconcileStats:
+    """Resultado de una reconciliación: operaciones Tcl hechas frente a las de borrar y reinsertar todo."""
+
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    tcl_ops: int = 0
+    naive_ops: int = 0
+
+    @property
+    def avoided(self) -> int:
+        return max(0, self.naive_ops - self.tcl_ops)
+
+
+class TreeReconciler:
+    """Sincroniza un Treeview con una lista de filas usando el ID de la entidad como iid.
+
+    Guarda una copia en Python de lo que hay en el widget, así el diff no necesita
+    leer nada de Tcl; solo se emiten inserciones, actualizaciones, movimientos y
+    borrados. Como los iid no cambian, Tk conserva la selección por sí mismo.
+    """
+
+    def __init__(self, tree: ttk.Treeview, parent: str = '') -> None:
+        self.tree = tree
+        self.parent = parent
+        self._values: Dict[str, Tuple[Any, ...]] = {}
+        self._order: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self.total_avoided = 0
+        # Cambia cada vez que cambian las filas o sus valores (para invalidar cachés derivadas, p. ej. claves de orden)
+        self.revision = 0
+
+    def sync(self, rows: Iterable[Tuple[Any, Sequence[Any]]]) -> ReconcileStats:
+        stats = ReconcileStats()
+        for _step in self.steps(rows, stats):
+            pass
+        return stats
+
+    def steps(self, rows: Iterable[Tuple[Any, Sequence[Any]]], stats: Optional[ReconcileStats] = None) -> Iterator[int]:
+        """La misma sincronización que `sync`, pero avanzando una fila por paso (para TimeSlicer).
+
+        Si se corta a medias (close() del generador), las filas ya colocadas quedan en su
+        lugar y el resto en su orden anterior; la copia en Python sigue igual al widget,
+        así que la siguiente sincronización parte de ahí.
+        """
+        desired = [(str(key), tuple(values)) for key, values in rows]
+        self.revision += 1
+        stats = stats if stats is not None else ReconcileStats()
+        stats.naive_ops = (1 if self._order else 0) + len(desired)
+        anchor = self._top_row()
+
+        desired_ids = {iid for iid, _values in desired}
+        stale = [iid for iid in self._order if iid not in desired_ids]
+        if stale:
+            self.tree.delete(*stale)
+            stats.deleted = len(stale)
+            stats.tcl_ops += 1
+            for iid in stale:
+                del self._values[iid]
+
+        # Recorremos el orden deseado; en el paso i las primeras i filas ya son las correctas
+        # y el resto conserva su orden relativo original (solo se "adelantan" filas).
+        remaining: Deque[str] = deque(iid for iid in self._order if iid in desired_ids)
+        placed: Set[str] = set()
+        finished = False
+        try:
+            for index, (iid, values) in enumerate(desired):
+                while remaining and remaining[0] in placed:
+                    remaining.popleft()
+                previous = self._values.get(iid)
+                if previous is None:
+                    self.tree.insert(self.parent, index, iid=iid, values=values)
+                    stats.inserted += 1
+                    stats.tcl_ops += 1
+                else:
+                    if remaining and remaining[0] == iid:
+                        remaining.popleft()
+                    else:
+                        self.tree.move(iid, self.parent, index)
+                        stats.moved += 1
+                        stats.tcl_ops += 1
+                    if previous != values:
+                        self.tree.item(iid, values=values)
+                        stats.updated += 1
+                        stats.tcl_ops += 1
+                    else:
+                        stats.unchanged += 1
+                self._values[iid] = values
+                placed.add(iid)
+                yield index
+            finished = True
+        finally:
+            self.revision += 1
+            if finished:
+                self._order = [iid for iid, _values in desired]
+            else:
+                order = [iid for iid, _values in desired[:len(placed)]]
+                order.extend(iid for iid in remaining if iid not in placed)
+                self._order = order
+            # Filas agregadas con patch() mientras se llenaba la tabla (van al final)
+            known = set(self._order)
+            self._order.extend(iid for iid in self._values if iid not in known)
+            self._positions = {iid: position for position, iid in enumerate(self._order)}
+
+        if anchor and anchor in self._values and stats.tcl_ops:
+            # Mantener arriba la misma fila que estaba visible antes de los cambios
+            self.tree.yview_moveto(self._positions[anchor] / max(1, len(self._order)))
+        self.total_avoided += stats.avoided
+
+    def _top_row(self) -> str:
+        if not self._order:
+            return ''
+        first = float(self.tree.yview()[0])
+        return self._order[min(len(self._order) - 1, int(round(first * len(self._order))))]
+
+    def clear(self) -> ReconcileStats:
+        return self.sync([])
+
+    def patch(self, iid: Hashable, values: Sequence[Any]) -> None:
+        """Actualiza (o agrega al final) una sola fila sin esperar a la siguiente recarga."""
+        iid, values = str(iid), tuple(values)
+        if iid in self._values:
+            if self._values[iid] != values:
+                self.tree.item(iid, values=values)
+        else:
+            self.tree.insert(self.parent, 'end', iid=iid, values=values)
+            self._positions[iid] = len(self._order)
+            self._order.append(iid)
+        self._values[iid] = values
+        self.revision += 1
+
+    def reorder(self, order: Sequence[Hashable]) -> None:
+        """Reacomoda las filas en `order` con una sola llamada a Tcl; las que no vengan quedan al final.
+
+        Los iid no cambian, así que Tk conserva la selección.
+        """
+        order = [str(iid) for iid in order]
+        if len(order) != len(self._order) or not self._values.keys() >= set(order):
+            order = [iid for iid in order if iid in self._values]
+            listed = set(order)
+            order.extend(iid for iid in self._order if iid not in listed)
+        self.tree.set_children(self.parent, *order)
+        self._order = order
+        self._positions = {}  # Se recalculan al pedir vecinos
+
+    def neighbors(self, iid: Hashable, radius: int = 1) -> List[str]:
+        """iids de las filas a `radius` posiciones por encima y por debajo, sin consultar a Tcl."""
+        if not self._positions and self._order:
+            self._positions = {iid: position for position, iid in enumerate(self._order)}
+        position = self._positions.get(str(iid))
+        if position is None:
+            return []
+        around = self._order[max(0, position - radius):position] + self._order[position + 1:position + 1 + radius]
+        return around
+
+    def items(self) -> Iterable[Tuple[str, Tuple[Any, ...]]]:
+        """(iid, valores) de todas las filas, sin pasar por Tcl."""
+        return self._values.items()
+
+    def values(self, iid: Hashable) -> Tuple[Any, ...]:
+        """Valores originales (sin pasar por Tcl) de una fila."""
+        return self._values[str(iid)]
+
+    def __contains__(self, iid: object) -> bool:
+        return str(iid) in self._values
+
+    def __iter__(self):  # type: ignore[no-untyped-def]
+        return iter(self._order)
+
+
+class ListboxReconciler:
+    """Equivalente a TreeReconciler para tk.Listbox, identificando cada fila por una llave."""
+
+    def __init__(self, listbox: tk.Listbox) -> None:
+        self.listbox = listbox
+        self.keys: List[Hashable] = []
+        self._labels: Dict[Hashable, str] = {}
+        self.total_avoided = 0
+
+    def sync(self, items: Iterable[Tuple[Hashable, str]]) -> ReconcileStats:
+        desired = list(items)
+        stats = ReconcileStats(naive_ops=(1 if self.keys else 0) + len(desired))
+        top = self.listbox.nearest(0) if self.keys else 0
+        top_key = self.keys[top] if 0 <= top < len(self.keys) else None
+
+        desired_keys = {key for key, _label in desired}
+        # Borrar de abajo hacia arriba para no recalcular índices
+        for index in range(len(self.keys) - 1, -1, -1):
+            key = self.keys[index]
+            if key not in desired_keys:
+                self.listbox.delete(index)
+                del self._labels[key]
+                stats.deleted += 1
+                stats.tcl_ops += 1
+        current = [key for key in self.keys if key in desired_keys]
+
+        remaining: Deque[Hashable] = deque(current)
+        placed: Set[Hashable] = set()
+        for index, (key, label) in enumerate(desired):
+            while remaining and remaining[0] in placed:
+                remaining.popleft()
+            previous = self._labels.get(key)
+            if previous is None:
+                self.listbox.insert(index, label)
+                stats.inserted += 1
+                stats.tcl_ops += 1
+            else:
+                in_place = bool(remaining) and remaining[0] == key
+                if in_place:
+                    remaining.popleft()
+                if not in_place or previous != label:
+                    # Listbox no tiene "move": se borra la fila anterior y se inserta en su lugar
+                    old_index = index if in_place else self._current_index(key, index, placed, remaining)
+                    selected = self.listbox.selection_includes(old_index)
+                    self.listbox.delete(old_index)
+                    self.listbox.insert(index, label)
+                    if selected:
+                        self.listbox.selection_set(index)
+                    stats.tcl_ops += 3 if selected else 2
+                    if in_place:
+                        stats.updated += 1
+                    else:
+                        stats.moved += 1
+                else:
+                    stats.unchanged += 1
+            self._labels[key] = label
+            placed.add(key)
+
+        self.keys = [key for key, _label in desired]
+        if top_key is not None and top_key in self._labels and stats.tcl_ops:
+            self.listbox.yview(self.keys.index(top_key))
+        self.total_avoided += stats.avoided
+        return stats
+
+    def _current_index(self, key: Hashable, index: int, placed: Set[Hashable], remaining: Deque[Hashable]) -> int:
+        # Las filas ya colocadas ocupan [0, index); después siguen las pendientes en su orden original
+        position = index
+        for pending in remaining:
+            if pending in placed:
+                continue
+            if pending == key:
+                return position
+            position += 1
+        raise KeyError(key)
+
+    def clear(self) -> ReconcileStats:
+        return self.sync([])
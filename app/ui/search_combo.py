@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Optional
+
+from app.services.options import OptionIndex
+
+# Etiqueta de clase que va antes que la del widget: sus eventos corren primero y pueden cortar los demás
+BINDTAG = 'SearchCombobox'
+
+
+class SearchCombobox(ttk.Combobox):
+    """Combobox con búsqueda: el texto escrito filtra las opciones al abrir la lista.
+
+    Las opciones viven en un OptionIndex; la lista desplegable solo recibe las primeras
+    `page` coincidencias más una entrada "… N más" que, al elegirla, agrega la siguiente
+    página y vuelve a abrir la lista. Así abrir el combobox no cuesta lo mismo con diez
+    mil usuarios que con diez. Enter completa con la primera coincidencia.
+    """
+
+    PAGE = 50
+
+    def __init__(self, master: tk.Misc, options: Optional[OptionIndex] = None, page: int = PAGE, **kwargs: Any) -> None:
+        super().__init__(master, postcommand=self._post, **kwargs)
+        self.options = options if options is not None else OptionIndex()
+        self.page = page
+        self._limit = page
+        self._query = ''
+        self._more = ''
+        self.bindtags((BINDTAG,) + self.bindtags())
+        if not self.bind_class(BINDTAG):
+            self.bind_class(BINDTAG, '<<ComboboxSelected>>', SearchCombobox._on_selected)
+            self.bind_class(BINDTAG, '<Return>', SearchCombobox._on_return)
+            self.bind_class(BINDTAG, '<KeyRelease>', SearchCombobox._on_key)
+
+    def set_options(self, options: OptionIndex) -> None:
+        self.options = options
+        self._limit = self.page
+        self.configure(values=())
+
+    def _post(self) -> None:
+        # Con una opción ya elegida se muestra la lista completa (paginada); si no, lo escrito filtra
+        text = self.get()
+        self._query = '' if self.options.id_of(text) is not None else text
+        labels, total = self.options.search(self._query, self._limit)
+        self._more = f"… {total - len(labels)} más" if total > len(labels) else ''
+        self.configure(values=labels + [self._more] if self._more else labels)
+
+    @staticmethod
+    def _on_selected(event: tk.Event) -> Optional[str]:
+        combo = event.widget
+        if not combo._more or combo.get() != combo._more:
+            return None
+        # "… N más": siguiente página, se restaura lo escrito y se vuelve a abrir la lista
+        combo._limit += combo.page
+        combo.set(combo._query)
+        combo.after_idle(combo._repost)
+        return 'break'
+
+    def _repost(self) -> None:
+        try:
+            self.tk.call('ttk::combobox::Post', self)
+        except tk.TclError:  # Widget destruido o Tk sin ese procedimiento
+            pass
+
+    @staticmethod
+    def _on_return(event: tk.Event) -> Optional[str]:
+        combo = event.widget
+        if str(combo.cget('state')) != 'normal':
+            return None
+        if combo.options.id_of(combo.get()) is None:
+            labels, _total = combo.options.search(combo.get(), 1)
+            if not labels:
+                return None
+            combo.set(labels[0])
+        combo.event_generate('<<ComboboxSelected>>')
+        return 'break'
+
+    @staticmethod
+    def _on_key(event: tk.Event) -> None:
+        # Al cambiar lo escrito la paginación vuelve a empezar
+        if len(event.char) == 1 or event.keysym in ('BackSpace', 'Delete'):
+            event.widget._limit = event.widget.page
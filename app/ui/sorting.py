@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import tkinter as tk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.services.collation import sort_key
+from app.ui.reconcile import TreeReconciler
+
+Row = Tuple[Hashable, Sequence[Any]]
+
+
+class TreeSorter:
+    """Ordena por columnas un Treeview sincronizado con TreeReconciler al hacer clic en los encabezados.
+
+    Clic ordena por esa columna (otro clic invierte el sentido); Shift+clic la agrega como
+    criterio adicional. El orden es estable y se calcula en Python con sort_key (español
+    sin acentos, números por valor); cada columna se convierte una vez en rangos enteros
+    que se guardan hasta que cambian las filas, así reordenar otra vez solo compara
+    enteros. El resultado se aplica con una sola llamada a Tcl y se conserva la selección.
+    """
+
+    ARROWS = {False: ' ▲', True: ' ▼'}
+
+    def __init__(self, sync: TreeReconciler, on_change: Optional[Callable[[], None]] = None) -> None:
+        self.sync = sync
+        self.tree = sync.tree
+        self.columns: Tuple[str, ...] = tuple(self.tree['columns'] or ())
+        self.headings = {column: self.tree.heading(column, 'text') for column in self.columns}
+        # Criterios de orden: (índice de columna, descendente), el primero es el principal
+        self.keys: List[Tuple[int, bool]] = []
+        # Rango de cada fila por columna (iid -> rango, número de rangos), válidos para una revisión de las filas
+        self._ranks: Dict[int, Tuple[Dict[str, int], int]] = {}
+        self._revision = -1
+        # Sin on_change el clic reordena la tabla; con él, quien llena la tabla decide cómo
+        self.on_change = on_change if on_change is not None else self.apply
+        self.tree.bind('<Button-1>', lambda event: self._on_click(event, extend=False), add='+')
+        self.tree.bind('<Shift-Button-1>', lambda event: self._on_click(event, extend=True), add='+')
+
+    def toggle(self, index: int, extend: bool = False) -> None:
+        current = dict(self.keys)
+        if index in current:
+            # Mismo criterio: se invierte el sentido (sin Shift queda como único criterio)
+            flipped = (index, not current[index])
+            self.keys = [flipped if key == index else (key, descending) for key, descending in self.keys] if extend else [flipped]
+        elif extend:
+            self.keys.append((index, False))
+        else:
+            self.keys = [(index, False)]
+        self._update_headings()
+        self.on_change()
+
+    def order(self, rows: Sequence[Row]) -> List[Row]:
+        """Las filas ordenadas por los criterios activos (tal cual si no hay ninguno), p. ej. antes de sincronizar."""
+        if not self.keys:
+            return list(rows)
+        ordered = list(rows)
+        for index, descending in reversed(self.keys):
+            ordered.sort(key=lambda row: sort_key(row[1][index]), reverse=descending)
+        return ordered
+
+    def apply(self) -> None:
+        """Reordena las filas que ya están en la tabla."""
+        if not self.keys:
+            return
+        iids = list(self.sync)
+        if len(self.keys) == 1:
+            index, descending = self.keys[0]
+            iids.sort(key=self._column_ranks(index)[0].__getitem__, reverse=descending)
+        else:
+            # Varios criterios: un solo entero por fila (rango del principal, luego del siguiente...)
+            combined = dict.fromkeys(iids, 0)
+            for index, descending in self.keys:
+                ranks, size = self._column_ranks(index)
+                for iid in iids:
+                    rank = ranks[iid]
+                    combined[iid] = combined[iid] * size + (size - 1 - rank if descending else rank)
+            iids.sort(key=combined.__getitem__)
+        selection = self.tree.selection()
+        self.sync.reorder(iids)
+        if selection:
+            self.tree.see(selection[0])
+
+    def _column_ranks(self, index: int) -> Tuple[Dict[str, int], int]:
+        """Posición de cada fila en el orden de la columna (iguales comparten rango) y cuántos rangos hay.
+
+        Cada valor distinto se normaliza una sola vez y las filas se comparan como enteros.
+        """
+        if self._revision != self.sync.revision:
+            self._ranks = {}
+            self._revision = self.sync.revision
+        cached = self._ranks.get(index)
+        if cached is None:
+            values = {iid: row[index] for iid, row in self.sync.items()}
+            keys = {value: sort_key(value) for value in set(values.values())}
+            rank_of: Dict[Any, int] = {}
+            rank, previous = -1, None
+            for value in sorted(keys, key=keys.__getitem__):
+                key = keys[value]
+                if key != previous:
+                    rank, previous = rank + 1, key
+                rank_of[value] = rank
+            cached = self._ranks[index] = ({iid: rank_of[value] for iid, value in values.items()}, rank + 1)
+        return cached
+
+    def _update_headings(self) -> None:
+        ranks = {index: (rank, descending) for rank, (index, descending) in enumerate(self.keys)}
+        for index, column in enumerate(self.columns):
+            text = self.headings[column]
+            if index in ranks:
+                rank, descending = ranks[index]
+                text += self.ARROWS[descending] + (str(rank + 1) if len(self.keys) > 1 else '')
+            self.tree.heading(column, text=text)
+
+    def _on_click(self, event: tk.Event, extend: bool) -> Optional[str]:
+        if self.tree.identify_region(event.x, event.y) != 'heading':
+            return None
+        column = self.tree.identify_column(event.x)  # '#1', '#2'... en el orden mostrado
+        displayed = self.tree['displaycolumns']
+        names = self.columns if not displayed or displayed[0] == '#all' else tuple(displayed)
+        position = int(column[1:]) - 1
+        if not 0 <= position < len(names):
+            return None
+        self.toggle(self.columns.index(names[position]), extend)
+        return None
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, Iterator, Optional
+
+Progress = Callable[[int, Optional[int]], None]
+
+
+class SliceTask:
+    """Un trabajo en curso: un iterador cuyo cada paso es una unidad pequeña (p. ej. insertar una fila)."""
+
+    def __init__(self, key: str, steps: Iterator[Any], total: Optional[int],
+                 on_progress: Optional[Progress], on_done: Optional[Callable[[], None]]) -> None:
+        self.key = key
+        self.steps = steps
+        self.total = total
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.done = 0
+        self.slices = 0
+        self.finished = False
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        if self.finished:
+            return
+        self.cancelled = self.finished = True
+        close = getattr(self.steps, 'close', None)
+        if close is not None:
+            close()  # El finally del generador deja su estado consistente
+
+
+class TimeSlicer:
+    """Reparte trabajo largo de la interfaz en tramos que caben en un cuadro del loop de Tk.
+
+    Cada trabajo es un iterador; en cada tramo se avanza paso a paso hasta agotar
+    `budget_ms` y el resto se deja para la siguiente vuelta del loop (after(0)), así Tk
+    atiende clics, teclas y repintados entre tramo y tramo. El primer tramo corre en
+    seguida: las listas chicas terminan ahí mismo y se comportan como antes. Un trabajo
+    nuevo con la misma llave cancela el anterior (p. ej. recargar la tabla a medio
+    llenar) y todo se cancela al destruir el frame dueño.
+    """
+
+    def __init__(self, owner: tk.Misc, budget_ms: float = 12.0) -> None:
+        self.owner = owner
+        self.budget = budget_ms / 1000
+        self.tasks: Dict[str, SliceTask] = {}
+        self._after: Optional[str] = None
+        owner.bind('<Destroy>', self._on_destroy, add='+')
+
+    def run(self, key: str, steps: Iterator[Any], *, total: Optional[int] = None,
+            on_progress: Optional[Progress] = None, on_done: Optional[Callable[[], None]] = None) -> SliceTask:
+        self.cancel(key)
+        task = self.tasks[key] = SliceTask(key, iter(steps), total, on_progress, on_done)
+        self._slice(task)
+        if not task.finished:
+            self._schedule()
+        return task
+
+    def cancel(self, key: str) -> None:
+        task = self.tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self) -> None:
+        for key in list(self.tasks):
+            self.cancel(key)
+        if self._after is not None:
+            self.owner.after_cancel(self._after)
+            self._after = None
+
+    def busy(self, key: str) -> bool:
+        return key in self.tasks
+
+    def _schedule(self) -> None:
+        if self._after is None:
+            self._after = self.owner.after(0, self._tick)
+
+    def _tick(self) -> None:
+        self._after = None
+        # El presupuesto del cuadro se reparte entre los trabajos activos
+        for task in list(self.tasks.values()):
+            self._slice(task, self.budget / max(1, len(self.tasks)))
+        if self.tasks:
+            self._schedule()
+
+    def _slice(self, task: SliceTask, budget: Optional[float] = None) -> None:
+        deadline = time.perf_counter() + (self.budget if budget is None else budget)
+        steps = task.steps
+        try:
+            while True:
+                next(steps)
+                task.done += 1
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            task.finished = True
+        except Exception:
+            # Un paso que falla no debe quedar reintentándose en cada vuelta del loop
+            if self.tasks.get(task.key) is task:
+                del self.tasks[task.key]
+            task.cancel()
+            raise
+        task.slices += 1
+        if task.on_progress is not None:
+            task.on_progress(task.done, task.total)
+        if task.finished:
+            if self.tasks.get(task.key) is task:
+                del self.tasks[task.key]
+            if task.on_done is not None:
+                task.on_done()
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.owner:
+            self.cancel_all()
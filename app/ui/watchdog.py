@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Raíz del proyecto, para distinguir nuestro código del de la librería estándar y requests
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UI_ROOT = os.path.join(PROJECT_ROOT, 'app', 'ui')
+
+
+@dataclass
+class StallSite:
+    """Bloqueos atribuidos a una misma línea de nuestro código."""
+
+    site: str
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    # Dónde estaba realmente el hilo (p. ej. esperando el socket) y cuántas veces
+    leaves: Dict[str, int] = field(default_factory=dict)
+    stack: List[str] = field(default_factory=list)
+
+
+def _describe(frame: traceback.FrameSummary) -> str:
+    filename = os.path.abspath(frame.filename)
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        filename = os.path.relpath(filename, PROJECT_ROOT)  # En Windows relpath falla entre unidades distintas
+    return f"{filename}:{frame.lineno} en {frame.name}"
+
+
+def call_site(stack: List[traceback.FrameSummary]) -> Tuple[str, str]:
+    """(línea de la interfaz responsable, línea donde estaba el hilo) de una pila capturada.
+
+    Se prefiere el marco más interno de app/ui o main.py: ahí está la llamada bloqueante
+    (un api.get, una reconstrucción de Treeview) aunque el hilo esté dentro de requests.
+    """
+    leaf = stack[-1]
+    own = [frame for frame in stack if os.path.abspath(frame.filename).startswith(PROJECT_ROOT + os.sep)]
+    ui = [
+        frame for frame in own
+        if os.path.abspath(frame.filename).startswith(UI_ROOT + os.sep) or frame.filename.endswith('main.py')
+    ]
+    site = (ui or own or stack)[-1]
+    return _describe(site), _describe(leaf)
+
+
+class StallWatchdog:
+    """Detecta cuándo el hilo de Tk deja de atender eventos y captura qué estaba haciendo.
+
+    Un latido con `after()` marca la hora cada `interval_ms`; un hilo aparte revisa si
+    el latido se atrasó más de `threshold_ms` y, mientras dure el bloqueo, toma la pila
+    del hilo principal con `sys._current_frames`. Al reanudarse el latido el bloqueo se
+    suma al sitio de la primera muestra; `report()` los agrupa por sitio.
+    """
+
+    def __init__(self, root: tk.Misc, threshold_ms: int = 100, interval_ms: int = 50) -> None:
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.sites: Dict[str, StallSite] = {}
+        self.stalls = 0
+        self._main_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._samples: List[List[traceback.FrameSummary]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._after: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._last_beat = time.monotonic()
+        self._after = self.root.after(int(self.interval * 1000), self._beat)
+        self._thread = threading.Thread(target=self._watch, name='stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._after is not None:
+            try:
+                self.root.after_cancel(self._after)
+            except tk.TclError:
+                pass
+            self._after = None
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stalled = now - self._last_beat - self.interval
+            samples, self._samples = self._samples, []
+            self._last_beat = now
+        if stalled >= self.threshold:
+            self._record(stalled, samples)
+        if not self._stop.is_set():
+            self._after = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _watch(self) -> None:
+        poll = max(0.005, self.threshold / 4)
+        last_sample = 0.0
+        while not self._stop.wait(poll):
+            now = time.monotonic()
+            with self._lock:
+                overdue = now - self._last_beat - self.interval
+                beat = self._last_beat
+            # Una muestra al pasar el umbral y otra por cada umbral adicional que siga bloqueado
+            if overdue < self.threshold or now - max(last_sample, beat) < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self._lock:
+                if self._last_beat == beat:  # El latido no llegó mientras se tomaba la pila
+                    self._samples.append(stack)
+            last_sample = now
+
+    def _record(self, stalled: float, samples: List[List[traceback.FrameSummary]]) -> None:
+        self.stalls += 1
+        if samples:
+            site, _ = call_site(samples[0])
+        else:
+            site = '(bloqueo más corto que una muestra)'
+        entry = self.sites.get(site)
+        if entry is None:
+            entry = self.sites[site] = StallSite(site, stack=[_describe(frame) for frame in samples[0]] if samples else [])
+        entry.count += 1
+        entry.total += stalled
+        entry.longest = max(entry.longest, stalled)
+        for stack in samples:
+            _, leaf = call_site(stack)
+            entry.leaves[leaf] = entry.leaves.get(leaf, 0) + 1
+
+    def report(self) -> List[StallSite]:
+        """Sitios ordenados por tiempo total bloqueado."""
+        return sorted(self.sites.values(), key=lambda entry: entry.total, reverse=True)
+
+    def format_report(self, limit: int = 15) -> str:
+        sites = self.report()
+        lines = [f"Bloqueos del hilo de la interfaz (> {self.threshold * 1000:.0f} ms): {self.stalls}"]
+        for entry in sites[:limit]:
+            lines.append(
+                f"\n{entry.total * 1000:8.0f} ms en total | {entry.count} veces | máx {entry.longest * 1000:.0f} ms"
+                f"\n    {entry.site}"
+            )
+            for leaf, hits in sorted(entry.leaves.items(), key=lambda item: item[1], reverse=True)[:3]:
+                lines.append(f"      ↳ {leaf} ({hits} muestras)")
+        return '\n'.join(lines)
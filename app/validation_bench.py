@@ -0,0 +1,135 @@
+"""Mide cuánto tarda validar lotes grandes con las reglas de app.services.validation.
+
+Genera registros sintéticos por entidad (la mayoría válidos y una parte con datos
+faltantes o mal formados, como en una importación real) y compara las dos formas de
+validar: registro por registro con validate_* (lo que hacen las ventanas y --merge de
+la CLI) y el lote completo con RULES[entity].validate_many (create/update de la CLI):
+
+    python -m app.validation_bench
+    python -m app.validation_bench --records 100000 --entity students --entity groups
+    python -m app.validation_bench --invalid 0.5 --repeat 5
+
+Termina con código 1 si las dos formas no coinciden en qué registros son inválidos.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.services.validation import RULES, VALIDATORS
+
+Record = Dict[str, Any]
+
+NAMES = ('Ana', 'Luis', 'María José', 'Íñigo', 'Sofía', 'Juan Pablo', 'Renée', 'Óscar')
+SURNAMES = ('Pérez', 'García', 'López', 'Núñez', 'Hernández', 'De la Cruz')
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(NAMES)} {rng.choice(SURNAMES)} {rng.choice(SURNAMES)}"
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(1970, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+# Registro válido por entidad
+GENERATORS: Dict[str, Callable[[random.Random, int], Record]] = {
+    'users': lambda rng, n: {
+        'username': f'usuario{n}', 'email': f'usuario{n}@escuela.edu.mx',
+        'role': rng.choice(('ADMIN', 'TEACHER', 'STUDENT')), 'password': 'secreto',
+    },
+    'students': lambda rng, n: {
+        'userId': n + 1, 'name': _person(rng), 'status': rng.choice(('ACTIVE', 'INACTIVE')),
+        'dateOfBirth': _date(rng), 'careerId': str(rng.randint(1, 20)),
+        'subjects': [rng.randint(1, 200) for _ in range(rng.randint(0, 6))],
+    },
+    'teachers': lambda rng, n: {
+        'userId': n + 1, 'name': _person(rng), 'degree': rng.choice(('LICENCIATURA', 'MAESTRIA', 'DOCTORADO')),
+        'careerIds': [rng.randint(1, 20)], 'subjectIds': [rng.randint(1, 200) for _ in range(3)],
+    },
+    'careers': lambda rng, n: {'name': f'Carrera {n}', 'semesters': str(rng.randint(6, 12))},
+    'subjects': lambda rng, n: {
+        'name': f'Materia {n}', 'credits': str(rng.randint(4, 10)),
+        'semester': str(rng.randint(1, 12)), 'careerId': rng.randint(1, 20),
+    },
+    'classrooms': lambda rng, n: {'name': f'A-{n}', 'building': rng.choice(('A', 'B', 'C'))},
+    'schedules': lambda rng, n: {'time': f'{rng.randint(7, 21)}:{rng.choice(("00", "30"))}', 'shift': rng.choice(('MATUTINO', 'VESPERTINO'))},
+    'groups': lambda rng, n: {
+        'name': f'G-{n}', 'careerId': 1, 'subjectId': rng.randint(1, 200), 'teacherId': rng.randint(1, 50),
+        'classroomId': rng.randint(1, 30), 'scheduleId': rng.randint(1, 10),
+        'semester': str(rng.randint(1, 12)), 'maxStudents': str(rng.randint(10, 40)),
+    },
+}
+
+# Valores que rompen un registro: vacío, espacios, texto con símbolos, números no válidos, fechas y horas imposibles
+BAD_VALUES = ('', '   ', None, 'Ana_3', 'x', '-1', '0', '1995-02-31', '25:61', 'no es email')
+
+
+def generate(entity: str, count: int, invalid: float, seed: int = 0) -> List[Record]:
+    rng = random.Random(seed)
+    make = GENERATORS[entity]
+    keys = [rule.key for rule in RULES[entity].rules if not rule.kind == 'ids']
+    records = []
+    for n in range(count):
+        record = make(rng, n)
+        if rng.random() < invalid:
+            for key in rng.sample(keys, rng.randint(1, min(2, len(keys)))):
+                record[key] = rng.choice(BAD_VALUES)
+        records.append(record)
+    return records
+
+
+def _per_record(entity: str, records: List[Record]) -> List[int]:
+    validate = VALIDATORS[entity]
+    failed = []
+    for index, record in enumerate(records):
+        try:
+            validate(record, creating=True)
+        except ValueError:
+            failed.append(index)
+    return failed
+
+
+def _batch(entity: str, records: List[Record]) -> List[int]:
+    return sorted(RULES[entity].validate_many(records, creating=True).errors)
+
+
+def _best(repeat: int, run: Callable[[], List[int]]) -> tuple[float, List[int]]:
+    best, result = float('inf'), []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='app.validation_bench', description='Mide la validación de lotes de registros.')
+    parser.add_argument('--records', type=int, default=100_000, help='Registros por entidad')
+    parser.add_argument('--entity', action='append', choices=tuple(RULES), help='Entidad a medir (repetible; por defecto todas)')
+    parser.add_argument('--invalid', type=float, default=0.1, help='Fracción de registros con datos inválidos')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por medición (se reporta la mejor)')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    mismatched = False
+    print(f"{'entidad':<12}{'inválidos':>10}{'por registro':>16}{'lote':>16}{'reg/s (lote)':>16}")
+    for entity in args.entity or RULES:
+        records = generate(entity, args.records, args.invalid, args.seed)
+        single_time, single = _best(args.repeat, lambda: _per_record(entity, records))
+        batch_time, batch = _best(args.repeat, lambda: _batch(entity, records))
+        mismatched = mismatched or single != batch
+        rate = len(records) / batch_time if batch_time else float('inf')
+        print(f"{entity:<12}{len(batch):>10}{single_time * 1000:>13.1f} ms{batch_time * 1000:>13.1f} ms{rate:>16,.0f}"
+              + ('  (NO COINCIDEN)' if single != batch else ''))
+    return 1 if mismatched else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import os
+import sys
+import time
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import messagebox
+from typing import Callable, Optional
 
 from app.config import CONFIG
-from app.services.api_client import ApiClient
+from app.services.api_client import ApiClient, ApiError
+from app.services.bootstrap import start_bootstrap
+from app.services.json_codec import default_codec
+from app.services.latency import path_template
+from app.services.outbox import MutationJournal, Outbox
+from app.services.prefetch import PrefetchEngine
+from app.services.profiling import ActionProfiler
+from app.services.record_cache import RecordCache
+from app.services.retry import RequestRetrier, RetryPolicy
+from app.services.scheduler import BACKGROUND, RequestScheduler
 from app.services.session import UserSession
+from app.services.session_store import SessionStore, check_session, token_expiry
+from app.services.timeouts import TimeoutPolicy, parse_overrides
+from app.ui.crud import CrudFrame
 from app.ui.login_view import LoginFrame
-from app.ui.main_menu import MainMenu
+from app.ui.main_menu import MODULE_WINDOWS, MainMenu
+from app.ui.watchdog import StallWatchdog
 
 
 class SchoolControlApp(tk.Tk):
@@ -15,11 +33,136 @@ class SchoolControlApp(tk.Tk):
         super().__init__()
         self.title("Sistema de Gestión Universitaria Estudiantil")
         self.geometry('1024x720')
-        self.api = ApiClient(CONFIG.api_base_url)
+        self.api = ApiClient(
+            CONFIG.api_base_url,
+            codec=default_codec(CONFIG.json_codec),
+            accept_compression=CONFIG.accept_compression,
+            compress_requests_over=CONFIG.compress_requests_over or None,
+            fields_param=CONFIG.fields_param,
+        )
+        self.api.timeouts = TimeoutPolicy(
+            self.api.latency,
+            connect=CONFIG.connect_timeout,
+            read=CONFIG.read_timeout,
+            overrides=parse_overrides(CONFIG.timeout_overrides),
+            adaptive=CONFIG.adaptive_timeouts,
+            percentile=CONFIG.adaptive_timeout_percentile,
+            factor=CONFIG.adaptive_timeout_factor,
+            adaptive_min=CONFIG.adaptive_timeout_min,
+        )
+        retry_policy = RetryPolicy(CONFIG.retry_attempts, CONFIG.retry_base_delay, CONFIG.retry_max_delay)
+        self.api.retrier = RequestRetrier(
+            self.api.latency,
+            RequestRetrier.default_policies(CONFIG.retry_methods.split(','), retry_policy),
+            hedge=CONFIG.hedge_gets,
+            hedge_percentile=CONFIG.hedge_percentile,
+        )
+        if CONFIG.max_connections_per_host > 0:
+            self.api.scheduler = RequestScheduler(
+                CONFIG.max_connections_per_host, background_limit=CONFIG.background_connections,
+            )
+        if CONFIG.prefetch:
+            self.api.prefetcher = PrefetchEngine(self.api)
+        if CONFIG.record_cache_size > 0:
+            self.api.records = RecordCache(self.api, max_entries=CONFIG.record_cache_size, ttl=CONFIG.record_cache_ttl)
+        if CONFIG.write_behind:
+            self.api.outbox = Outbox(self.api, MutationJournal(CONFIG.outbox_file))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.session = UserSession()
         self.current_view: tk.Widget | None = None
+        self.session_store = SessionStore(CONFIG.session_file) if CONFIG.persist_session else None
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session')
+        self._refresh_after: Optional[str] = None
+        self.watchdog: Optional[StallWatchdog] = None
+        if CONFIG.diagnostics:
+            self.watchdog = StallWatchdog(self, CONFIG.stall_threshold_ms)
+            self.watchdog.start()
+        self.profiler = ActionProfiler(CONFIG.profile_dir, enabled=CONFIG.profile)
+        self._instrument(self.profiler)
+        self._profiling_var = tk.BooleanVar(self, value=CONFIG.profile)
+        self._show_diagnostics = CONFIG.diagnostics or CONFIG.profile
+        self.bind_all('<Control-Alt-p>', self._reveal_diagnostics)
 
-        self._show_login()
+        if not self._resume_session():
+            self._show_login()
+
+    @staticmethod
+    def _instrument(profiler: ActionProfiler) -> None:
+        # Mientras el perfilado esté apagado los envoltorios solo revisan una bandera
+        profiler.instrument(
+            ApiClient, lambda name: name == 'request',
+            describe=lambda api, method, path, **_: f"{method} {path_template(path)}",
+        )
+        profiler.instrument(MainMenu, lambda name: name == '_load_module', describe=lambda menu, name, *_: name)
+        actions = lambda name: name in ('_save', '_delete') or name.startswith('_load_')
+        # Los flujos comunes viven en CrudFrame: la acción lleva el nombre de la ventana que la ejecuta
+        profiler.instrument(CrudFrame, actions, describe=lambda window, *_args, **_kwargs: type(window).__name__)
+        for window_class in MODULE_WINDOWS:
+            profiler.instrument(window_class, actions)
+
+    def _resume_session(self) -> bool:
+        """Entra directo al menú con la sesión guardada; el token se valida en segundo plano."""
+        stored = self.session_store.load() if self.session_store is not None else None
+        if stored is None:
+            return False
+        token, user = stored
+        self.session.token = token
+        self.session.user = user
+        self.api.set_token(token)
+        # Igual que al iniciar sesión: el perfil del rol se pide antes de construir el menú
+        self.session.bootstrap = start_bootstrap(self.api, self.session.role, MODULE_WINDOWS)
+        self._start_outbox()
+        self._show_main_menu()
+        self._when_done(self._background.submit(check_session, self.api, user), self._on_session_checked)
+        self._schedule_refresh()
+        return True
+
+    def _on_session_checked(self, future: Future) -> None:
+        if future.result() or not self.session.token:
+            return
+        self._end_session()
+        messagebox.showinfo("Sesión expirada", "Tu sesión guardada ya no es válida. Inicia sesión de nuevo.")
+
+    def _when_done(self, future: Future, callback: Callable[[Future], None]) -> None:
+        # Tk no es seguro entre hilos: el resultado se recoge desde el hilo de la interfaz
+        if future.done():
+            callback(future)
+        else:
+            self.after(100, self._when_done, future, callback)
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_after:
+            self.after_cancel(self._refresh_after)
+            self._refresh_after = None
+        expires_at = token_expiry(self.session.token)
+        if not CONFIG.auth_refresh_path or expires_at is None:
+            return
+        delay = max(0.0, expires_at - CONFIG.token_refresh_margin - time.time())
+        self._refresh_after = self.after(int(delay * 1000), self._refresh_token)
+
+    def _refresh_token(self) -> None:
+        self._refresh_after = None
+        future = self._background.submit(self.api.refresh_token, CONFIG.auth_refresh_path)
+        self._when_done(future, self._on_token_refreshed)
+
+    def _on_token_refreshed(self, future: Future) -> None:
+        if not self.session.token:
+            return  # Se cerró la sesión mientras se renovaba
+        try:
+            token = future.result()
+        except ApiError as error:
+            if error.status_code in (401, 403):
+                self._end_session()
+                messagebox.showinfo("Sesión expirada", "Tu sesión expiró. Inicia sesión de nuevo.")
+            return
+        except Exception:  # noqa: BLE001 - sin conexión: se reintenta con el token actual
+            self._refresh_after = self.after(60_000, self._refresh_token)
+            return
+        if token:
+            self.session.token = token
+            if self.session_store is not None:
+                self.session_store.save(token, self.session.user)
+            self._schedule_refresh()
 
     def _clear_view(self) -> None:
         if self.current_view:
@@ -44,21 +187,90 @@ class SchoolControlApp(tk.Tk):
         account_menu = tk.Menu(menubar, tearoff=0)
         account_menu.add_command(label="Cerrar sesión", command=self._logout)
         menubar.add_cascade(label="Cuenta", menu=account_menu)
+        if self._show_diagnostics:
+            diagnostics_menu = tk.Menu(menubar, tearoff=0)
+            diagnostics_menu.add_checkbutton(
+                label="Perfilar acciones", variable=self._profiling_var, command=self._toggle_profiling,
+            )
+            diagnostics_menu.add_command(label="Precarga y tiempos de carga…", command=self._show_load_report)
+            menubar.add_cascade(label="Diagnóstico", menu=diagnostics_menu)
         self.config(menu=menubar)
 
+    def _reveal_diagnostics(self, event: Optional[tk.Event] = None) -> None:
+        self._show_diagnostics = True
+        if isinstance(self.current_view, MainMenu):
+            self._build_menu_bar()
+
+    def _toggle_profiling(self) -> None:
+        self.profiler.enabled = self._profiling_var.get()
+        if self.profiler.enabled:
+            messagebox.showinfo(
+                "Perfilado",
+                f"Cada acción (abrir un módulo, guardar, eliminar, cargar) dejará un perfil en:\n{self.profiler.directory}",
+            )
+
+    def _show_load_report(self) -> None:
+        if not isinstance(self.current_view, MainMenu):
+            messagebox.showinfo("Precarga y tiempos de carga", "Inicia sesión y abre algunos módulos para ver el reporte.")
+            return
+        messagebox.showinfo("Precarga y tiempos de carga", self.current_view.format_report())
+
     def _on_login_success(self, user: dict) -> None:
         if not user:
             messagebox.showerror("Error", "No se pudo obtener información del usuario")
             return
         self.session.user = user
+        if self.session_store is not None:
+            self.session_store.save(self.session.token, user)
+        self._start_outbox()
         self._show_main_menu()
+        self._schedule_refresh()
+
+    def _start_outbox(self) -> None:
+        # Reanuda también lo que este usuario dejó en la bitácora sin enviar
+        if self.api.outbox is not None:
+            self.api.outbox.start(self.session.user.get('id'))
+
+    def _on_close(self) -> None:
+        if self.api.outbox is not None:
+            pending = len(self.api.outbox.pending())
+            if pending and not messagebox.askyesno(
+                "Cambios pendientes",
+                f"Hay {pending} cambio(s) sin enviar. Se enviarán la próxima vez que inicies sesión.\n¿Salir de todos modos?",
+            ):
+                return
+            self.api.outbox.shutdown()
+        if self.watchdog is not None:
+            self._write_stall_report()
+        self.destroy()
+
+    def _write_stall_report(self) -> None:
+        self.watchdog.stop()
+        report = self.watchdog.format_report()
+        print(report, file=sys.stderr)
+        if CONFIG.stall_report_file:
+            path = os.path.expanduser(CONFIG.stall_report_file)
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(report + '\n')
 
     def _logout(self) -> None:
         if messagebox.askyesno("Cerrar sesión", "¿Deseas cerrar la sesión actual?"):
-            self.session.clear()
-            self.api.set_token(None)
-            self.config(menu=None)
-            self._show_login()
+            self._end_session()
+
+    def _end_session(self) -> None:
+        if self._refresh_after:
+            self.after_cancel(self._refresh_after)
+            self._refresh_after = None
+        if self.session_store is not None:
+            self.session_store.clear()
+        if self.api.outbox is not None:
+            self.api.outbox.pause()
+        if self.api.scheduler is not None:
+            self.api.scheduler.preempt(BACKGROUND)  # Las precargas en espera eran de la sesión anterior
+        self.session.clear()
+        self.api.set_token(None)
+        self.config(menu=None)
+        self._show_login()
 
 
 def main() -> None: